@@ -0,0 +1,10 @@
+"""
+Paquete Benchmarks - Mediciones de rendimiento del sistema
+
+Cada módulo es un script independiente; se ejecutan desde la raíz del
+proyecto, por ejemplo:
+
+    python -m benchmarks.bench_memoria_eventos
+
+Autor: Mariano Capella, Gabriel Osemberg
+"""
@@ -0,0 +1,72 @@
+"""
+Bench_Escritura_Atomica.py - Costo de la escritura atómica del snapshot JSON
+
+Compara el guardado anterior (open 'w' + json.dump directo sobre el archivo)
+con el actual de AlmacenamientoJSON (temporal + fsync + os.replace + .bak)
+para el mismo snapshot.
+
+Uso:
+    python -m benchmarks.bench_escritura_atomica [cantidad] [repeticiones]
+
+Autor: Mariano Capella, Gabriel Osemberg
+"""
+
+import datetime
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from src.core.almacenamiento import AlmacenamientoJSON
+from benchmarks.bench_memoria_eventos import generar_datos
+from benchmarks.comun import silencio
+
+
+def guardar_directo(ruta: str, eventos: list) -> None:
+    """Guardado anterior: sobrescribe el archivo en el lugar, sin fsync."""
+    data = {
+        "eventos": eventos,
+        "version": "1.0",
+        "fecha_actualizacion": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "total_eventos": len(eventos)
+    }
+    with open(ruta, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def medir(guardar, repeticiones: int) -> float:
+    """Mediana en segundos de `repeticiones` guardados."""
+    tiempos = []
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        guardar()
+        tiempos.append(time.perf_counter() - t0)
+    return statistics.median(tiempos)
+
+
+def main() -> None:
+    """Ejecuta la comparación e imprime los resultados."""
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    repeticiones = int(sys.argv[2]) if len(sys.argv) > 2 else 7
+    eventos = json.loads(generar_datos(cantidad))
+
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta_directa = os.path.join(directorio, "directo.json")
+        almacenamiento = AlmacenamientoJSON(os.path.join(directorio, "atomico.json"))
+
+        directo = medir(lambda: guardar_directo(ruta_directa, eventos), repeticiones)
+        # Los mensajes del guardado no forman parte de la medición
+        with silencio():
+            atomico = medir(lambda: almacenamiento.guardar(eventos), repeticiones)
+        tamaño = os.path.getsize(ruta_directa)
+
+    print(f"📊 Guardado de {cantidad:,} eventos ({tamaño / 1e6:.1f} MB), mediana de {repeticiones}")
+    print(f"   • open('w') + json.dump         {directo * 1000:8.1f} ms")
+    print(f"   • temporal + fsync + replace    {atomico * 1000:8.1f} ms")
+    print(f"✅ Sobrecosto de la escritura atómica: {atomico - directo:+.3f}s "
+          f"({atomico / directo - 1:+.0%})")
+
+
+if __name__ == "__main__":
+    main()
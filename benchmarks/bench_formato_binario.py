@@ -0,0 +1,65 @@
+"""
+Bench_Formato_Binario.py - Snapshot JSON vs snapshot binario compacto (.evb)
+
+Guarda y carga el mismo calendario sintético con AlmacenamientoJSON y con
+AlmacenamientoBinario (ambos con escritura atómica) y compara tiempos y
+tamaño en disco. Verifica además que la carga binaria devuelva exactamente
+los mismos eventos.
+
+Uso:
+    python -m benchmarks.bench_formato_binario [cantidad ...] [--repeticiones N]
+
+Autor: Mariano Capella, Gabriel Osemberg
+"""
+
+import json
+import os
+import sys
+import tempfile
+from src.core.almacenamiento import AlmacenamientoBinario, AlmacenamientoJSON
+from benchmarks.bench_escritura_atomica import medir
+from benchmarks.bench_memoria_eventos import generar_datos
+from benchmarks.comun import silencio
+
+
+def comparar(cantidad: int, repeticiones: int) -> None:
+    """Mide guardado y carga de `cantidad` eventos en ambos formatos."""
+    eventos = json.loads(generar_datos(cantidad))
+    resultados = {}
+
+    with tempfile.TemporaryDirectory() as directorio, silencio():
+        for nombre, clase, archivo in (("JSON", AlmacenamientoJSON, "eventos.json"),
+                                       ("binario", AlmacenamientoBinario, "eventos.evb")):
+            almacenamiento = clase(os.path.join(directorio, archivo))
+            guardado = medir(lambda: almacenamiento.guardar(eventos), repeticiones)
+            carga = medir(almacenamiento.cargar, repeticiones)
+            if almacenamiento.cargar() != eventos:
+                raise AssertionError(f"La carga {nombre} no reproduce los eventos guardados")
+            tamaño = os.path.getsize(almacenamiento.archivo_datos)
+            resultados[nombre] = (guardado, carga, tamaño)
+
+    print(f"📊 {cantidad:,} eventos, mediana de {repeticiones}")
+    for nombre, (guardado, carga, tamaño) in resultados.items():
+        print(f"   • {nombre:8s} guardar {guardado * 1000:8.1f} ms   cargar {carga * 1000:8.1f} ms"
+              f"   {tamaño / 1e6:7.1f} MB   ({cantidad / carga:,.0f} eventos/s)")
+    (g_json, c_json, t_json), (g_bin, c_bin, t_bin) = resultados["JSON"], resultados["binario"]
+    print(f"✅ Binario: guardado x{g_json / g_bin:.1f}, carga x{c_json / c_bin:.1f}, "
+          f"tamaño {t_bin / t_json:.0%} del JSON")
+
+
+def main() -> None:
+    """Ejecuta la comparación para cada cantidad pedida."""
+    argumentos = sys.argv[1:]
+    repeticiones = 3
+    if "--repeticiones" in argumentos:
+        posicion = argumentos.index("--repeticiones")
+        repeticiones = int(argumentos[posicion + 1])
+        del argumentos[posicion:posicion + 2]
+    cantidades = [int(a) for a in argumentos] or [100_000, 1_000_000]
+
+    for cantidad in cantidades:
+        comparar(cantidad, repeticiones)
+
+
+if __name__ == "__main__":
+    main()
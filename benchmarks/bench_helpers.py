@@ -0,0 +1,104 @@
+"""
+Bench_Helpers.py - Microbenchmarks de src/utils/helpers.py
+
+Mide el costo por llamada de cada función de helpers. Para los datos de mes
+memoizados (obtener_datos_mes y obtener_calendario_mes) compara además con el
+cálculo sin memoizar: calendar.monthcalendar y un date por celda para los
+fines de semana, como se hacía antes.
+
+Uso:
+    python -m benchmarks.bench_helpers [--rapido]
+
+Autor: Mariano Capella, Gabriel Osemberg
+"""
+
+import calendar
+import datetime
+import itertools
+import sys
+import timeit
+from src.utils import helpers
+
+
+FECHA = datetime.date(2025, 6, 15)
+# 24 meses distintos, para no medir siempre el mismo
+MESES = [(2024 + i // 12, i % 12 + 1) for i in range(24)]
+
+
+def nanosegundos_por_llamada(funcion, numero: int) -> float:
+    """Mejor de 5 repeticiones de `numero` llamadas, en nanosegundos por llamada."""
+    return min(timeit.repeat(funcion, number=numero, repeat=5)) / numero * 1e9
+
+
+def siguiente_mes():
+    """Función sin argumentos que devuelve un (año, mes) distinto en cada llamada."""
+    ciclo = itertools.cycle(MESES)
+    return lambda: next(ciclo)
+
+
+def estadisticas_sin_memoizar(year: int, month: int) -> tuple:
+    """Días laborables y de fin de semana como se calculaban antes (un date por celda)."""
+    laborables = fin_de_semana = 0
+    for semana in calendar.monthcalendar(year, month):
+        for dia in semana:
+            if dia != 0:
+                if datetime.date(year, month, dia).weekday() in [5, 6]:
+                    fin_de_semana += 1
+                else:
+                    laborables += 1
+    return laborables, fin_de_semana
+
+
+def laborables_memoizado(year: int, month: int) -> tuple:
+    """Lo mismo que estadisticas_sin_memoizar, leído de obtener_datos_mes."""
+    datos = helpers.obtener_datos_mes(year, month)
+    return datos.dias_laborables, len(datos.fines_de_semana)
+
+
+def casos() -> list:
+    """Pares (nombre, función sin argumentos, referencia sin memoizar o None)."""
+    mes = siguiente_mes()
+    mes_referencia = siguiente_mes()
+    return [
+        ("obtener_datos_mes", lambda: helpers.obtener_datos_mes(*mes()),
+         lambda: helpers.obtener_datos_mes.__wrapped__(*mes_referencia())),
+        ("obtener_calendario_mes", lambda: helpers.obtener_calendario_mes(*mes()),
+         lambda: calendar.monthcalendar(*mes_referencia())),
+        ("laborables / fin de semana", lambda: laborables_memoizado(*mes()),
+         lambda: estadisticas_sin_memoizar(*mes_referencia())),
+        ("obtener_nombre_mes", lambda: helpers.obtener_nombre_mes(FECHA), None),
+        ("es_dia_actual", lambda: helpers.es_dia_actual(FECHA), None),
+        ("obtener_dias_semana", helpers.obtener_dias_semana, None),
+        ("navegar_mes", lambda: helpers.navegar_mes(FECHA, 'siguiente'), None),
+        ("navegar_año", lambda: helpers.navegar_año(FECHA, 'anterior'), None),
+        ("ir_a_hoy", helpers.ir_a_hoy, None),
+        ("validar_fecha", lambda: helpers.validar_fecha(2025, 2, 29), None),
+        ("parsear_fecha (ISO)", lambda: helpers.parsear_fecha("2025-06-15"), None),
+        ("parsear_fecha (sin ceros)", lambda: helpers.parsear_fecha("2025-6-5"), None),
+        ("parsear_hora", lambda: helpers.parsear_hora("14:30"), None),
+        ("formatear_fecha_completa", lambda: helpers.formatear_fecha_completa(FECHA), None),
+    ]
+
+
+def main() -> None:
+    """Ejecuta todos los casos e imprime la tabla."""
+    numero = 2_000 if "--rapido" in sys.argv else 20_000
+    # Llenar la memoización antes de medir (la primera vez de cada mes es el caso sin memoizar)
+    for year, month in MESES:
+        helpers.obtener_datos_mes(year, month)
+
+    print(f"📊 helpers.py, mejor de 5 x {numero:,} llamadas")
+    print(f"   {'función':28s} {'ns/llamada':>11s} {'sin memoizar':>13s}")
+    for nombre, funcion, referencia in casos():
+        tiempo = nanosegundos_por_llamada(funcion, numero)
+        if referencia is None:
+            print(f"   • {nombre:26s} {tiempo:11,.0f}")
+            continue
+        tiempo_referencia = nanosegundos_por_llamada(referencia, numero)
+        print(f"   • {nombre:26s} {tiempo:11,.0f} {tiempo_referencia:13,.0f}   "
+              f"(x{tiempo_referencia / tiempo:.1f})")
+    print(f"✅ Memoización: {helpers.obtener_datos_mes.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
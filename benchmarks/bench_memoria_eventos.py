@@ -0,0 +1,113 @@
+"""
+Bench_Memoria_Eventos.py - Memoria por evento: dataclass con __dict__ vs Evento con __slots__
+
+Construye N eventos sintéticos desde diccionarios (como hace la carga del
+JSON) con ambas representaciones y compara la memoria retenida medida con
+tracemalloc.
+
+Uso:
+    python -m benchmarks.bench_memoria_eventos [cantidad]
+
+Autor: Mariano Capella, Gabriel Osemberg
+"""
+
+import datetime
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, asdict
+from typing import Optional
+from src.core.eventos import Evento
+
+
+@dataclass
+class EventoConDict:
+    """Representación anterior de Evento: dataclass con __dict__ y sin internado."""
+    id: str
+    titulo: str
+    fecha: str
+    hora: Optional[str] = None
+    descripcion: Optional[str] = None
+    fecha_creacion: str = None
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'EventoConDict':
+        return cls(**data)
+
+
+def generar_datos(cantidad: int) -> str:
+    """
+    Genera eventos sintéticos serializados como en data/eventos.json.
+
+    Se devuelven como texto JSON para que cada representación parta de
+    cadenas recién decodificadas (sin compartir objetos entre corridas).
+    """
+    random.seed(42)
+    inicio = datetime.date(2015, 1, 1)
+    eventos = []
+    for i in range(cantidad):
+        fecha = inicio + datetime.timedelta(days=random.randint(0, 365 * 12))
+        eventos.append({
+            "id": f"evt_{i:08d}",
+            "titulo": f"Reunión {random.choice(['equipo', 'cliente', 'RRHH', 'proyecto'])} {i % 500}",
+            "fecha": fecha.isoformat(),
+            "hora": random.choice([None, "09:00", "10:30", "14:00", "16:45"]),
+            "descripcion": None if i % 3 else "Descripción del evento",
+            "fecha_creacion": f"2025-01-{1 + i % 28:02d} 10:{i % 60:02d}:00"
+        })
+    return json.dumps(eventos, ensure_ascii=False)
+
+
+def medir(clase, datos_json: str) -> tuple:
+    """
+    Mide memoria retenida y tiempo de construcción de una representación.
+
+    Returns:
+        tuple: (bytes retenidos, segundos, eventos)
+    """
+    gc.collect()
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    # Las cadenas decodificadas cuentan: el internado libera las repetidas
+    eventos_data = json.loads(datos_json)
+    t0 = time.perf_counter()
+    eventos = [clase.from_dict(evento_dict) for evento_dict in eventos_data]
+    segundos = time.perf_counter() - t0
+    # Los diccionarios de origen se liberan: solo queda la representación
+    del eventos_data
+    gc.collect()
+    retenidos = tracemalloc.get_traced_memory()[0] - antes
+    tracemalloc.stop()
+    return retenidos, segundos, eventos
+
+
+def main() -> None:
+    """Ejecuta la comparación e imprime los resultados."""
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    print(f"📊 Memoria de {cantidad:,} eventos sintéticos")
+    datos_json = generar_datos(cantidad)
+
+    resultados = {}
+    for nombre, clase in (("dataclass con __dict__", EventoConDict), ("Evento (__slots__)", Evento)):
+        retenidos, segundos, eventos = medir(clase, datos_json)
+        resultados[nombre] = retenidos
+        # to_dict debe producir exactamente lo mismo en ambas representaciones
+        muestra = [e.to_dict() for e in eventos[:1000]]
+        del eventos
+        print(f"   • {nombre:<24} {retenidos / 1e6:8.1f} MB  "
+              f"({retenidos / cantidad:6.0f} B/evento)  construcción {segundos:.2f}s")
+        resultados[nombre + "_muestra"] = muestra
+
+    assert resultados["dataclass con __dict___muestra"] == resultados["Evento (__slots__)_muestra"]
+    ahorro = 1 - resultados["Evento (__slots__)"] / resultados["dataclass con __dict__"]
+    print(f"✅ Ahorro: {ahorro:.0%} de memoria por evento")
+
+
+if __name__ == "__main__":
+    main()
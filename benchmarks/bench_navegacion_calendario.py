@@ -0,0 +1,123 @@
+"""
+Bench_Navegacion_Calendario.py - Navegaciones de mes por segundo en la grilla
+
+Mide cuántas veces por segundo se puede pasar al mes siguiente (incluido el
+redibujado de Tk) con la grilla reutilizable actual y con la grilla anterior,
+que destruía y recreaba encabezados y botones en cada navegación y consultaba
+los eventos de cada día por separado.
+
+Necesita ttkbootstrap y una pantalla (en un servidor: xvfb-run).
+
+Uso:
+    python -m benchmarks.bench_navegacion_calendario [navegaciones] [eventos]
+
+Autor: Mariano Capella, Gabriel Osemberg
+"""
+
+import calendar
+import datetime
+import json
+import os
+import sys
+import tempfile
+import time
+import ttkbootstrap as tb
+from ttkbootstrap.constants import DANGER, INFO, LIGHT, SUCCESS, WARNING
+from src.ui.calendario_ui import CalendarioUI
+from src.utils.helpers import obtener_dias_semana
+from benchmarks.comun import silencio
+from benchmarks.bench_memoria_eventos import generar_datos
+
+
+def crear_calendario_recreando(ui: CalendarioUI) -> None:
+    """
+    La grilla como se construía antes: destruye y recrea todos los widgets.
+
+    Cada botón consulta los eventos de su día con obtener_eventos_fecha y
+    calcula su estilo (hoy, con eventos, fin de semana) por separado, sin el
+    modelo de mes cacheado de la grilla actual.
+    """
+    for widget in ui.frame_calendario.winfo_children():
+        widget.destroy()
+    ui.botones_dias.clear()
+
+    for i, dia in enumerate(obtener_dias_semana()):
+        label = tb.Label(ui.frame_calendario, text=dia, font=("Arial", 12, "bold"), bootstyle=INFO)
+        label.grid(row=0, column=i, padx=1, pady=1, sticky="NSEW")
+
+    fecha_actual = ui.calendar_logic.get_fecha_actual()
+    cal = calendar.monthcalendar(fecha_actual.year, fecha_actual.month)
+    for fila_idx, semana in enumerate(cal, start=1):
+        for col_idx, dia in enumerate(semana):
+            if dia == 0:
+                label = tb.Label(ui.frame_calendario, text="")
+                label.grid(row=fila_idx, column=col_idx, padx=1, pady=1, sticky="NSEW")
+                continue
+            fecha_dia = datetime.date(fecha_actual.year, fecha_actual.month, dia)
+            eventos_dia = ui.eventos_manager.obtener_eventos_fecha(fecha_dia)
+            if fecha_dia == datetime.date.today():
+                bootstyle = SUCCESS
+            elif eventos_dia:
+                bootstyle = DANGER
+            elif fecha_dia.weekday() in [5, 6]:
+                bootstyle = WARNING
+            else:
+                bootstyle = LIGHT
+            texto = f"{dia} ({len(eventos_dia)})" if eventos_dia else str(dia)
+            btn_dia = tb.Button(ui.frame_calendario, text=texto, bootstyle=bootstyle,
+                                command=lambda d=dia: ui._click_dia(d))
+            btn_dia.grid(row=fila_idx, column=col_idx, padx=1, pady=1, sticky="NSEW")
+            ui.botones_dias[dia] = btn_dia
+
+    for i in range(7):
+        ui.frame_calendario.columnconfigure(i, weight=1)
+    for i in range(len(cal) + 1):
+        ui.frame_calendario.rowconfigure(i, weight=1)
+
+
+def navegaciones_por_segundo(ui: CalendarioUI, navegaciones: int) -> float:
+    """Avanza `navegaciones` meses procesando el redibujado de cada uno."""
+    ui.root.update()
+    t0 = time.perf_counter()
+    for _ in range(navegaciones):
+        ui.calendar_logic.ir_mes_siguiente()
+        ui.root.update()
+    return navegaciones / (time.perf_counter() - t0)
+
+
+def main() -> None:
+    """Mide ambas grillas sobre la misma ventana e imprime los resultados."""
+    navegaciones = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    cantidad = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+
+    with tempfile.TemporaryDirectory() as directorio:
+        # La interfaz usa data/eventos.json relativo al directorio actual
+        directorio_original = os.getcwd()
+        os.chdir(directorio)
+        try:
+            with silencio():
+                root = tb.Window(themename="litera")
+                ui = CalendarioUI(root)
+                # Sin notificaciones durante la medición
+                ui.notification_timer.stop()
+                ui.eventos_manager.agregar_eventos_lote(json.loads(generar_datos(cantidad)))
+                ui.actualizar_vista()
+
+                # Primero la grilla actual: la anterior destruye los botones reutilizables
+                reutilizando = navegaciones_por_segundo(ui, navegaciones)
+                ui.crear_calendario = lambda: crear_calendario_recreando(ui)
+                recreando = navegaciones_por_segundo(ui, navegaciones)
+
+                ui.eventos_manager.cerrar()
+                root.destroy()
+        finally:
+            os.chdir(directorio_original)
+
+    print(f"📊 {navegaciones} navegaciones de mes, {cantidad:,} eventos")
+    print(f"   • recreando widgets   {recreando:8.1f} navegaciones/s   ({1000 / recreando:6.1f} ms c/u)")
+    print(f"   • grilla reutilizada  {reutilizando:8.1f} navegaciones/s   ({1000 / reutilizando:6.1f} ms c/u)")
+    print(f"✅ Grilla reutilizada: x{reutilizando / recreando:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Bench_Recordatorios.py - Costo de programar recordatorios con muchos eventos futuros
+
+Carga N eventos con hora repartidos en el próximo año y mide:
+- Programar la ventana de avisos (cada evento con sus antelaciones y su inicio)
+- Programar una ventana a mitad de año, como cuando vence la anterior
+- Reprogramar un evento al agregarlo, modificarlo o eliminarlo (solo el observador)
+- Revisar todos los eventos una vez, que es lo que costaría cada minuto un
+  timer que recorriera el almacenamiento buscando avisos vencidos
+
+Uso:
+    python -m benchmarks.bench_recordatorios [eventos]
+
+Autor: Mariano Capella, Gabriel Osemberg
+"""
+
+import datetime
+import os
+import random
+import sys
+import tempfile
+import time
+from src.core.eventos import EventosManager
+from src.notifications.notificaciones import NotificacionesManager
+from src.notifications.notificacion_timer import NotificacionTimer
+from benchmarks.comun import silencio
+
+
+def eventos_futuros(cantidad: int) -> list:
+    """Eventos con hora en los próximos 365 días."""
+    random.seed(42)
+    hoy = datetime.date.today()
+    return [
+        {
+            "titulo": f"Evento {i}",
+            "fecha": (hoy + datetime.timedelta(days=random.randint(1, 365))).isoformat(),
+            "hora": f"{random.randint(0, 23):02d}:{random.choice([0, 15, 30, 45]):02d}",
+        }
+        for i in range(cantidad)
+    ]
+
+
+def revisar_todos(timer: NotificacionTimer) -> int:
+    """Recorre todos los eventos futuros y cuenta los avisos vencidos (ninguno)."""
+    eventos_manager = timer.notificaciones_manager.eventos_manager
+    ahora = datetime.datetime.now()
+    vencidos = 0
+    for evento in eventos_manager.obtener_proximos_eventos(ahora, eventos_manager.contar_eventos()):
+        for instante, _ in timer.notificaciones_manager.instantes_aviso(evento, ahora):
+            if instante <= ahora:
+                vencidos += 1
+    return vencidos
+
+
+def microsegundos(funcion, repeticiones: int) -> float:
+    """Tiempo promedio de `funcion()` en microsegundos."""
+    t0 = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - t0) / repeticiones * 1e6
+
+
+def main() -> None:
+    """Mide el planificador de recordatorios e imprime los resultados."""
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    repeticiones = 2_000
+
+    with tempfile.TemporaryDirectory() as directorio:
+        with silencio():
+            eventos_manager = EventosManager(os.path.join(directorio, "eventos.json"))
+            eventos_manager.agregar_eventos_lote(eventos_futuros(cantidad))
+            notificaciones_manager = NotificacionesManager(eventos_manager)
+            timer = NotificacionTimer(notificaciones_manager)
+
+            t0 = time.perf_counter()
+            timer.start()
+            inicio = time.perf_counter() - t0
+            programados = timer.avisos_programados()
+
+            mitad_de_anio = datetime.datetime.now() + datetime.timedelta(days=180)
+            t0 = time.perf_counter()
+            timer._programar_ventana(mitad_de_anio, datetime.timedelta(0))
+            siguiente_ventana = time.perf_counter() - t0
+            timer._programar_todos()
+
+            # Eventos dentro de la ventana: los que más trabajo dan al reprogramar
+            eventos = eventos_manager.obtener_eventos_rango(
+                datetime.datetime.now(), datetime.datetime.now() + timer.ventana
+            ) or eventos_manager.obtener_proximos_eventos(datetime.datetime.now(), 1)
+            tiempos = {
+                operacion: microsegundos(lambda: timer._eventos_cambiados(operacion, eventos[:1]), repeticiones)
+                for operacion in ('alta', 'modificacion', 'baja')
+            }
+            timer.stop()
+
+            t0 = time.perf_counter()
+            revisar_todos(timer)
+            revision = time.perf_counter() - t0
+            eventos_manager.cerrar()
+
+    print(f"📊 {cantidad:,} eventos futuros con hora, antelaciones {notificaciones_manager.horas_recordatorio} + inicio")
+    print(f"   • avisos en la ventana de {timer.ventana.days} día(s) {programados:8,}")
+    print(f"   • programar al iniciar          {inicio * 1000:10.2f} ms")
+    print(f"   • programar la ventana siguiente{siguiente_ventana * 1000:10.2f} ms")
+    for operacion, tiempo in tiempos.items():
+        print(f"   • reprogramar ({operacion:12s})  {tiempo:10.1f} µs")
+    print(f"   • revisar todos los eventos     {revision * 1000:10.1f} ms   (lo que costaría cada minuto)")
+    print(f"✅ Sin revisiones periódicas: {revision * 1440:.1f} s de CPU por día evitados")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+"""
+Comun.py - Utilidades compartidas por los benchmarks y las pruebas
+
+Este módulo se encarga de:
+- Descartar los mensajes de la aplicación mientras se mide o se prueba
+
+Autor: Mariano Capella, Gabriel Osemberg
+"""
+
+import os
+import sys
+from contextlib import contextmanager
+
+
+@contextmanager
+def silencio():
+    """Descarta lo que se imprime dentro del bloque (los mensajes de los backends)."""
+    salida, sys.stdout = sys.stdout, open(os.devnull, 'w')
+    try:
+        yield
+    finally:
+        sys.stdout.close()
+        sys.stdout = salida
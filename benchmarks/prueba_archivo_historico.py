@@ -0,0 +1,200 @@
+"""
+Prueba_Archivo_Historico.py - Activar, usar y desactivar el archivo histórico
+
+Carga un calendario con eventos de años pasados y verifica que:
+- Sin horizonte_archivo no se archiva nada (el archivo histórico es opcional)
+- Con horizonte_archivo los eventos viejos pasan al archivo histórico
+- Al abrir el calendario otra vez sin horizonte_archivo todos vuelven a memoria
+- obtener_estadisticas(), obtener_todos_los_eventos() (la lista de "mostrar
+  todos") y las estadísticas del validador cuentan los eventos archivados,
+  igual que contar_eventos()
+- obtener_proximos_eventos devuelve `cantidad` eventos aunque haya
+  archivados eliminados que todavía siguen en el archivo
+- restaurar_archivados() devuelve los eventos y vacía el archivo
+- Eliminar o editar eventos archivados reescribe el archivo una sola vez por
+  lote, después de persistir las altas (con escritura diferida, desde el hilo
+  de fondo), y los conteos no cambian mientras tanto
+
+Cada caso se corre con escritura sincrónica y con escritura diferida.
+
+Uso:
+    python -m benchmarks.prueba_archivo_historico
+
+Autor: Mariano Capella, Gabriel Osemberg
+"""
+
+import datetime
+import os
+import sys
+import tempfile
+import threading
+from src.core.eventos import EventosManager
+from src.notifications.notificaciones import ValidadorEventos
+from src.utils.configuracion import cargar_configuracion
+from benchmarks.comun import silencio
+
+
+VIEJOS = 300
+ACTUALES = 50
+
+
+def calendario(ruta: str) -> None:
+    """Escribe VIEJOS eventos de hace 3 años y ACTUALES de este año."""
+    anio = datetime.date.today().year
+    eventos_manager = EventosManager(ruta)
+    eventos_manager.agregar_eventos_lote(
+        {"titulo": f"Viejo {i}", "fecha": f"{anio - 3}-05-{1 + i % 28:02d}", "hora": "10:00"} for i in range(VIEJOS)
+    )
+    eventos_manager.agregar_eventos_lote(
+        {"titulo": f"Actual {i}", "fecha": f"{anio}-05-{1 + i % 28:02d}"} for i in range(ACTUALES)
+    )
+    eventos_manager.cerrar()
+
+
+def espiar_reescrituras(eventos_manager: EventosManager) -> list:
+    """Anota el hilo de cada reescritura del archivo histórico."""
+    hilos = []
+    historico = eventos_manager._historico
+    reescribir = historico.reescribir
+
+    def espia(*args, **kwargs):
+        hilos.append(threading.current_thread().name)
+        return reescribir(*args, **kwargs)
+
+    historico.reescribir = espia
+    return hilos
+
+
+def conteo_anio(eventos_manager: EventosManager, anio: int) -> int:
+    """Suma de la grilla de los 12 meses de un año."""
+    return sum(sum(eventos_manager.contar_eventos_mes(anio, mes).values()) for mes in range(1, 13))
+
+
+def casos_descongelar(ruta: str, diferida: bool) -> list:
+    """
+    Elimina y edita eventos archivados.
+
+    Returns:
+        list: Pares (descripción, resultado)
+    """
+    anio = datetime.date.today().year - 3
+    eliminar, editar = 100, 10
+    resultados = []
+
+    eventos_manager = EventosManager(ruta, escritura_diferida=diferida, horizonte_archivo=1)
+    hilos = espiar_reescrituras(eventos_manager)
+    archivados = eventos_manager.obtener_eventos_mes(anio, 5)
+    eliminados = eventos_manager.eliminar_eventos_lote(evento.id for evento in archivados[:eliminar])
+    principal = threading.main_thread().name
+    resultados.append(("eliminar un lote de archivados no espera al archivo" if diferida
+                       else "eliminar un lote de archivados reescribe el archivo una vez",
+                       all(exito for exito, _, _ in eliminados)
+                       and (principal not in hilos if diferida else hilos == [principal])))
+    restantes = VIEJOS + ACTUALES - eliminar
+    resultados.append(("los conteos no cambian mientras se persiste",
+                       eventos_manager.contar_eventos() == restantes and conteo_anio(eventos_manager, anio) == VIEJOS - eliminar
+                       and eventos_manager.buscar_evento_por_id(archivados[0].id) is None))
+    # Más de los que hay en memoria: el resto tiene que salir del archivo
+    pedidos = ACTUALES + 20
+    proximos = eventos_manager.obtener_proximos_eventos(datetime.date(anio, 1, 1), pedidos)
+    borrados = {evento.id for evento in archivados[:eliminar]}
+    resultados.append(("los próximos eventos omiten los eliminados sin devolver de menos",
+                       len(proximos) == pedidos and not borrados & {evento.id for evento in proximos}))
+    eventos_manager.flush()
+    resultados.append(("una sola reescritura, después de persistir las altas",
+                       len(hilos) == 1 and (hilos[0] != principal) == diferida))
+
+    for evento in archivados[eliminar:eliminar + editar]:
+        eventos_manager.actualizar_evento(evento.id, "Editado", evento.fecha, "11:00")
+    eventos_manager.flush()
+    resultados.append(("editar archivados no duplica eventos en la grilla",
+                       len(hilos) <= 1 + editar and conteo_anio(eventos_manager, anio) == VIEJOS - eliminar))
+    eventos_manager.cerrar()
+
+    eventos_manager = EventosManager(ruta, escritura_diferida=diferida, horizonte_archivo=1)
+    editados = [evento for evento in eventos_manager.buscar_eventos_por_titulo("Editado")]
+    resultados.append(("al reabrir se ven las bajas y las ediciones",
+                       eventos_manager.contar_eventos() == restantes and len(editados) == editar
+                       and eventos_manager._historico.cantidad == VIEJOS - eliminar))
+    eventos_manager.cerrar()
+    return resultados
+
+
+def casos(directorio: str, diferida: bool) -> list:
+    """
+    Corre los casos sobre un calendario nuevo.
+
+    Returns:
+        list: Pares (descripción, resultado)
+    """
+    ruta = os.path.join(directorio, f"eventos_{int(diferida)}.json")
+    historico = os.path.splitext(ruta)[0] + ".historico.evb"
+    calendario(ruta)
+    resultados = []
+
+    eventos_manager = EventosManager(ruta, escritura_diferida=diferida)
+    resultados.append(("sin horizonte no se archiva nada",
+                       len(eventos_manager.eventos) == VIEJOS + ACTUALES and not os.path.exists(historico)))
+    eventos_manager.cerrar()
+
+    eventos_manager = EventosManager(ruta, escritura_diferida=diferida, horizonte_archivo=1)
+    estadisticas = eventos_manager.obtener_estadisticas()
+    validacion = ValidadorEventos(eventos_manager).obtener_estadisticas_validacion()
+    resultados.append(("con horizonte se archivan los viejos",
+                       len(eventos_manager.eventos) == ACTUALES
+                       and eventos_manager.contar_eventos() == VIEJOS + ACTUALES))
+    resultados.append(("las estadísticas cuentan los archivados como contar_eventos",
+                       estadisticas['total_eventos'] == VIEJOS + ACTUALES
+                       and estadisticas['eventos_con_hora'] == VIEJOS
+                       and estadisticas['eventos_archivados'] == VIEJOS
+                       and sum(estadisticas['eventos_por_mes'].values()) == VIEJOS + ACTUALES))
+    resultados.append(("mostrar todos y el validador incluyen los archivados",
+                       len(eventos_manager.obtener_todos_los_eventos()) == VIEJOS + ACTUALES
+                       and validacion['total_eventos'] == VIEJOS + ACTUALES
+                       and validacion['eventos_pasados'] >= VIEJOS))
+    eventos_manager.cerrar()
+
+    eventos_manager = EventosManager(ruta, escritura_diferida=diferida)
+    resultados.append(("al desactivarlo los eventos vuelven a memoria",
+                       len(eventos_manager.eventos) == VIEJOS + ACTUALES
+                       and eventos_manager.contar_eventos() == VIEJOS + ACTUALES))
+    eventos_manager.cerrar()
+
+    eventos_manager = EventosManager(ruta, escritura_diferida=diferida, horizonte_archivo=1)
+    restaurados = eventos_manager.restaurar_archivados()
+    ids = {evento.id for evento in eventos_manager.eventos}
+    eventos_manager.cerrar()
+    eventos_manager = EventosManager(ruta, escritura_diferida=diferida)
+    resultados.append(("restaurar_archivados devuelve todos los eventos",
+                       restaurados == VIEJOS and len(ids) == VIEJOS + ACTUALES
+                       and {evento.id for evento in eventos_manager.eventos} == ids))
+    eventos_manager.cerrar()
+
+    ruta = os.path.join(directorio, f"descongelar_{int(diferida)}.json")
+    calendario(ruta)
+    return resultados + casos_descongelar(ruta, diferida)
+
+
+def main() -> None:
+    """Corre todos los casos; sale con código 1 si alguno falla."""
+    correcto = True
+    with tempfile.TemporaryDirectory() as directorio:
+        configuracion = cargar_configuracion(os.path.join(directorio, "configuracion.json"))
+        bien = configuracion["horizonte_archivo"] is None
+        correcto &= bien
+        print(f"{'✅' if bien else '❌'} la configuración por defecto no activa el archivo histórico")
+
+        for diferida in (False, True):
+            with silencio():
+                resultados = casos(directorio, diferida)
+            for descripcion, bien in resultados:
+                correcto &= bien
+                print(f"{'✅' if bien else '❌'} {descripcion} (escritura {'diferida' if diferida else 'sincrónica'})")
+
+    if not correcto:
+        sys.exit(1)
+    print("✅ El archivo histórico solo se usa si se activa y se puede deshacer")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Prueba_Archivo_Truncado.py - La carga perezosa ante un archivo JSON cortado
+
+Escribe un calendario con indent=2 (como lo guarda AlmacenamientoJSON), lo
+corta en varios puntos y abre cada copia con AlmacenamientoJSONPerezoso en un
+proceso aparte con tiempo límite. Cada caso debe terminar enseguida:
+- Con respaldo (.bak) válido: restaurado desde el respaldo
+- Sin respaldo: ValueError ("Formato inesperado")
+
+Un proceso que no termina a tiempo indica backtracking catastrófico al indexar.
+
+Uso:
+    python -m benchmarks.prueba_archivo_truncado [cantidad]
+
+Autor: Mariano Capella, Gabriel Osemberg
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from benchmarks.prueba_fallas_escritura import version
+
+
+TIEMPO_LIMITE = 10.0
+# Fracciones del archivo en las que se corta
+CORTES = [0.1, 0.5, 0.9, 0.999]
+
+
+def abrir(ruta: str) -> None:
+    """Proceso hijo: indexa el archivo e imprime el resultado."""
+    from src.core.almacenamiento_perezoso import AlmacenamientoJSONPerezoso
+    sys.stdout = open(os.devnull, 'w')
+    try:
+        almacenamiento = AlmacenamientoJSONPerezoso(ruta)
+        resultado = f"restaurado {len(almacenamiento.cargar())}"
+    except ValueError:
+        resultado = "ValueError"
+    sys.__stdout__.write(resultado + "\n")
+
+
+def caso(directorio: str, contenido: bytes, corte: float, con_respaldo: bool) -> tuple:
+    """
+    Abre una copia cortada del archivo.
+
+    Returns:
+        tuple: (resultado del hijo o "tiempo agotado", segundos)
+    """
+    ruta = os.path.join(directorio, f"eventos_{corte}_{int(con_respaldo)}.json")
+    with open(ruta, 'wb') as f:
+        f.write(contenido[:int(len(contenido) * corte)])
+    if con_respaldo:
+        with open(ruta + ".bak", 'wb') as f:
+            f.write(contenido)
+
+    t0 = time.perf_counter()
+    try:
+        salida = subprocess.run(
+            [sys.executable, "-m", "benchmarks.prueba_archivo_truncado", "--abrir", ruta],
+            capture_output=True, text=True, timeout=TIEMPO_LIMITE
+        ).stdout.strip()
+    except subprocess.TimeoutExpired:
+        salida = "tiempo agotado"
+    return salida, time.perf_counter() - t0
+
+
+def main() -> None:
+    """Corre todos los cortes con y sin respaldo; sale con código 1 si alguno falla."""
+    if sys.argv[1:2] == ["--abrir"]:
+        abrir(sys.argv[2])
+        return
+
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    contenido = json.dumps({"eventos": version(cantidad, "A")}, indent=2, ensure_ascii=False).encode('utf-8')
+
+    print(f"🧪 Archivo de {cantidad:,} eventos ({len(contenido):,} bytes) cortado en {len(CORTES)} puntos")
+    correcto = True
+    directorio = tempfile.mkdtemp()
+    try:
+        for con_respaldo in (True, False):
+            esperado = f"restaurado {cantidad}" if con_respaldo else "ValueError"
+            for corte in CORTES:
+                salida, segundos = caso(directorio, contenido, corte, con_respaldo)
+                bien = salida == esperado
+                correcto &= bien
+                print(f"{'✅' if bien else '❌'} corte {corte:6.1%} {'con' if con_respaldo else 'sin'} respaldo: "
+                      f"{salida} ({segundos:.2f} s)")
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+    if not correcto:
+        sys.exit(1)
+    print("✅ Todo archivo cortado se rechaza o se restaura enseguida")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Prueba_Avisos_Agrupados.py - Prueba de regresión: avisos simultáneos o seguidos
+
+Antes, al avisar un evento el timer salía del recorrido y se pausaba 5
+minutos: los demás eventos del mismo minuto y de los minutos siguientes no
+se avisaban nunca. Esta prueba usa un reloj controlado (sin esperas reales)
+y verifica que:
+- Los eventos que comienzan juntos salen en una sola notificación con un solo sonido
+- Ningún evento se pierde, aunque el límite de frecuencia retenga avisos
+- Lo retenido sale agrupado cuando el límite lo permite
+- Las notificaciones llevan la fecha del reloj controlado, no la del sistema
+
+Uso:
+    python -m benchmarks.prueba_avisos_agrupados
+
+Autor: Mariano Capella, Gabriel Osemberg
+"""
+
+import datetime
+import os
+import sys
+import tempfile
+from src.core.eventos import EventosManager
+from src.notifications.audio import BackendRegistro, ReproductorAudio
+from src.notifications.notificaciones import NotificacionesManager
+from src.notifications.notificacion_timer import NotificacionTimer
+from src.utils.reloj import RelojSimulado
+from benchmarks.comun import silencio
+
+
+INICIO = datetime.datetime(2025, 3, 10, 9, 58)
+# Tres eventos juntos, dos sueltos y otros dos juntos
+EVENTOS = [("A", "10:00"), ("B", "10:00"), ("C", "10:00"), ("D", "10:01"),
+           ("E", "10:03"), ("F", "10:05"), ("G", "10:05")]
+
+
+def simular(capacidad: int, intervalo: float) -> tuple:
+    """
+    Corre los eventos de EVENTOS con el límite dado.
+
+    Returns:
+        tuple: (pares (hora simulada, notificación) mostrados, urgencias de los sonidos reproducidos)
+    """
+    reloj = RelojSimulado(INICIO)
+    mostradas = []
+    sonidos = BackendRegistro()
+    audio = ReproductorAudio(sonidos, reloj=reloj)
+
+    with tempfile.TemporaryDirectory() as directorio, silencio():
+        eventos_manager = EventosManager(os.path.join(directorio, "eventos.json"))
+        eventos_manager.agregar_eventos_lote(
+            {"titulo": titulo, "fecha": INICIO.date().isoformat(), "hora": hora} for titulo, hora in EVENTOS
+        )
+        notificaciones_manager = NotificacionesManager(eventos_manager, reloj, audio)
+        notificaciones_manager.set_callback_mostrar_notificacion(
+            lambda notificacion: mostradas.append((reloj.ahora(), notificacion))
+        )
+        timer = NotificacionTimer(notificaciones_manager)
+        timer.limite.capacidad = capacidad
+        timer.limite.intervalo = intervalo
+        timer.limite.llenar()
+
+        timer.start()
+        timer.planificador.detener()  # La prueba avanza el reloj a mano
+        fin = INICIO + datetime.timedelta(minutes=30)
+        while True:
+            proximo = timer.planificador.proximo()
+            if proximo is None or proximo > fin:
+                break
+            reloj.ir_a(proximo)
+            timer.planificador.procesar_vencidos()
+        timer.stop()
+        audio.detener()
+        eventos_manager.cerrar()
+    return mostradas, sonidos.reproducidos
+
+
+def avisados(notificaciones: list) -> list:
+    """Títulos de eventos mencionados en las notificaciones, en orden."""
+    titulos = []
+    for _, notificacion in notificaciones:
+        for titulo, _ in EVENTOS:
+            if f"'{titulo}'" in notificacion.mensaje:
+                titulos.append(titulo)
+    return titulos
+
+
+def verificar(nombre: str, capacidad: int, intervalo: float, esperadas: int) -> bool:
+    """Corre un caso e imprime el resultado."""
+    mostradas, sonidos = simular(capacidad, intervalo)
+    titulos = avisados(mostradas)
+    esperados = [titulo for titulo, _ in EVENTOS]
+    fechadas = all(notificacion.fecha_notificacion == hora for hora, notificacion in mostradas)
+    correcto = (sorted(titulos) == esperados and len(mostradas) == esperadas
+                and len(sonidos) == len(mostradas) and fechadas)
+
+    print(f"{'✅' if correcto else '❌'} {nombre}")
+    print(f"   • eventos avisados   {len(set(titulos))}/{len(esperados)}"
+          f"{'' if len(titulos) == len(set(titulos)) else ' (con repetidos)'}")
+    print(f"   • notificaciones     {len(mostradas)} (esperadas {esperadas})")
+    print(f"   • sonidos            {len(sonidos)}")
+    if not fechadas:
+        print("   • fechas             ❌ no son las del reloj controlado")
+    for hora, notificacion in mostradas:
+        print(f"     - {hora:%H:%M:%S} {notificacion.titulo}")
+    return correcto
+
+
+def main() -> None:
+    """Corre los casos y sale con código 1 si alguno falla."""
+    print(f"🧪 {len(EVENTOS)} eventos entre las 10:00 y las 10:05, reloj controlado")
+    casos = [
+        # Una notificación por minuto con eventos: 10:00, 10:01, 10:03 y 10:05
+        verificar("límite por defecto (ráfagas de 3, un token cada 30 s)", 3, 30.0, 4),
+        # 10:00 sale; D (10:01) y E (10:03) quedan retenidos y salen con F y G a las 10:05
+        verificar("límite estricto (una notificación cada 5 minutos)", 1, 300.0, 2),
+    ]
+    if not all(casos):
+        sys.exit(1)
+    print("✅ Ningún evento se perdió")
+
+
+if __name__ == "__main__":
+    main()
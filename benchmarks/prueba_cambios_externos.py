@@ -0,0 +1,175 @@
+"""
+Prueba_Cambios_Externos.py - Recarga de cambios hechos por otro programa
+
+Simula la interfaz (una cola en lugar de root.after) y verifica que:
+- Los cambios de otro programa llegan con sus altas, bajas y modificaciones
+- aplicar_cambios_externos no espera mientras el persistidor escribe ni
+  mientras otro hilo tiene el bloqueo de los archivos: descarta y el
+  vigilante vuelve a entregar los cambios
+- El vigilante adopta la lectura después de aplicarla, así el próximo
+  guardado ya no combina con el disco
+- Con carga perezosa el índice se arma de nuevo fuera de la interfaz y la
+  compactación combina con lo que escribió otro programa
+
+Uso:
+    python -m benchmarks.prueba_cambios_externos
+
+Autor: Mariano Capella, Gabriel Osemberg
+"""
+
+import os
+import queue
+import sys
+import tempfile
+import threading
+import time
+from src.core.almacenamiento import AlmacenamientoJSON
+from src.core.eventos import EventosManager
+from benchmarks.comun import silencio
+
+
+# Segundos que puede tardar aplicar_cambios_externos sin considerarse bloqueado
+TOPE_APLICAR = 0.05
+
+
+def escribir_externo(ruta: str, titulo: str) -> None:
+    """Otro programa agrega un evento y reescribe el snapshot."""
+    externo = AlmacenamientoJSON(ruta)
+    eventos = externo.cargar()
+    eventos.append({"id": f"evt_externo_{titulo}", "titulo": titulo, "fecha": "2025-05-04",
+                    "hora": None, "descripcion": None, "fecha_creacion": "2025-05-04 00:00:00"})
+    externo.guardar(eventos)
+
+
+def aplicar_cronometrado(eventos_manager: EventosManager, cambios) -> tuple:
+    """Aplica los cambios y devuelve (aplicados, segundos)."""
+    inicio = time.perf_counter()
+    aplicados = eventos_manager.aplicar_cambios_externos(cambios)
+    return aplicados, time.perf_counter() - inicio
+
+
+def con_lock_tomado(lock, accion):
+    """Ejecuta `accion` mientras otro hilo tiene `lock`."""
+    tomado, soltar = threading.Event(), threading.Event()
+
+    def retener():
+        with lock:
+            tomado.set()
+            soltar.wait()
+
+    hilo = threading.Thread(target=retener)
+    hilo.start()
+    tomado.wait()
+    try:
+        return accion()
+    finally:
+        soltar.set()
+        hilo.join()
+
+
+def casos(directorio: str) -> list:
+    """
+    Corre los casos sobre un calendario nuevo.
+
+    Returns:
+        list: Pares (descripción, resultado)
+    """
+    ruta = os.path.join(directorio, "eventos.json")
+    eventos_manager = EventosManager(ruta, escritura_diferida=True)
+    _, _, evento_a = eventos_manager.agregar_evento("A", "2025-05-01", "10:00")
+    _, _, evento_b = eventos_manager.agregar_evento("B", "2025-05-02")
+    eventos_manager.flush()
+    entregados = queue.Queue()
+    eventos_manager.vigilar_cambios_externos(entregados.put, intervalo=0.05)
+    resultados = []
+
+    externo = AlmacenamientoJSON(ruta)
+    eventos = [evento for evento in externo.cargar() if evento["id"] != evento_b.id]
+    for evento in eventos:
+        if evento["id"] == evento_a.id:
+            evento["titulo"] = "A editado"
+    externo.guardar(eventos)
+    cambios = entregados.get(timeout=5)
+    resultados.append(("se detectan las bajas y modificaciones de otro programa",
+                       (len(cambios.altas), len(cambios.bajas), len(cambios.modificaciones)) == (0, 1, 1)))
+
+    # El persistidor tiene el lock de persistencia (snapshot o compactación)
+    aplicados, segundos = con_lock_tomado(eventos_manager._lock_persistencia,
+                                          lambda: aplicar_cronometrado(eventos_manager, cambios))
+    resultados.append(("con el persistidor escribiendo no se espera ni se aplica",
+                       not aplicados and segundos < TOPE_APLICAR))
+    cambios = entregados.get(timeout=5)
+    aplicados, _ = aplicar_cronometrado(eventos_manager, cambios)
+    resultados.append(("el vigilante vuelve a entregar los cambios descartados",
+                       aplicados and eventos_manager.buscar_evento_por_id(evento_a.id).titulo == "A editado"
+                       and eventos_manager.buscar_evento_por_id(evento_b.id) is None))
+
+    # Otro hilo tiene el bloqueo de los archivos (ej: el vigilante adoptando una lectura)
+    escribir_externo(ruta, "Externo")
+    cambios = entregados.get(timeout=5)
+    aplicados, segundos = con_lock_tomado(eventos_manager.almacenamiento._bloqueo,
+                                          lambda: aplicar_cronometrado(eventos_manager, cambios))
+    resultados.append(("con el bloqueo de los archivos tomado se aplica sin esperar",
+                       aplicados and segundos < TOPE_APLICAR and len(cambios.altas) == 1))
+
+    time.sleep(0.3)
+    eventos_manager.guardar_eventos()
+    resultados.append(("después de aplicar, el guardado no combina con el disco",
+                       not eventos_manager.almacenamiento.combinado and entregados.empty()))
+    eventos_manager.cerrar()
+
+    eventos_manager = EventosManager(ruta)
+    resultados.append(("al reabrir están los cambios externos",
+                       {evento.titulo for evento in eventos_manager.eventos} == {"A editado", "Externo"}))
+    eventos_manager.cerrar()
+    return resultados
+
+
+def casos_perezoso(directorio: str) -> list:
+    """
+    Cambios externos con el backend de carga perezosa.
+
+    Returns:
+        list: Pares (descripción, resultado)
+    """
+    ruta = os.path.join(directorio, "perezoso.json")
+    eventos_manager = EventosManager(ruta, carga_perezosa=True)
+    eventos_manager.agregar_evento("Propio", "2025-05-01", "10:00")
+    entregados = queue.Queue()
+    resultados = [("con carga perezosa se vigilan los cambios externos",
+                   eventos_manager.vigilar_cambios_externos(entregados.put, intervalo=0.05))]
+
+    escribir_externo(ruta, "Externo")
+    cambios = entregados.get(timeout=5)
+    aplicados, segundos = aplicar_cronometrado(eventos_manager, cambios)
+    resultados.append(("el índice nuevo se adopta sin leer el archivo en la interfaz",
+                       aplicados and segundos < TOPE_APLICAR
+                       and [evento.titulo for evento in eventos_manager.buscar_eventos_por_titulo("Externo")] == ["Externo"]))
+
+    # Otro programa escribe y la interfaz no aplica lo que entrega el vigilante:
+    # la compactación debe combinar igual
+    escribir_externo(ruta, "Sin aplicar")
+    almacenamiento = eventos_manager.almacenamiento
+    eventos_manager.agregar_evento("Antes de compactar", "2025-05-02")
+    almacenamiento.compactar()
+    titulos = {evento["titulo"] for evento in AlmacenamientoJSON(ruta).cargar()}
+    resultados.append(("compactar combina con lo que escribió otro programa",
+                       almacenamiento.combinado and {"Propio", "Externo", "Sin aplicar", "Antes de compactar"} <= titulos))
+    eventos_manager.cerrar()
+    return resultados
+
+
+def main() -> None:
+    """Corre todos los casos; sale con código 1 si alguno falla."""
+    with tempfile.TemporaryDirectory() as directorio:
+        with silencio():
+            resultados = casos(directorio) + casos_perezoso(directorio)
+    for descripcion, bien in resultados:
+        print(f"{'✅' if bien else '❌'} {descripcion}")
+    if not all(bien for _, bien in resultados):
+        sys.exit(1)
+    print("✅ Los cambios externos se aplican sin bloquear la interfaz")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Prueba_Concurrencia.py - Prueba de estrés: varios procesos escribiendo el mismo archivo
+
+Lanza N procesos que usan EventosManager sobre el mismo data/eventos.json al
+mismo tiempo. Cada uno da de alta sus propios eventos, modifica y elimina
+algunos, y compacta el journal muy seguido (umbral bajo) para forzar
+guardados completos concurrentes. Al final se verifica que el archivo
+contenga exactamente los cambios de todos los procesos.
+
+También se verifica que se detecten los programas externos que reescriben
+el snapshot sin incrementar la revisión o con las claves en otro orden.
+
+Con --sin-control se desactiva el control optimista de revisión (cada
+guardado escribe su memoria tal cual, como antes) para comparar.
+
+Uso:
+    python -m benchmarks.prueba_concurrencia [procesos] [eventos] [--sin-control]
+
+Autor: Mariano Capella, Gabriel Osemberg
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from src.core.almacenamiento import AlmacenamientoJSON
+from src.core.eventos import EventosManager
+from benchmarks.comun import silencio
+
+
+def escritor(ruta: str, numero: int, cantidad: int, sin_control: bool) -> None:
+    """Proceso hijo: altas, modificaciones y bajas de sus propios eventos."""
+    sys.stdout = open(os.devnull, 'w')
+    manager = EventosManager(ruta)
+    manager.almacenamiento.journal.umbral_compactacion = 10
+    if sin_control:
+        # Nunca adopta una carga: guardar() no detecta escrituras ajenas
+        manager.almacenamiento.adoptar_lectura = lambda lectura=None: None
+        manager.almacenamiento._estado_base = None
+
+    ids = []
+    for i in range(cantidad):
+        exito, mensaje, evento = manager.agregar_evento(f"p{numero} e{i}", "2025-06-01", "10:00")
+        if not exito:
+            raise RuntimeError(mensaje)
+        ids.append(evento.id)
+        if i % 3 == 2:
+            exito, mensaje, _ = manager.actualizar_evento(ids[i - 1], f"p{numero} e{i - 1} editado",
+                                                          "2025-06-02", "11:00")
+            if not exito:
+                raise RuntimeError(mensaje)
+        if i % 5 == 4:
+            exito, mensaje = manager.eliminar_evento(ids[i - 4])
+            if not exito:
+                raise RuntimeError(mensaje)
+    manager.guardar_eventos()
+    manager.cerrar()
+
+
+def esperados(numero: int, cantidad: int) -> dict:
+    """Títulos finales que deberían quedar para un proceso: índice -> título."""
+    titulos = {}
+    for i in range(cantidad):
+        titulos[i] = f"p{numero} e{i}"
+        if i % 3 == 2:
+            titulos[i - 1] = f"p{numero} e{i - 1} editado"
+        if i % 5 == 4:
+            titulos.pop(i - 4, None)
+    return titulos
+
+
+def escritores_externos(directorio: str) -> list:
+    """
+    Otro programa reescribe el snapshot sin pasar por el journal.
+
+    Returns:
+        list: Pares (descripción, resultado)
+    """
+    variantes = [
+        ("sin incrementar la revisión", 0),
+        ("con la revisión después de otras claves", 1),
+    ]
+    resultados = []
+    for numero, (descripcion, incremento) in enumerate(variantes):
+        ruta = os.path.join(directorio, f"externo_{numero}.json")
+        with silencio():
+            manager = EventosManager(ruta)
+            manager.agregar_evento("propio", "2025-06-01")
+            manager.guardar_eventos()
+            with open(ruta, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            externo = dict(data["eventos"][0], id="evt_externo", titulo="externo")
+            revision = data["revision"] + incremento
+            with open(ruta, 'w', encoding='utf-8') as f:
+                json.dump({"version": "1.0", "revision": revision, "eventos": data["eventos"] + [externo]}, f)
+            manager.guardar_eventos()
+            combinado = manager.almacenamiento.combinado
+            manager.cerrar()
+            titulos = {evento['titulo'] for evento in AlmacenamientoJSON(ruta).cargar()}
+            with open(ruta, 'r', encoding='utf-8') as f:
+                revision_final = json.load(f)["revision"]
+        resultados.append((f"se combina con un snapshot reescrito {descripcion}",
+                           combinado and titulos == {"propio", "externo"} and revision_final == revision + 1))
+    return resultados
+
+
+def main() -> None:
+    """Lanza los procesos, espera a que terminen y verifica el resultado."""
+    argumentos = [a for a in sys.argv[1:] if not a.startswith("--")]
+    sin_control = "--sin-control" in sys.argv
+    procesos = int(argumentos[0]) if argumentos else 8
+    cantidad = int(argumentos[1]) if len(argumentos) > 1 else 60
+
+    with tempfile.TemporaryDirectory() as directorio:
+        externos = escritores_externos(directorio)
+        ruta = os.path.join(directorio, "eventos.json")
+        with silencio():
+            AlmacenamientoJSON(ruta).cargar()  # archivo inicial
+
+        modo = "sin control optimista" if sin_control else "bloqueo + control optimista"
+        print(f"🧵 {procesos} procesos x {cantidad} altas sobre el mismo archivo ({modo})")
+        t0 = time.perf_counter()
+        hijos = [
+            subprocess.Popen([sys.executable, "-m", "benchmarks.prueba_concurrencia", "--escritor",
+                              ruta, str(numero), str(cantidad)] + (["--sin-control"] if sin_control else []))
+            for numero in range(procesos)
+        ]
+        fallidos = sum(1 for hijo in hijos if hijo.wait() != 0)
+        duracion = time.perf_counter() - t0
+
+        with silencio():
+            eventos = AlmacenamientoJSON(ruta).cargar()
+
+    obtenidos = sorted(evento['titulo'] for evento in eventos)
+    esperado = sorted(titulo for numero in range(procesos)
+                      for titulo in esperados(numero, cantidad).values())
+    faltantes = len(set(esperado) - set(obtenidos))
+    sobrantes = len(set(obtenidos) - set(esperado))
+
+    print(f"   • duración                {duracion:8.2f} s")
+    print(f"   • eventos esperados       {len(esperado):8d}")
+    print(f"   • eventos en el archivo   {len(obtenidos):8d}")
+    print(f"   • cambios perdidos        {faltantes + sobrantes:8d}")
+    for descripcion, bien in externos:
+        print(f"{'✅' if bien else '❌'} {descripcion}")
+    if not all(bien for _, bien in externos):
+        print("❌ No se detectaron escrituras de otro programa")
+        sys.exit(1)
+    if fallidos or obtenidos != esperado:
+        print(f"❌ Se perdieron cambios ({fallidos} procesos con error)")
+        sys.exit(1)
+    print("✅ El archivo contiene los cambios de todos los procesos")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--escritor":
+        escritor(sys.argv[2], int(sys.argv[3]), int(sys.argv[4]), "--sin-control" in sys.argv)
+    else:
+        main()
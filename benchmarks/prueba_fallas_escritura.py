@@ -0,0 +1,116 @@
+"""
+Prueba_Fallas_Escritura.py - Inyección de fallas: matar al proceso en medio del guardado
+
+Lanza un proceso escritor que guarda el snapshot sin parar (alternando dos
+versiones del calendario) y lo mata con SIGKILL en un momento al azar. Luego
+carga el archivo y verifica que contenga una de las dos versiones completas.
+Se repite con el guardado anterior (open 'w' directo) para comparar.
+
+Uso:
+    python -m benchmarks.prueba_fallas_escritura [intentos] [cantidad]
+
+Autor: Mariano Capella, Gabriel Osemberg
+"""
+
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from src.core.almacenamiento import AlmacenamientoJSON
+from benchmarks.bench_escritura_atomica import guardar_directo
+from benchmarks.comun import silencio
+
+
+def version(cantidad: int, marca: str) -> list:
+    """Calendario sintético en el que todos los títulos llevan la misma marca."""
+    return [
+        {"id": f"evt_{i:08d}", "titulo": f"{marca} {i}", "fecha": "2025-01-01",
+         "hora": None, "descripcion": None, "fecha_creacion": "2025-01-01 00:00:00"}
+        for i in range(cantidad)
+    ]
+
+
+def escritor(modo: str, ruta: str, cantidad: int) -> None:
+    """Proceso hijo: guarda las versiones A y B alternadamente hasta que lo maten."""
+    versiones = [version(cantidad, "A"), version(cantidad, "B")]
+    almacenamiento = AlmacenamientoJSON(ruta)
+    sys.stdout = open(os.devnull, 'w')
+    vuelta = 0
+    while True:
+        eventos = versiones[vuelta % 2]
+        if modo == "atomico":
+            almacenamiento.guardar(eventos)
+        else:
+            guardar_directo(ruta, eventos)
+        if vuelta == 0:
+            sys.__stdout__.write("listo\n")
+            sys.__stdout__.flush()
+        vuelta += 1
+
+
+def verificar(modo: str, ruta: str, cantidad: int) -> bool:
+    """Indica si el archivo quedó con una versión completa (todo A o todo B)."""
+    try:
+        if modo == "atomico":
+            with silencio():
+                eventos = AlmacenamientoJSON(ruta).cargar()
+        else:
+            with open(ruta, 'r', encoding='utf-8') as f:
+                eventos = json.load(f)["eventos"]
+    except (OSError, ValueError, KeyError):
+        return False
+    marcas = {evento["titulo"].split()[0] for evento in eventos}
+    return len(eventos) == cantidad and len(marcas) == 1
+
+
+def probar(modo: str, intentos: int, cantidad: int) -> int:
+    """
+    Mata al escritor `intentos` veces.
+
+    Returns:
+        int: Cantidad de veces que el archivo quedó dañado o incompleto
+    """
+    fallas = 0
+    for _ in range(intentos):
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "eventos.json")
+            proceso = subprocess.Popen(
+                [sys.executable, "-m", "benchmarks.prueba_fallas_escritura",
+                 "--escritor", modo, ruta, str(cantidad)],
+                stdout=subprocess.PIPE, text=True
+            )
+            proceso.stdout.readline()  # primer guardado completo
+            time.sleep(random.uniform(0, 0.3))
+            proceso.kill()
+            proceso.wait()
+            proceso.stdout.close()
+            if not verificar(modo, ruta, cantidad):
+                fallas += 1
+    return fallas
+
+
+def main() -> None:
+    """Ejecuta la prueba para ambos modos e imprime los resultados."""
+    intentos = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    cantidad = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+    print(f"💥 {intentos} guardados interrumpidos con SIGKILL ({cantidad:,} eventos)")
+
+    directo = probar("directo", intentos, cantidad)
+    print(f"   • open('w') + json.dump         {directo:3d} archivos dañados")
+    atomico = probar("atomico", intentos, cantidad)
+    print(f"   • temporal + fsync + replace    {atomico:3d} archivos dañados")
+
+    if atomico:
+        print("❌ La escritura atómica dejó archivos dañados")
+        sys.exit(1)
+    print("✅ Ningún guardado interrumpido dañó el calendario")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--escritor":
+        escritor(sys.argv[2], sys.argv[3], int(sys.argv[4]))
+    else:
+        main()
@@ -0,0 +1,62 @@
+"""
+Prueba_Identificadores.py - Orden y unicidad de los IDs de eventos
+
+Verifica que los IDs de generar_id_evento:
+- Salen estrictamente crecientes como texto, aun de a miles por milisegundo
+- Quedan después de los IDs del formato anterior (evt_YYYYmmdd_HHMMSS_N) que
+  ya están en data/eventos.json, así ordenar por ID sigue siendo ordenar por creación
+- No se repiten entre varios hilos
+
+Uso:
+    python -m benchmarks.prueba_identificadores [cantidad]
+
+Autor: Mariano Capella, Gabriel Osemberg
+"""
+
+import sys
+import threading
+from src.core.identificadores import generar_id_evento
+
+
+# IDs del formato anterior (el más grande posible incluido)
+IDS_ANTERIORES = ["evt_20250627_194440_0", "evt_20250628_180101_5", "evt_99991231_235959_999999"]
+HILOS = 4
+
+
+def main() -> None:
+    """Corre las verificaciones; sale con código 1 si alguna falla."""
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    ids = [generar_id_evento() for _ in range(cantidad)]
+    crecientes = all(a < b for a, b in zip(ids, ids[1:]))
+
+    mezclados = IDS_ANTERIORES + ids[:10]
+    despues = sorted(mezclados) == mezclados
+
+    por_hilo = [[] for _ in range(HILOS)]
+    hilos = [
+        threading.Thread(target=lambda lista: lista.extend(generar_id_evento() for _ in range(cantidad // HILOS)),
+                         args=(lista,))
+        for lista in por_hilo
+    ]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    todos = [evento_id for lista in por_hilo for evento_id in lista]
+    unicos = len(set(todos)) == len(todos)
+
+    casos = [
+        (f"{cantidad:,} IDs estrictamente crecientes", crecientes),
+        ("los IDs nuevos ordenan después de los del formato anterior", despues),
+        (f"{len(todos):,} IDs de {HILOS} hilos sin repetidos", unicos),
+    ]
+    for descripcion, bien in casos:
+        print(f"{'✅' if bien else '❌'} {descripcion}")
+    if not all(bien for _, bien in casos):
+        sys.exit(1)
+    print(f"✅ Ejemplo: {ids[0]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Prueba_Lotes.py - Altas y bajas en lote con datos inválidos
+
+Con cada backend (JSON, JSON con carga perezosa, SQLite) verifica que:
+- agregar_eventos_lote informa cada elemento inválido (título vacío, fecha
+  inexistente, campos faltantes o de otro tipo, elementos que no son
+  diccionarios) sin cortar el lote: los válidos se agregan igual
+- Los resultados vienen en el mismo orden que los datos
+- eliminar_eventos_lote informa los IDs inexistentes o repetidos
+- Si la persistencia falla no queda ningún evento del lote
+
+Uso:
+    python -m benchmarks.prueba_lotes
+
+Autor: Mariano Capella, Gabriel Osemberg
+"""
+
+import os
+import sys
+import tempfile
+from src.core.eventos import EventosManager
+from benchmarks.comun import silencio
+
+
+VALIDOS = 50
+# Elementos inválidos que se intercalan en el lote
+INVALIDOS = [
+    {"titulo": "", "fecha": "2025-01-01"},
+    {"titulo": "Fecha inexistente", "fecha": "2025-02-31"},
+    {"fecha": None},
+    {"titulo": "Descripción que no es texto", "fecha": "2025-01-01", "descripcion": 5},
+    None,
+    "Reunión 2025-01-01",
+    ["titulo", "fecha"],
+]
+
+
+def lote() -> list:
+    """VALIDOS eventos con los INVALIDOS intercalados."""
+    datos = [{"titulo": f"Evento {i}", "fecha": f"2025-03-{1 + i % 28:02d}", "hora": "10:00"}
+             for i in range(VALIDOS)]
+    for posicion, invalido in enumerate(INVALIDOS):
+        datos.insert(posicion * 5 + 1, invalido)
+    return datos
+
+
+def casos(ruta: str, carga_perezosa: bool) -> list:
+    """
+    Corre los casos con un backend.
+
+    Returns:
+        list: Pares (descripción, resultado)
+    """
+    resultados = []
+    eventos_manager = EventosManager(ruta, carga_perezosa=carga_perezosa)
+    datos = lote()
+    agregados = eventos_manager.agregar_eventos_lote(datos)
+    en_orden = all(exito == (dato not in INVALIDOS) for dato, (exito, _, _) in zip(datos, agregados))
+    resultados.append(("los inválidos se informan y los válidos se agregan",
+                       len(agregados) == len(datos) and en_orden
+                       and eventos_manager.contar_eventos() == VALIDOS))
+
+    ids = [evento.id for exito, _, evento in agregados if exito]
+    eliminados = eventos_manager.eliminar_eventos_lote(ids[:10] + ["evt_inexistente", ids[0]])
+    resultados.append(("las bajas informan IDs inexistentes o repetidos",
+                       [exito for exito, _, _ in eliminados] == [True] * 10 + [False, False]
+                       and eventos_manager.contar_eventos() == VALIDOS - 10))
+    eventos_manager.cerrar()
+
+    eventos_manager = EventosManager(ruta, carga_perezosa=carga_perezosa)
+    resultados.append(("al reabrir están los cambios del lote", eventos_manager.contar_eventos() == VALIDOS - 10))
+
+    def falla(cambios):
+        raise OSError("disco lleno")
+
+    eventos_manager.almacenamiento.registrar_lote = falla
+    fallidos = eventos_manager.agregar_eventos_lote(lote())
+    resultados.append(("si la persistencia falla no queda ninguno",
+                       not any(exito for exito, _, _ in fallidos)
+                       and eventos_manager.contar_eventos() == VALIDOS - 10))
+    eventos_manager.cerrar()
+    return resultados
+
+
+def main() -> None:
+    """Corre los casos con cada backend; sale con código 1 si alguno falla."""
+    correcto = True
+    with tempfile.TemporaryDirectory() as directorio:
+        for nombre, archivo, carga_perezosa in (("json", "eventos.json", False),
+                                                ("json-perezoso", "perezoso.json", True),
+                                                ("sqlite", "lotes.db", False)):
+            with silencio():
+                resultados = casos(os.path.join(directorio, archivo), carga_perezosa)
+            for descripcion, bien in resultados:
+                correcto &= bien
+                print(f"{'✅' if bien else '❌'} {descripcion} ({nombre})")
+    if not correcto:
+        sys.exit(1)
+    print("✅ Un elemento inválido no corta el lote")
+
+
+if __name__ == "__main__":
+    main()
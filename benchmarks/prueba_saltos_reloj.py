@@ -0,0 +1,103 @@
+"""
+Prueba_Saltos_Reloj.py - El planificador de avisos ante suspensiones y cambios de hora
+
+Usa un reloj cuya hora de pared se puede adelantar sin que avance el reloj
+monotónico (lo que pasa al suspender el equipo) y verifica que:
+- Por defecto el planificador no se despierta mientras espera un aviso lejano
+- Al despertar nota el salto y entrega los avisos que vencieron mientras tanto
+- Con espera_maxima el salto se nota sin que nada lo despierte
+
+Uso:
+    python -m benchmarks.prueba_saltos_reloj
+
+Autor: Mariano Capella, Gabriel Osemberg
+"""
+
+import datetime
+import os
+import queue
+import sys
+import tempfile
+import time
+from src.notifications.planificador import PlanificadorAvisos
+from src.utils.configuracion import cargar_configuracion
+from src.utils.reloj import Reloj
+from benchmarks.comun import silencio
+
+
+class RelojSuspendible(Reloj):
+    """Reloj del sistema cuya hora de pared se adelanta con suspender()."""
+
+    def __init__(self):
+        """Arranca sin corrimiento: la hora del sistema."""
+        self.corrimiento = datetime.timedelta(0)
+
+    def ahora(self) -> datetime.datetime:
+        """Hora del sistema más lo suspendido."""
+        return datetime.datetime.now() + self.corrimiento
+
+    def suspender(self, segundos: float) -> None:
+        """Simula una suspensión: la hora de pared avanza y el reloj monotónico no."""
+        self.corrimiento += datetime.timedelta(seconds=segundos)
+
+
+def casos() -> list:
+    """
+    Corre los casos con el planificador real (esperas reales de décimas de segundo).
+
+    Returns:
+        list: Pares (descripción, resultado)
+    """
+    resultados = []
+    with tempfile.TemporaryDirectory() as directorio:
+        configuracion = cargar_configuracion(os.path.join(directorio, "configuracion.json"))
+    resultados.append(("por defecto no hay tope de espera",
+                       configuracion["espera_maxima_avisos"] is None and PlanificadorAvisos.ESPERA_MAXIMA is None))
+
+    reloj = RelojSuspendible()
+    entregados = queue.Queue()
+    planificador = PlanificadorAvisos(entregados.put, reloj=reloj)
+    planificador.iniciar()
+    time.sleep(0.1)
+    lejano = reloj.ahora() + datetime.timedelta(hours=1)
+    planificador.programar("lejano", [(lejano, None)])
+    time.sleep(0.1)
+    despertares = planificador.despertares
+    time.sleep(0.5)
+    resultados.append(("esperando un aviso lejano el hilo no se despierta",
+                       planificador.despertares == despertares and entregados.empty()))
+
+    # Al volver de la suspensión un aviso que se adelanta despierta al hilo
+    reloj.suspender(2 * 3600)
+    planificador.programar("cercano", [(lejano - datetime.timedelta(minutes=1), None)])
+    avisos = entregados.get(timeout=2)
+    resultados.append(("al despertar se nota el salto y sale todo lo vencido",
+                       planificador.saltos_reloj == 1 and [aviso.clave for aviso in avisos] == ["cercano", "lejano"]))
+    planificador.detener(1)
+
+    reloj = RelojSuspendible()
+    planificador = PlanificadorAvisos(entregados.put, reloj=reloj, espera_maxima=0.2)
+    planificador.programar("lejano", [(reloj.ahora() + datetime.timedelta(hours=1), None)])
+    planificador.iniciar()
+    time.sleep(0.1)
+    reloj.suspender(2 * 3600)
+    avisos = entregados.get(timeout=2)
+    resultados.append(("con espera_maxima el salto se nota sin otro despertar",
+                       planificador.saltos_reloj == 1 and [aviso.clave for aviso in avisos] == ["lejano"]))
+    planificador.detener(1)
+    return resultados
+
+
+def main() -> None:
+    """Corre todos los casos; sale con código 1 si alguno falla."""
+    with silencio():
+        resultados = casos()
+    for descripcion, bien in resultados:
+        print(f"{'✅' if bien else '❌'} {descripcion}")
+    if not all(bien for _, bien in resultados):
+        sys.exit(1)
+    print("✅ El planificador duerme hasta el próximo aviso y nota los saltos del reloj")
+
+
+if __name__ == "__main__":
+    main()
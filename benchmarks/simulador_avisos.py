@@ -0,0 +1,242 @@
+"""
+Simulador_Avisos.py - Un año de avisos a toda velocidad con un reloj simulado
+
+Carga eventos sintéticos repartidos en un año (con grupos que comienzan en el
+mismo minuto y algunos con antelaciones propias), y durante la simulación
+agrega, mueve y elimina eventos como lo haría el usuario. El reloj
+(RelojSimulado) salta de un vencimiento al siguiente, así el año entero se
+recorre en segundos y el resultado es siempre el mismo.
+
+Sirve como prueba de rendimiento y de correctitud para cambios en el
+planificador. Informa:
+- Avisos y notificaciones entregados
+- Latencia de cada aviso respecto del instante programado (tiempo simulado)
+- Avisos perdidos, de más o repetidos (sale con código 1 si hay alguno)
+- Tiempo real consumido por el planificador y por los cambios
+
+Uso:
+    python -m benchmarks.simulador_avisos [eventos] [cambios]
+
+Autor: Mariano Capella, Gabriel Osemberg
+"""
+
+import collections
+import datetime
+import os
+import random
+import sys
+import tempfile
+import time
+from src.core.eventos import EventosManager
+from src.notifications.notificaciones import NotificacionesManager
+from src.notifications.notificacion_timer import NotificacionTimer
+from src.utils.reloj import RelojSimulado
+from benchmarks.comun import silencio
+
+
+INICIO = datetime.datetime(2025, 1, 1)
+DIAS = 365
+# Los cambios mueven o crean eventos hasta 3 días después del cambio
+FIN = INICIO + datetime.timedelta(days=DIAS + 4)
+# Antelaciones propias de algunos eventos ([] = solo el aviso de inicio)
+ANTELACIONES_PROPIAS = [[48, 2, 0.5], [0.25, 0.01], []]
+
+
+class TimerRegistrado(NotificacionTimer):
+    """Timer que anota cada aviso entregado en lugar de mostrarlo."""
+
+    def __init__(self, notificaciones_manager: NotificacionesManager):
+        super().__init__(notificaciones_manager)
+        self.registro = []  # (entregado, evento_id, horas, programado)
+        self.notificaciones = 0
+        # id del dato de cada aviso vencido -> instante programado (el evento puede moverse
+        # mientras el aviso espera en la cola)
+        self._programados = {}
+
+    def _avisos_vencidos(self, avisos: list) -> None:
+        for aviso in avisos:
+            if aviso.dato is not None:
+                self._programados[id(aviso.dato)] = aviso.instante
+        super()._avisos_vencidos(avisos)
+
+    def _entregar_grupo(self, grupo: list) -> None:
+        entregado = self.reloj.ahora()
+        for dato in grupo:
+            evento, horas = dato
+            self.registro.append((entregado, evento.id, horas, self._programados.pop(id(dato))))
+        # Se arma la notificación (es parte del costo) pero no se muestra
+        self.notificaciones_manager.generar_notificacion_avisos(grupo)
+        self.notificaciones += 1
+
+
+def instante_aleatorio(desde: datetime.datetime, dias: int) -> datetime.datetime:
+    """Un minuto cualquiera entre `desde` (excluido) y `dias` días después."""
+    return desde.replace(second=0, microsecond=0) + datetime.timedelta(minutes=random.randint(1, dias * 1440))
+
+
+def datos_evento(titulo: str, inicio: datetime.datetime) -> dict:
+    """Datos de alta de un evento que comienza en `inicio`."""
+    return {"titulo": titulo, "fecha": inicio.strftime("%Y-%m-%d"), "hora": inicio.strftime("%H:%M")}
+
+
+def esperados(inicio: datetime.datetime, horas: list, desde: datetime.datetime) -> list:
+    """Avisos (horas, instante) de un evento desde `desde`: sus antelaciones y el inicio."""
+    avisos = [(h, inicio - datetime.timedelta(hours=h)) for h in horas] + [(0, inicio)]
+    return [(h, instante) for h, instante in avisos if instante >= desde]
+
+
+def eventos_iniciales(cantidad: int) -> list:
+    """Inicios de los eventos del año; uno de cada diez comparte minuto con otro."""
+    inicios = []
+    for _ in range(cantidad):
+        if inicios and random.random() < 0.1:
+            inicios.append(random.choice(inicios))
+        else:
+            inicios.append(instante_aleatorio(INICIO, DIAS))
+    return inicios
+
+
+def cambios_aleatorios(cantidad: int) -> list:
+    """Instantes y tipos de los cambios, en orden (a los :30 para no coincidir con avisos)."""
+    instantes = sorted(instante_aleatorio(INICIO, DIAS) + datetime.timedelta(seconds=30) for _ in range(cantidad))
+    return [(instante, random.choice(('alta', 'baja', 'modificacion'))) for instante in instantes]
+
+
+def simular(cantidad: int, cantidad_cambios: int) -> dict:
+    """
+    Corre la simulación completa.
+
+    Returns:
+        dict: Registro de entregas, avisos esperados y tiempos medidos
+    """
+    random.seed(2025)
+    reloj = RelojSimulado(INICIO)
+    esperado = collections.Counter()  # (evento_id, horas, instante programado)
+    tiempos = {'carga': 0.0, 'planificador': 0.0, 'cambios': 0.0}
+
+    with tempfile.TemporaryDirectory() as directorio, silencio():
+        eventos_manager = EventosManager(os.path.join(directorio, "eventos.json"))
+        notificaciones_manager = NotificacionesManager(eventos_manager, reloj)
+        generales = notificaciones_manager.horas_recordatorio
+
+        t0 = time.perf_counter()
+        inicios = eventos_iniciales(cantidad)
+        resultados = eventos_manager.agregar_eventos_lote(
+            datos_evento(f"Evento {i}", inicio) for i, inicio in enumerate(inicios)
+        )
+        vivos = {}  # evento_id -> (inicio, horas)
+        for (_, _, evento), inicio in zip(resultados, inicios):
+            horas = generales
+            if random.random() < 0.02:
+                horas = random.choice(ANTELACIONES_PROPIAS)
+                notificaciones_manager.set_recordatorios_evento(evento.id, horas)
+            vivos[evento.id] = (inicio, horas)
+            esperado.update((evento.id, h, instante) for h, instante in esperados(inicio, horas, INICIO))
+
+        timer = TimerRegistrado(notificaciones_manager)
+        timer.start()
+        timer.planificador.detener()  # El simulador avanza el reloj
+        tiempos['carga'] = time.perf_counter() - t0
+
+        cambios = collections.deque(cambios_aleatorios(cantidad_cambios))
+        altas = 0
+        while True:
+            proximo = timer.planificador.proximo()
+            if cambios and (proximo is None or cambios[0][0] <= proximo):
+                instante, operacion = cambios.popleft()
+                reloj.ir_a(instante)
+                if operacion == 'alta' or not vivos:
+                    inicio = instante_aleatorio(instante, 3)
+                    t0 = time.perf_counter()
+                    _, _, evento = eventos_manager.agregar_evento(**datos_evento(f"Nuevo {altas}", inicio))
+                    tiempos['cambios'] += time.perf_counter() - t0
+                    altas += 1
+                    vivos[evento.id] = (inicio, generales)
+                    esperado.update((evento.id, h, i) for h, i in esperados(inicio, generales, instante))
+                    continue
+                evento_id = random.choice(list(vivos))
+                inicio_anterior, horas = vivos[evento_id]
+                # Lo que vencía antes del cambio ya tuvo que salir; lo posterior se descarta
+                esperado.subtract((evento_id, h, i) for h, i in esperados(inicio_anterior, horas, instante))
+                if operacion == 'baja':
+                    t0 = time.perf_counter()
+                    eventos_manager.eliminar_evento(evento_id)
+                    tiempos['cambios'] += time.perf_counter() - t0
+                    del vivos[evento_id]
+                    continue
+                inicio = instante_aleatorio(instante, 3)
+                datos = datos_evento(f"Movido {evento_id}", inicio)
+                t0 = time.perf_counter()
+                eventos_manager.actualizar_evento(evento_id, datos["titulo"], datos["fecha"], datos["hora"])
+                tiempos['cambios'] += time.perf_counter() - t0
+                vivos[evento_id] = (inicio, horas)
+                esperado.update((evento_id, h, i) for h, i in esperados(inicio, horas, instante))
+                continue
+            if proximo is None or proximo > FIN:
+                break
+            reloj.ir_a(proximo)
+            t0 = time.perf_counter()
+            timer.planificador.procesar_vencidos()
+            tiempos['planificador'] += time.perf_counter() - t0
+
+        timer.stop()
+        eventos_manager.cerrar()
+
+    return {
+        'registro': timer.registro,
+        'notificaciones': timer.notificaciones,
+        'esperado': +esperado,
+        'tiempos': tiempos,
+    }
+
+
+def percentil(valores: list, p: float) -> float:
+    """Percentil `p` (0-100) de una lista ordenada."""
+    if not valores:
+        return 0.0
+    return valores[min(int(len(valores) * p / 100), len(valores) - 1)]
+
+
+def main() -> None:
+    """Simula el año e imprime el informe; sale con código 1 si hubo avisos perdidos o de más."""
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    cantidad_cambios = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000
+
+    t0 = time.perf_counter()
+    resultado = simular(cantidad, cantidad_cambios)
+    total = time.perf_counter() - t0
+
+    registro = resultado['registro']
+    entregado = collections.Counter((evento_id, h, programado) for _, evento_id, h, programado in registro)
+    esperado = resultado['esperado']
+    perdidos = esperado - entregado
+    de_mas = entregado - esperado
+    repetidos = sum(n - 1 for n in entregado.values() if n > 1)
+    latencias = sorted((entregado_en - programado).total_seconds() for entregado_en, _, _, programado in registro)
+    tiempos = resultado['tiempos']
+
+    print(f"📊 Simulación de {DIAS} días: {cantidad:,} eventos y {cantidad_cambios:,} cambios")
+    print(f"   • avisos entregados        {len(registro):10,} (esperados {sum(esperado.values()):,})")
+    print(f"   • notificaciones           {resultado['notificaciones']:10,}")
+    print(f"   • latencia media           {sum(latencias) / max(len(latencias), 1):10.2f} s")
+    print(f"   • latencia p99 / máxima    {percentil(latencias, 99):10.2f} s / {latencias[-1] if latencias else 0:.2f} s")
+    print(f"   • avisos perdidos          {sum(perdidos.values()):10,}")
+    print(f"   • avisos de más            {sum(de_mas.values()):10,}")
+    print(f"   • avisos repetidos         {repetidos:10,}")
+    print(f"   • carga e inicio           {tiempos['carga'] * 1000:10.1f} ms")
+    print(f"   • planificador y entregas  {tiempos['planificador'] * 1000:10.1f} ms "
+          f"({tiempos['planificador'] / max(len(registro), 1) * 1e6:.1f} µs por aviso)")
+    print(f"   • cambios                  {tiempos['cambios'] * 1000:10.1f} ms "
+          f"({tiempos['cambios'] / max(cantidad_cambios, 1) * 1e6:.1f} µs por cambio)")
+    print(f"   • total                    {total:10.2f} s para {DIAS} días simulados")
+
+    if perdidos or de_mas:
+        for (evento_id, h, programado), n in list((perdidos + de_mas).items())[:10]:
+            estado = "perdido" if (evento_id, h, programado) in perdidos else "de más"
+            print(f"   ❌ {estado}: {evento_id} {h:g} h antes, programado {programado:%Y-%m-%d %H:%M:%S} (x{n})")
+        sys.exit(1)
+    print("✅ Ningún aviso perdido ni de más")
+
+
+if __name__ == "__main__":
+    main()
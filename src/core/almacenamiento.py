@@ -0,0 +1,749 @@
+"""
+Almacenamiento.py - Backends de persistencia para EventosManager
+
+Este módulo se encarga de:
+- Definir la interfaz de almacenamiento que usa EventosManager
+- Persistencia en JSON (snapshot + journal incremental)
+- Persistencia en SQLite con índices y modo WAL
+- Migración automática del JSON existente a SQLite
+- Selección del backend según la extensión del archivo de datos
+- Acceso seguro desde varios procesos (bloqueo + control optimista de revisión)
+
+Los backends trabajan con diccionarios (el formato de Evento.to_dict) para no
+depender del modelo; EventosManager se encarga de construir los Evento.
+
+Autor: Mariano Capella, Gabriel Osemberg
+"""
+
+import json
+import datetime
+import os
+import re
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from src.core.journal import JournalEventos
+from src.core.bloqueo import BloqueoArchivo
+from src.core.escritura_atomica import escritura_atomica, recuperar_respaldo
+from src.core.formato_binario import EXTENSIONES_BINARIAS, escribir_snapshot, leer_snapshot
+
+
+CAMPOS_EVENTO = ('id', 'titulo', 'fecha', 'hora', 'descripcion', 'fecha_creacion')
+
+EXTENSIONES_SQLITE = ('.db', '.sqlite', '.sqlite3')
+
+# La revisión va en la cabecera del snapshot: se lee sin decodificar el archivo.
+# No se exige que sea la primera clave (otro programa puede reordenarlas)
+_RE_REVISION = re.compile(rb'[{,]\s*"revision"\s*:\s*(\d+)')
+# Bytes del comienzo del snapshot en los que se busca la revisión
+_LARGO_CABECERA = 512
+
+
+class AlmacenamientoEventos:
+    """
+    Interfaz de almacenamiento de eventos.
+    
+    Los backends que no resuelven consultas por sí mismos (consultas_indexadas
+    = False) se cargan completos en memoria y EventosManager responde las
+    consultas con sus índices. Los que sí las resuelven implementan los
+    métodos obtener_* / buscar_* / contar.
+    """
+    
+    nombre = "base"
+    consultas_indexadas = False
+    # True si el último guardar() combinó cambios de otro proceso en lugar de
+    # escribir los eventos recibidos (los eventos en memoria quedaron viejos)
+    combinado = False
+    
+    def cargar(self) -> List[dict]:
+        """
+        Carga todos los eventos.
+        
+        Returns:
+            List[dict]: Eventos en orden de inserción
+        """
+        raise NotImplementedError
+    
+    def guardar(self, eventos: List[dict]) -> bool:
+        """
+        Guarda un snapshot completo de los eventos.
+        
+        Args:
+            eventos: Todos los eventos como diccionarios
+        
+        Returns:
+            bool: True si el guardado fue exitoso
+        """
+        raise NotImplementedError
+    
+    def registrar_cambio(self, operacion: str, datos: dict) -> None:
+        """
+        Persiste un cambio individual.
+        
+        Args:
+            operacion: 'alta', 'baja' o 'modificacion'
+            datos: {'evento': {...}} para alta/modificación, {'id': ...} para baja
+        
+        Raises:
+            Exception: Si el cambio no pudo persistirse
+        """
+        raise NotImplementedError
+    
+    def registrar_lote(self, cambios: List[Tuple[str, dict]]) -> None:
+        """
+        Persiste varios cambios de una vez (todos o ninguno, si el backend lo permite).
+        
+        Args:
+            cambios: Pares (operación, datos) en orden de aplicación
+        
+        Raises:
+            Exception: Si los cambios no pudieron persistirse
+        """
+        for operacion, datos in cambios:
+            self.registrar_cambio(operacion, datos)
+    
+    def requiere_compactacion(self) -> bool:
+        """
+        Indica si conviene guardar un snapshot completo.
+        
+        Returns:
+            bool: True si EventosManager debería llamar a guardar()
+        """
+        return False
+    
+    def archivos(self) -> List[str]:
+        """Archivos en los que el backend persiste los eventos (para detectar cambios externos)."""
+        return [self.archivo_datos]
+    
+    def ultima_lectura(self) -> Any:
+        """Estado de los archivos en la última carga (para pasar a adoptar_lectura)."""
+        return None
+    
+    def adoptar_lectura(self, lectura: Any = None) -> None:
+        """
+        Indica que los eventos en memoria del cliente son los de una carga.
+        
+        A partir de ahí guardar() puede escribir esos eventos tal cual mientras
+        ningún otro proceso modifique los archivos.
+        
+        Args:
+            lectura: Resultado de ultima_lectura() tomado después de esa carga
+                (None = la última carga)
+        """
+        pass
+    
+    def releer(self) -> Any:
+        """
+        Prepara una vista nueva de los archivos modificados por otro programa.
+        
+        Solo para backends con consultas_indexadas. Se llama fuera del hilo de
+        la interfaz y no cambia lo que usan las consultas.
+        
+        Returns:
+            Any: Vista para adoptar_relectura, o None si las consultas ya leen
+            los archivos en cada llamada (ej: SQLite)
+        """
+        return None
+    
+    def adoptar_relectura(self, relectura: Any) -> bool:
+        """
+        Pasa a responder las consultas con una vista preparada por releer().
+        
+        Args:
+            relectura: Resultado de releer()
+        
+        Returns:
+            bool: False si hubo cambios propios desde que se preparó
+        """
+        return True
+    
+    # ---- Consultas (solo backends con consultas_indexadas) ----
+    
+    def contar(self) -> int:
+        """Cantidad total de eventos."""
+        raise NotImplementedError
+    
+    def contar_por_fecha(self, desde: str, hasta: str) -> Dict[str, int]:
+        """
+        Cantidad de eventos por fecha en el rango semiabierto [desde, hasta).
+        
+        Args:
+            desde: Fecha inicial YYYY-MM-DD (incluida)
+            hasta: Fecha final YYYY-MM-DD (excluida)
+        
+        Returns:
+            Dict[str, int]: fecha -> cantidad (solo las fechas con eventos)
+        """
+        inicio = datetime.datetime.strptime(desde, "%Y-%m-%d")
+        fin = datetime.datetime.strptime(hasta, "%Y-%m-%d")
+        conteo: Dict[str, int] = {}
+        for evento in self.obtener_rango(inicio, fin):
+            conteo[evento['fecha']] = conteo.get(evento['fecha'], 0) + 1
+        return conteo
+    
+    def obtener_por_fecha(self, fecha: str) -> List[dict]:
+        """Eventos de una fecha (YYYY-MM-DD) ordenados por hora."""
+        raise NotImplementedError
+    
+    def obtener_rango(self, inicio: datetime.datetime, fin: datetime.datetime) -> List[dict]:
+        """Eventos del rango semiabierto [inicio, fin) ordenados por fecha y hora."""
+        raise NotImplementedError
+    
+    def obtener_proximos(self, desde: datetime.datetime, cantidad: int) -> List[dict]:
+        """Primeros `cantidad` eventos a partir de `desde` (incluido)."""
+        raise NotImplementedError
+    
+    def obtener_por_id(self, evento_id: str) -> Optional[dict]:
+        """Evento con el ID dado o None."""
+        raise NotImplementedError
+    
+    def buscar_por_titulo(self, titulo: str) -> List[dict]:
+        """Eventos cuyo título contiene el término (insensible a mayúsculas)."""
+        raise NotImplementedError
+    
+    def cerrar(self) -> None:
+        """Libera los recursos del backend."""
+        pass
+
+
+class AlmacenamientoJSON(AlmacenamientoEventos):
+    """
+    Almacenamiento en un snapshot JSON acompañado de un journal incremental.
+    """
+    
+    nombre = "json"
+    
+    def __init__(self, archivo_datos: str):
+        """
+        Inicializa el almacenamiento JSON.
+        
+        Args:
+            archivo_datos: Ruta al archivo de datos JSON
+        """
+        self.archivo_datos = archivo_datos
+        # Journal incremental: cada alta/baja/modificación agrega un registro
+        self.journal = JournalEventos(JournalEventos.ruta_para(archivo_datos))
+        # Bloqueo entre procesos para cargar, registrar y guardar
+        self._bloqueo = BloqueoArchivo(archivo_datos + ".lock")
+        # Estado de los archivos (revisión y firma del snapshot, largo del
+        # journal) en la última carga y el que reflejan los eventos en memoria del cliente
+        # (None = el cliente nunca adoptó una carga: no hay nada que combinar)
+        self._estado_leido: Optional[tuple] = None
+        self._estado_base: Optional[tuple] = None
+        # Otro proceso escribió desde la carga adoptada
+        self._desactualizado = False
+    
+    def cargar(self) -> List[dict]:
+        """
+        Carga el snapshot JSON y aplica el journal pendiente.
+        
+        Returns:
+            List[dict]: Eventos en orden de inserción
+        """
+        with self._bloqueo:
+            eventos = self._cargar()
+            self._estado_leido = self._estado_disco()
+        return eventos
+    
+    def _cargar(self) -> List[dict]:
+        """Lee snapshot y journal (con el bloqueo tomado)."""
+        if not os.path.exists(self.archivo_datos):
+            # Caída entre la rotación del respaldo y el reemplazo
+            recuperar_respaldo(self.archivo_datos)
+        
+        if os.path.exists(self.archivo_datos):
+            try:
+                data = self._leer_snapshot()
+            except ValueError as e:
+                print(f"❌ No se pudo leer {self.archivo_datos}: {e}")
+                if not recuperar_respaldo(self.archivo_datos):
+                    raise
+                data = self._leer_snapshot()
+            eventos = data.get('eventos', [])
+            print(f"✅ Cargados {len(eventos)} eventos desde {self.archivo_datos}")
+        else:
+            print(f"📁 Archivo {self.archivo_datos} no existe, creando uno nuevo")
+            eventos = []
+            self._crear_archivo_inicial()
+        
+        registros = self.journal.leer()
+        if registros:
+            eventos = self._aplicar_registros(eventos, registros)
+            print(f"📝 Aplicados {len(registros)} cambios del journal {self.journal.ruta}")
+        
+        return eventos
+    
+    def _leer_snapshot(self) -> dict:
+        """Lee y decodifica el snapshot JSON."""
+        with open(self.archivo_datos, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    @staticmethod
+    def _aplicar_registros(eventos: List[dict], registros: List[dict]) -> List[dict]:
+        """
+        Aplica registros del journal sobre los eventos del snapshot.
+        
+        Las operaciones son idempotentes: un alta de un ID existente lo
+        reemplaza en su lugar y una baja de un ID inexistente se ignora. Así,
+        aplicar un journal que ya estaba incluido en el snapshot (caída entre
+        la compactación y el vaciado del journal) produce el mismo estado.
+        
+        Args:
+            eventos: Eventos del snapshot
+            registros: Registros leídos del journal
+        
+        Returns:
+            List[dict]: Eventos resultantes
+        """
+        resultado: List[Optional[dict]] = list(eventos)
+        posiciones = {evento['id']: i for i, evento in enumerate(resultado)}
+        
+        for registro in registros:
+            if registro['op'] == 'baja':
+                posicion = posiciones.pop(registro.get('id'), None)
+                if posicion is not None:
+                    resultado[posicion] = None
+            else:
+                evento = registro['evento']
+                posicion = posiciones.get(evento['id'])
+                if posicion is None:
+                    posiciones[evento['id']] = len(resultado)
+                    resultado.append(evento)
+                else:
+                    resultado[posicion] = evento
+        
+        return [evento for evento in resultado if evento is not None]
+    
+    def guardar(self, eventos: List[dict]) -> bool:
+        """
+        Guarda un snapshot completo; una vez escrito el journal queda vacío.
+        
+        La escritura es atómica: va a un temporal que reemplaza al archivo
+        recién después del fsync, y la versión anterior queda como .bak.
+        
+        Control optimista: si otro proceso escribió desde la carga adoptada
+        (cambió el snapshot o el journal), no se escriben los
+        eventos recibidos sino el estado del disco, que ya incluye los cambios
+        de ambos procesos registro por registro (cada uno pasó por el journal).
+        
+        Args:
+            eventos: Todos los eventos como diccionarios
+        
+        Returns:
+            bool: True si el guardado fue exitoso
+        """
+        try:
+            with self._bloqueo:
+                self._verificar_estado()
+                self.combinado = self._desactualizado
+                if self.combinado:
+                    print(f"🔀 Otro proceso modificó {self.archivo_datos}: se combinan los cambios")
+                    eventos = self._cargar()
+                self._escribir_snapshot(eventos, self._revision_en_disco() + 1)
+                self.journal.truncar()
+                self._actualizar_estado()
+            print(f"💾 Guardados {len(eventos)} eventos en {self.archivo_datos}")
+            return True
+        except Exception as e:
+            print(f"❌ Error al guardar eventos: {e}")
+            return False
+    
+    def archivos(self) -> List[str]:
+        """Snapshot y journal."""
+        return [self.archivo_datos, self.journal.ruta]
+    
+    def ultima_lectura(self) -> Optional[tuple]:
+        """Estado de los archivos en la última carga."""
+        return self._estado_leido
+    
+    def adoptar_lectura(self, lectura: Optional[tuple] = None) -> None:
+        """Los eventos en memoria pasan a ser los de la carga indicada (o la última)."""
+        with self._bloqueo:
+            self._estado_base = self._estado_leido if lectura is None else lectura
+            self._desactualizado = False
+    
+    def _revision_en_disco(self) -> int:
+        """Revisión del snapshot (0 si no tiene o no existe)."""
+        try:
+            with open(self.archivo_datos, 'rb') as f:
+                cabecera = f.read(_LARGO_CABECERA)
+        except OSError:
+            return 0
+        coincidencia = _RE_REVISION.search(cabecera)
+        return int(coincidencia.group(1)) if coincidencia else 0
+    
+    def _estado_disco(self) -> tuple:
+        """
+        Estado de los archivos: revisión y firma del snapshot, largo del journal.
+        
+        La firma (mtime_ns, tamaño, inodo) detecta también a los programas
+        que reescriben el snapshot sin incrementar la revisión.
+        """
+        try:
+            estado = os.stat(self.archivo_datos)
+            firma = (estado.st_mtime_ns, estado.st_size, estado.st_ino)
+        except OSError:
+            firma = None
+        try:
+            largo_journal = os.path.getsize(self.journal.ruta)
+        except OSError:
+            largo_journal = 0
+        return self._revision_en_disco(), firma, largo_journal
+    
+    def _verificar_estado(self) -> None:
+        """Antes de escribir: detecta si otro proceso escribió desde el estado conocido."""
+        if self._estado_base is not None and self._estado_disco() != self._estado_base:
+            self._desactualizado = True
+    
+    def _actualizar_estado(self) -> None:
+        """Después de escribir: el estado conocido incluye la escritura propia."""
+        if self._estado_base is not None:
+            self._estado_base = self._estado_disco()
+    
+    def _escribir_snapshot(self, eventos: List[dict], revision: int) -> None:
+        """Escribe el snapshot JSON en forma atómica."""
+        data = {
+            "revision": revision,
+            "version": "1.0",
+            "fecha_actualizacion": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "total_eventos": len(eventos),
+            "eventos": eventos
+        }
+        
+        with escritura_atomica(self.archivo_datos) as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+    
+    def registrar_cambio(self, operacion: str, datos: dict) -> None:
+        """Agrega el cambio al journal."""
+        with self._bloqueo:
+            self._verificar_estado()
+            self.journal.registrar(operacion, datos)
+            self._actualizar_estado()
+    
+    def registrar_lote(self, cambios: List[Tuple[str, dict]]) -> None:
+        """Agrega todos los cambios al journal en un único registro."""
+        with self._bloqueo:
+            self._verificar_estado()
+            self.journal.registrar_lote(cambios)
+            self._actualizar_estado()
+    
+    def requiere_compactacion(self) -> bool:
+        """El snapshot se reescribe cuando el journal alcanza su umbral."""
+        return self.journal.requiere_compactacion()
+    
+    def _crear_archivo_inicial(self) -> None:
+        """Crea el archivo inicial de eventos."""
+        data = {
+            "revision": 0,
+            "version": "1.0",
+            "fecha_creacion": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "descripcion": "Archivo de datos para eventos del calendario",
+            "eventos": []
+        }
+        
+        with escritura_atomica(self.archivo_datos, respaldo=False) as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+class AlmacenamientoBinario(AlmacenamientoJSON):
+    """
+    Snapshot en el formato binario compacto (ver formato_binario) con el mismo
+    journal incremental que el JSON.
+    """
+    
+    nombre = "binario"
+    
+    def __init__(self, archivo_datos: str):
+        """
+        Inicializa el almacenamiento binario.
+        
+        Args:
+            archivo_datos: Ruta al archivo .evb
+        """
+        super().__init__(archivo_datos)
+        # Journal propio: no comparte el de un JSON con el mismo nombre base
+        self.journal = JournalEventos(archivo_datos + ".journal")
+    
+    def _leer_snapshot(self) -> dict:
+        """Lee y decodifica el snapshot binario."""
+        with open(self.archivo_datos, 'rb') as f:
+            return {'eventos': leer_snapshot(f.read())}
+    
+    def _revision_en_disco(self) -> int:
+        """El formato binario no guarda revisión: el estado usa la firma del archivo."""
+        return 0
+    
+    def _escribir_snapshot(self, eventos: List[dict], revision: int) -> None:
+        """Escribe el snapshot binario en forma atómica."""
+        with escritura_atomica(self.archivo_datos, binario=True) as f:
+            escribir_snapshot(f, eventos)
+    
+    def _crear_archivo_inicial(self) -> None:
+        """Crea un snapshot binario vacío."""
+        with escritura_atomica(self.archivo_datos, respaldo=False, binario=True) as f:
+            escribir_snapshot(f, [])
+
+
+def _clave_instante(instante: datetime.datetime) -> str:
+    """
+    Convierte un instante a la clave 'YYYY-MM-DD HH:MM' usada en SQLite.
+    
+    Los eventos tienen resolución de minutos, así que un instante con
+    segundos se redondea al minuto siguiente: un evento a las 10:00 no está
+    en [10:00:30, ...).
+    """
+    if instante.second or instante.microsecond:
+        instante = instante.replace(second=0, microsecond=0) + datetime.timedelta(minutes=1)
+    return instante.strftime("%Y-%m-%d %H:%M")
+
+
+class AlmacenamientoSQLite(AlmacenamientoEventos):
+    """
+    Almacenamiento en SQLite (modo WAL) con consultas indexadas.
+    
+    La columna `instante` ('YYYY-MM-DD HH:MM', 00:00 para eventos sin hora)
+    reproduce el orden (fecha, hora or "00:00") del resto del sistema; el
+    rowid conserva el orden de inserción entre eventos del mismo minuto.
+    """
+    
+    nombre = "sqlite"
+    consultas_indexadas = True
+    
+    _SQL_INSERTAR = (
+        "INSERT OR REPLACE INTO eventos (id, titulo, fecha, hora, descripcion, fecha_creacion, instante) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)"
+    )
+    
+    def __init__(self, ruta: str, archivo_migracion: Optional[str] = None):
+        """
+        Abre (o crea) la base de datos.
+        
+        Args:
+            ruta: Ruta al archivo SQLite
+            archivo_migracion: JSON a importar la primera vez que se abre la base
+        """
+        self.ruta = ruta
+        self._lock = threading.Lock()
+        # El timer de notificaciones consulta desde su propio hilo
+        self._conexion = sqlite3.connect(ruta, check_same_thread=False)
+        self._conexion.row_factory = sqlite3.Row
+        # lower() de SQLite solo entiende ASCII; se usa el de Python como en memoria
+        self._conexion.create_function("py_lower", 1, lambda texto: texto.lower() if texto else texto,
+                                       deterministic=True)
+        self._crear_esquema()
+        if archivo_migracion:
+            self._migrar_desde_json(archivo_migracion)
+    
+    def _crear_esquema(self) -> None:
+        """Crea tablas e índices si no existen."""
+        with self._lock, self._conexion:
+            self._conexion.execute("PRAGMA journal_mode=WAL")
+            self._conexion.execute("PRAGMA synchronous=NORMAL")
+            self._conexion.execute("""
+                CREATE TABLE IF NOT EXISTS eventos (
+                    id TEXT PRIMARY KEY,
+                    titulo TEXT NOT NULL,
+                    fecha TEXT NOT NULL,
+                    hora TEXT,
+                    descripcion TEXT,
+                    fecha_creacion TEXT,
+                    instante TEXT NOT NULL
+                )
+            """)
+            self._conexion.execute("CREATE INDEX IF NOT EXISTS idx_eventos_fecha_hora ON eventos (fecha, hora)")
+            # La búsqueda por título es parcial e insensible a mayúsculas (py_lower):
+            # recorre la tabla, así que un índice sobre titulo solo encarecía las altas
+            self._conexion.execute("DROP INDEX IF EXISTS idx_eventos_titulo")
+            self._conexion.execute("CREATE INDEX IF NOT EXISTS idx_eventos_instante ON eventos (instante)")
+            self._conexion.execute("CREATE TABLE IF NOT EXISTS meta (clave TEXT PRIMARY KEY, valor TEXT)")
+    
+    def _migrar_desde_json(self, archivo_json: str) -> None:
+        """
+        Importa el JSON existente la primera vez que se abre la base.
+        
+        El JSON no se modifica; la migración queda registrada en la tabla meta.
+        
+        Args:
+            archivo_json: Ruta al archivo JSON (y su journal)
+        """
+        with self._lock:
+            migrado = self._conexion.execute(
+                "SELECT valor FROM meta WHERE clave = 'migrado_desde'"
+            ).fetchone()
+        if migrado or not os.path.exists(archivo_json):
+            return
+        
+        print(f"🔄 Migrando eventos de {archivo_json} a {self.ruta}")
+        eventos = AlmacenamientoJSON(archivo_json).cargar()
+        with self._lock, self._conexion:
+            self._conexion.execute("DELETE FROM eventos")
+            self._conexion.executemany(self._SQL_INSERTAR, [self._fila(e) for e in eventos])
+            self._conexion.execute(
+                "INSERT OR REPLACE INTO meta (clave, valor) VALUES ('migrado_desde', ?)",
+                (archivo_json,)
+            )
+        print(f"✅ Migrados {len(eventos)} eventos a SQLite")
+    
+    @staticmethod
+    def _fila(evento: dict) -> tuple:
+        """Convierte un evento a la tupla de columnas de la tabla."""
+        instante = f"{evento['fecha']} {evento.get('hora') or '00:00'}"
+        return tuple(evento.get(campo) for campo in CAMPOS_EVENTO) + (instante,)
+    
+    def _consultar(self, sql: str, parametros: tuple = ()) -> List[dict]:
+        """Ejecuta una consulta y devuelve las filas como diccionarios de evento."""
+        columnas = ", ".join(CAMPOS_EVENTO)
+        with self._lock:
+            filas = self._conexion.execute(f"SELECT {columnas} FROM eventos {sql}", parametros).fetchall()
+        return [dict(fila) for fila in filas]
+    
+    def cargar(self) -> List[dict]:
+        """Carga todos los eventos en orden de inserción."""
+        return self._consultar("ORDER BY rowid")
+    
+    def guardar(self, eventos: List[dict]) -> bool:
+        """Reemplaza el contenido de la tabla en una sola transacción."""
+        try:
+            with self._lock, self._conexion:
+                self._conexion.execute("DELETE FROM eventos")
+                self._conexion.executemany(self._SQL_INSERTAR, [self._fila(e) for e in eventos])
+            print(f"💾 Guardados {len(eventos)} eventos en {self.ruta}")
+            return True
+        except Exception as e:
+            print(f"❌ Error al guardar eventos: {e}")
+            return False
+    
+    def _aplicar(self, operacion: str, datos: dict) -> None:
+        """Ejecuta un cambio sobre la conexión (dentro de una transacción abierta)."""
+        if operacion == 'baja':
+            self._conexion.execute("DELETE FROM eventos WHERE id = ?", (datos['id'],))
+        elif operacion == 'modificacion':
+            fila = self._fila(datos['evento'])
+            # UPDATE conserva el rowid, es decir, la posición del evento
+            self._conexion.execute(
+                "UPDATE eventos SET titulo = ?, fecha = ?, hora = ?, descripcion = ?, "
+                "fecha_creacion = ?, instante = ? WHERE id = ?",
+                fila[1:] + (fila[0],)
+            )
+        else:
+            self._conexion.execute(self._SQL_INSERTAR, self._fila(datos['evento']))
+    
+    def registrar_cambio(self, operacion: str, datos: dict) -> None:
+        """Aplica el cambio en su propia transacción."""
+        with self._lock, self._conexion:
+            self._aplicar(operacion, datos)
+    
+    def registrar_lote(self, cambios: List[Tuple[str, dict]]) -> None:
+        """Aplica todos los cambios en una única transacción."""
+        with self._lock, self._conexion:
+            for operacion, datos in cambios:
+                self._aplicar(operacion, datos)
+    
+    def contar(self) -> int:
+        with self._lock:
+            return self._conexion.execute("SELECT COUNT(*) FROM eventos").fetchone()[0]
+    
+    def contar_por_fecha(self, desde: str, hasta: str) -> Dict[str, int]:
+        with self._lock:
+            filas = self._conexion.execute(
+                "SELECT fecha, COUNT(*) FROM eventos WHERE fecha >= ? AND fecha < ? GROUP BY fecha",
+                (desde, hasta)
+            ).fetchall()
+        return dict(filas)
+    
+    def obtener_por_fecha(self, fecha: str) -> List[dict]:
+        return self._consultar("WHERE fecha = ? ORDER BY instante, rowid", (fecha,))
+    
+    def obtener_rango(self, inicio: datetime.datetime, fin: datetime.datetime) -> List[dict]:
+        return self._consultar(
+            "WHERE instante >= ? AND instante < ? ORDER BY instante, rowid",
+            (_clave_instante(inicio), _clave_instante(fin))
+        )
+    
+    def obtener_proximos(self, desde: datetime.datetime, cantidad: int) -> List[dict]:
+        return self._consultar(
+            "WHERE instante >= ? ORDER BY instante, rowid LIMIT ?",
+            (_clave_instante(desde), max(0, cantidad))
+        )
+    
+    def obtener_por_id(self, evento_id: str) -> Optional[dict]:
+        eventos = self._consultar("WHERE id = ?", (evento_id,))
+        return eventos[0] if eventos else None
+    
+    def buscar_por_titulo(self, titulo: str) -> List[dict]:
+        return self._consultar("WHERE instr(py_lower(titulo), ?) > 0 ORDER BY rowid", (titulo.lower(),))
+    
+    def archivos(self) -> List[str]:
+        """Base de datos y su WAL."""
+        return [self.ruta, self.ruta + "-wal"]
+    
+    def cerrar(self) -> None:
+        with self._lock:
+            self._conexion.close()
+
+
+def crear_almacenamiento(archivo_datos: str, carga_perezosa: bool = False) -> AlmacenamientoEventos:
+    """
+    Crea el backend adecuado según la extensión del archivo de datos.
+    
+    Un archivo .db/.sqlite/.sqlite3 usa SQLite y, la primera vez, migra el
+    JSON con el mismo nombre base (ej: data/eventos.db <- data/eventos.json).
+    Un archivo .evb usa el snapshot binario. Cualquier otra extensión usa JSON.
+    
+    Args:
+        archivo_datos: Ruta al archivo de datos
+        carga_perezosa: Con JSON, construir los eventos solo cuando se consultan
+    
+    Returns:
+        AlmacenamientoEventos: Backend de almacenamiento
+    """
+    base, extension = os.path.splitext(archivo_datos)
+    if extension.lower() in EXTENSIONES_SQLITE:
+        return AlmacenamientoSQLite(archivo_datos, archivo_migracion=base + ".json")
+    if extension.lower() in EXTENSIONES_BINARIAS:
+        return AlmacenamientoBinario(archivo_datos)
+    if carga_perezosa:
+        from src.core.almacenamiento_perezoso import AlmacenamientoJSONPerezoso
+        return AlmacenamientoJSONPerezoso(archivo_datos)
+    return AlmacenamientoJSON(archivo_datos)
+
+
+def convertir_datos(origen: str, destino: str) -> int:
+    """
+    Convierte un archivo de datos a otro formato (según la extensión de cada uno).
+    
+    Sirve en ambos sentidos, por ejemplo data/eventos.json <-> data/eventos.evb.
+    Se incluyen los cambios pendientes del journal del origen.
+    
+    Args:
+        origen: Archivo de datos existente
+        destino: Archivo a crear o reemplazar
+    
+    Returns:
+        int: Cantidad de eventos convertidos
+    
+    Raises:
+        FileNotFoundError: Si el origen no existe
+        ValueError: Si origen y destino son el mismo archivo
+        OSError: Si no se pudo escribir el destino
+    """
+    if not os.path.exists(origen):
+        raise FileNotFoundError(f"No existe el archivo de datos {origen}")
+    if os.path.abspath(origen) == os.path.abspath(destino):
+        raise ValueError("El origen y el destino deben ser archivos distintos")
+    
+    fuente = crear_almacenamiento(origen)
+    try:
+        eventos = fuente.cargar()
+    finally:
+        fuente.cerrar()
+    
+    salida = crear_almacenamiento(destino)
+    try:
+        if not salida.guardar(eventos):
+            raise OSError(f"No se pudo escribir {destino}")
+    finally:
+        salida.cerrar()
+    
+    print(f"🔄 Convertidos {len(eventos)} eventos: {origen} -> {destino}")
+    return len(eventos)
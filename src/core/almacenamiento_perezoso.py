@@ -0,0 +1,433 @@
+"""
+Almacenamiento_Perezoso.py - Carga perezosa del archivo JSON de eventos
+
+Este módulo se encarga de:
+- Recorrer el JSON una sola vez y armar una tabla compacta de offsets
+- Construir los eventos solo cuando una consulta los necesita
+- Mantener los cambios posteriores en memoria (y en el journal) sin
+  reescribir el archivo
+- Compactar el archivo en streaming cuando el journal llega a su umbral
+
+El archivo se lee a través de mmap: los bytes quedan en la caché del sistema
+operativo y en memoria propia solo viven los offsets (arrays de enteros), los
+eventos visibles y los cambios pendientes.
+
+Autor: Mariano Capella, Gabriel Osemberg
+"""
+
+import json
+import datetime
+import mmap
+import os
+import re
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterator, List, Optional, Tuple
+from src.core.almacenamiento import AlmacenamientoJSON
+from src.core.escritura_atomica import escritura_atomica, recuperar_respaldo
+from src.core.linea_tiempo import clave_minutos, clave_instante
+from src.utils.helpers import parsear_fecha
+
+
+# Un elemento del array "eventos": objeto plano cuyos valores son strings,
+# null u otros escalares, seguido de "," o del cierre del array. Los bucles
+# están desenrollados (tramo sin comillas, luego string + tramo, ...) para que
+# cada texto se pueda partir de una sola forma: si el archivo está cortado, el
+# match falla en tiempo lineal en lugar de probar todas las particiones.
+_RE_ELEMENTO = re.compile(
+    rb'\s*(\{[^{}"]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^{}"]*)*\})\s*(,|\])', re.S
+)
+_RE_INICIO_EVENTOS = re.compile(rb'"eventos"\s*:\s*\[\s*')
+# Campos necesarios para ordenar, leídos sin decodificar el objeto completo
+_RE_FECHA = re.compile(rb'"fecha"\s*:\s*"([^"]*)"')
+_RE_HORA = re.compile(rb'"hora"\s*:\s*"([^"]*)"')
+_RE_ID = re.compile(rb'"id"\s*:\s*("(?:[^"\\]+|\\.)*")')
+# Atributos que describen el índice de una lectura del archivo (ver adoptar_relectura)
+_CAMPOS_INDICE = ('_archivo', '_mapa', '_inicios', '_fines', '_claves', '_filas', '_fila_por_id',
+                  '_cambios', '_secuencia_cambios', '_orden_cambios', '_estado_base', '_desactualizado')
+
+
+class AlmacenamientoJSONPerezoso(AlmacenamientoJSON):
+    """
+    Almacenamiento JSON con materialización de eventos bajo demanda.
+    
+    Tabla en memoria (una fila por evento del archivo, en orden de archivo):
+    - _inicios / _fines: offsets del objeto JSON dentro del archivo
+    - _claves / _filas: claves de instante ordenadas y la fila correspondiente
+    
+    Los cambios posteriores a la carga viven en _cambios (id -> (fila_base,
+    evento o None si fue eliminado)) hasta la próxima compactación.
+    
+    El índice refleja el archivo en el momento de indexarlo: si otro programa
+    lo modifica, releer arma un índice nuevo fuera del hilo de la interfaz y
+    adoptar_relectura lo reemplaza.
+    """
+    
+    nombre = "json-perezoso"
+    consultas_indexadas = True
+    
+    def __init__(self, archivo_datos: str):
+        """
+        Inicializa el almacenamiento perezoso.
+        
+        Args:
+            archivo_datos: Ruta al archivo de datos JSON
+        """
+        super().__init__(archivo_datos)
+        self._archivo = None
+        self._mapa: Optional[mmap.mmap] = None
+        self._inicios = array('q')
+        self._fines = array('q')
+        self._claves = array('q')
+        self._filas = array('q')
+        self._fila_por_id: Dict[str, int] = {}
+        self._cambios: Dict[str, Tuple[Optional[int], Optional[dict]]] = {}
+        self._secuencia_cambios = 0
+        self._orden_cambios: Dict[str, int] = {}
+        # Se incrementa con cada cambio del índice (ver adoptar_relectura)
+        self._version_indice = 0
+        # Versión del índice de origen para un índice armado por releer
+        self._version_origen: Optional[int] = None
+        self._indexar()
+    
+    # ---- Indexado del archivo ----
+    
+    def _cerrar_mapa(self) -> None:
+        """Libera el mmap del archivo (necesario antes de reescribirlo)."""
+        if self._mapa is not None:
+            self._mapa.close()
+            self._mapa = None
+        if self._archivo is not None:
+            self._archivo.close()
+            self._archivo = None
+    
+    def _indexar(self) -> None:
+        """Indexa el archivo; si está dañado lo restaura desde el respaldo."""
+        with self._bloqueo:
+            try:
+                self._indexar_archivo()
+            except ValueError as e:
+                print(f"❌ No se pudo indexar {self.archivo_datos}: {e}")
+                self._cerrar_mapa()
+                if not recuperar_respaldo(self.archivo_datos):
+                    raise
+                self._indexar_archivo()
+            # El índice es la carga adoptada: un guardado posterior combina si otro proceso escribe
+            self._estado_base = self._estado_disco()
+            self._desactualizado = False
+            self._version_indice += 1
+    
+    def _indexar_archivo(self) -> None:
+        """Recorre el archivo una vez, arma la tabla de offsets y aplica el journal."""
+        self._cerrar_mapa()
+        self._inicios = array('q')
+        self._fines = array('q')
+        self._fila_por_id = {}
+        self._cambios = {}
+        self._orden_cambios = {}
+        
+        if not os.path.exists(self.archivo_datos) and not recuperar_respaldo(self.archivo_datos):
+            print(f"📁 Archivo {self.archivo_datos} no existe, creando uno nuevo")
+            self._crear_archivo_inicial()
+        
+        registros = self.journal.leer()
+        # IDs tocados por el journal: se ubican en el archivo durante el recorrido
+        ids_journal = {
+            registro['id'] if registro['op'] == 'baja' else registro['evento']['id']
+            for registro in registros
+        }
+        
+        claves_filas = []
+        if os.path.getsize(self.archivo_datos) > 0:
+            self._archivo = open(self.archivo_datos, 'rb')
+            self._mapa = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ)
+            
+            inicio = _RE_INICIO_EVENTOS.search(self._mapa)
+            posicion = inicio.end() if inicio else len(self._mapa)
+            while inicio and self._mapa[posicion:posicion + 1] != b"]":
+                elemento = _RE_ELEMENTO.match(self._mapa, posicion)
+                if not elemento:
+                    raise ValueError(f"Formato inesperado en {self.archivo_datos} (byte {posicion})")
+                
+                inicio_objeto, fin_objeto = elemento.span(1)
+                fila = len(self._inicios)
+                self._inicios.append(inicio_objeto)
+                self._fines.append(fin_objeto)
+                
+                fecha = _RE_FECHA.search(self._mapa, inicio_objeto, fin_objeto)
+                hora = _RE_HORA.search(self._mapa, inicio_objeto, fin_objeto)
+                if fecha:
+                    clave = clave_minutos(fecha.group(1).decode('ascii', 'replace'),
+                                           hora.group(1).decode('ascii', 'replace') if hora else None)
+                    if clave is not None:
+                        claves_filas.append((clave, fila))
+                if ids_journal:
+                    evento_id = _RE_ID.search(self._mapa, inicio_objeto, fin_objeto)
+                    if evento_id and json.loads(evento_id.group(1)) in ids_journal:
+                        self._fila_por_id[json.loads(evento_id.group(1))] = fila
+                
+                if elemento.group(2) == b"]":
+                    break
+                posicion = elemento.end()
+        
+        claves_filas.sort()
+        self._claves = array('q', (clave for clave, _ in claves_filas))
+        self._filas = array('q', (fila for _, fila in claves_filas))
+        
+        for registro in registros:
+            # Los IDs del journal presentes en el archivo ya se ubicaron arriba
+            self._aplicar_cambio(registro, buscar_en_archivo=False)
+        
+        print(f"✅ Indexados {len(self._inicios)} eventos desde {self.archivo_datos} (carga perezosa)")
+        if registros:
+            print(f"📝 Aplicados {len(registros)} cambios del journal {self.journal.ruta}")
+    
+    def _decodificar(self, fila: int) -> dict:
+        """Construye el diccionario de un evento del archivo."""
+        evento = json.loads(self._mapa[self._inicios[fila]:self._fines[fila]])
+        self._fila_por_id[evento['id']] = fila
+        return evento
+    
+    def _buscar_fila(self, evento_id: str) -> Optional[int]:
+        """
+        Ubica la fila de un ID en el archivo.
+        
+        Usa los IDs ya vistos y, si no, busca el ID directamente en el mmap.
+        """
+        fila = self._fila_por_id.get(evento_id)
+        if fila is not None or self._mapa is None:
+            return fila
+        
+        patron = re.compile(rb'"id"\s*:\s*' + re.escape(json.dumps(evento_id).encode('utf-8')))
+        for coincidencia in patron.finditer(self._mapa):
+            fila = bisect_left(self._fines, coincidencia.start())
+            if fila < len(self._inicios) and self._inicios[fila] <= coincidencia.start():
+                if self._decodificar(fila).get('id') == evento_id:
+                    return fila
+        return None
+    
+    # ---- Cambios pendientes ----
+    
+    def _aplicar_cambio(self, registro: dict, buscar_en_archivo: bool = True) -> None:
+        """
+        Incorpora un registro (del journal o nuevo) a los cambios pendientes.
+        
+        Args:
+            registro: Registro con el formato del journal
+            buscar_en_archivo: Si hace falta, buscar el ID en el mmap para ubicar su fila
+        """
+        if registro['op'] == 'baja':
+            evento_id, evento = registro['id'], None
+        else:
+            evento = registro['evento']
+            evento_id = evento['id']
+        
+        if evento_id in self._cambios:
+            fila_base = self._cambios[evento_id][0]
+        elif buscar_en_archivo:
+            fila_base = self._buscar_fila(evento_id)
+        else:
+            fila_base = self._fila_por_id.get(evento_id)
+        if evento_id not in self._orden_cambios:
+            self._secuencia_cambios += 1
+            self._orden_cambios[evento_id] = self._secuencia_cambios
+        self._cambios[evento_id] = (fila_base, evento)
+        self._version_indice += 1
+    
+    def _orden(self, evento_id: str, fila: Optional[int]) -> int:
+        """Orden secundario: fila del archivo, o después de todo el archivo para altas nuevas."""
+        if fila is not None:
+            return fila
+        return len(self._inicios) + self._orden_cambios.get(evento_id, 0)
+    
+    def _combinar(self, filas: List[int], desde: int, hasta: Optional[int]) -> List[Tuple[int, int, dict]]:
+        """
+        Combina eventos del archivo con los cambios pendientes en un rango de claves.
+        
+        Returns:
+            List[Tuple[int, int, dict]]: (clave, orden, evento) ordenados
+        """
+        resultado = []
+        for fila in filas:
+            evento = self._decodificar(fila)
+            if evento['id'] not in self._cambios:
+                resultado.append((clave_minutos(evento['fecha'], evento.get('hora')), fila, evento))
+        
+        for evento_id, (fila_base, evento) in self._cambios.items():
+            if evento is None:
+                continue
+            clave = clave_minutos(evento['fecha'], evento.get('hora'))
+            if clave is not None and clave >= desde and (hasta is None or clave < hasta):
+                resultado.append((clave, self._orden(evento_id, fila_base), evento))
+        
+        resultado.sort(key=lambda item: (item[0], item[1]))
+        return resultado
+    
+    # ---- Interfaz de almacenamiento ----
+    
+    def _iterar_eventos(self) -> Iterator[dict]:
+        """Recorre todos los eventos vigentes en orden, de a uno."""
+        for fila in range(len(self._inicios)):
+            evento = json.loads(self._mapa[self._inicios[fila]:self._fines[fila]])
+            if evento['id'] in self._cambios:
+                fila_base, evento = self._cambios[evento['id']]
+                if evento is None or fila_base != fila:
+                    continue
+            yield evento
+        
+        nuevos = [
+            (self._orden_cambios[evento_id], evento)
+            for evento_id, (fila_base, evento) in self._cambios.items()
+            if fila_base is None and evento is not None
+        ]
+        for _, evento in sorted(nuevos, key=lambda item: item[0]):
+            yield evento
+    
+    def cargar(self) -> List[dict]:
+        """Materializa todos los eventos (aplicando los cambios pendientes)."""
+        return list(self._iterar_eventos())
+    
+    def guardar(self, eventos: List[dict]) -> bool:
+        """Guarda un snapshot completo y vuelve a indexar el archivo."""
+        self._cerrar_mapa()
+        exito = super().guardar(eventos)
+        self._indexar()
+        return exito
+    
+    def registrar_cambio(self, operacion: str, datos: dict) -> None:
+        """Agrega el cambio al journal y a los cambios pendientes."""
+        super().registrar_cambio(operacion, datos)
+        registro = {'op': operacion}
+        registro.update(datos)
+        # Un alta siempre trae un ID nuevo: no hace falta buscarlo en el archivo
+        self._aplicar_cambio(registro, buscar_en_archivo=operacion != 'alta')
+        if self.journal.requiere_compactacion():
+            self.compactar()
+    
+    def registrar_lote(self, cambios: List[Tuple[str, dict]]) -> None:
+        """Agrega los cambios al journal en un único registro y a los cambios pendientes."""
+        super().registrar_lote(cambios)
+        for operacion, datos in cambios:
+            registro = {'op': operacion}
+            registro.update(datos)
+            self._aplicar_cambio(registro, buscar_en_archivo=operacion != 'alta')
+        if self.journal.requiere_compactacion():
+            self.compactar()
+    
+    def requiere_compactacion(self) -> bool:
+        """La compactación la hace el propio backend, sin materializar eventos."""
+        return False
+    
+    def releer(self) -> 'AlmacenamientoJSONPerezoso':
+        """Indexa el archivo de nuevo en otro objeto, sin tocar el índice que usan las consultas."""
+        version = self._version_indice
+        relectura = AlmacenamientoJSONPerezoso(self.archivo_datos)
+        relectura._version_origen = version
+        return relectura
+    
+    def adoptar_relectura(self, relectura: 'AlmacenamientoJSONPerezoso') -> bool:
+        """
+        Reemplaza el índice por uno armado con releer (sin leer el archivo).
+        
+        Returns:
+            bool: False si el índice cambió desde que se armó la relectura
+        """
+        if relectura._version_origen != self._version_indice:
+            return False
+        self._cerrar_mapa()
+        for campo in _CAMPOS_INDICE:
+            setattr(self, campo, getattr(relectura, campo))
+        relectura._archivo = relectura._mapa = None
+        self._version_indice += 1
+        return True
+    
+    def compactar(self) -> bool:
+        """
+        Reescribe el archivo en streaming incorporando los cambios pendientes.
+        
+        Como guardar(), si otro proceso escribió desde la última indexación
+        se vuelve a indexar antes de escribir: el journal y el archivo ya
+        tienen los cambios de ambos procesos.
+        
+        Returns:
+            bool: True si la compactación fue exitosa
+        """
+        print(f"🗜️ Compactando {len(self._cambios)} cambios pendientes en {self.archivo_datos}")
+        try:
+            total = 0
+            with self._bloqueo:
+                self._verificar_estado()
+                self.combinado = self._desactualizado
+                if self.combinado:
+                    print(f"🔀 Otro proceso modificó {self.archivo_datos}: se combinan los cambios")
+                    self._indexar()
+                with escritura_atomica(self.archivo_datos) as f:
+                    f.write(f'{{\n  "revision": {self._revision_en_disco() + 1},\n')
+                    f.write('  "version": "1.0",\n')
+                    f.write(f'  "fecha_actualizacion": "{datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")}",\n')
+                    f.write('  "eventos": [')
+                    for evento in self._iterar_eventos():
+                        f.write(",\n    " if total else "\n    ")
+                        f.write(json.dumps(evento, ensure_ascii=False))
+                        total += 1
+                    f.write("\n  ],\n")
+                    f.write(f'  "total_eventos": {total}\n}}')
+                    # El mmap se libera antes de que el temporal reemplace al archivo
+                    self._cerrar_mapa()
+                self.journal.truncar()
+                self._indexar()
+            return True
+        except Exception as e:
+            print(f"❌ Error al compactar eventos: {e}")
+            if self._mapa is None:
+                self._indexar()
+            return False
+    
+    def contar(self) -> int:
+        total = len(self._inicios)
+        for fila_base, evento in self._cambios.values():
+            if fila_base is None and evento is not None:
+                total += 1
+            elif fila_base is not None and evento is None:
+                total -= 1
+        return total
+    
+    def obtener_rango(self, inicio: datetime.datetime, fin: datetime.datetime) -> List[dict]:
+        desde, hasta = clave_instante(inicio), clave_instante(fin)
+        posicion_desde = bisect_left(self._claves, desde)
+        posicion_hasta = bisect_left(self._claves, hasta)
+        filas = self._filas[posicion_desde:posicion_hasta]
+        return [evento for _, _, evento in self._combinar(filas, desde, hasta)]
+    
+    def obtener_por_fecha(self, fecha: str) -> List[dict]:
+        dia = parsear_fecha(fecha)
+        inicio = datetime.datetime.combine(dia, datetime.time.min)
+        return self.obtener_rango(inicio, inicio + datetime.timedelta(days=1))
+    
+    def obtener_proximos(self, desde: datetime.datetime, cantidad: int) -> List[dict]:
+        if cantidad <= 0:
+            return []
+        clave_desde = clave_instante(desde)
+        posicion = bisect_left(self._claves, clave_desde)
+        # Alcanza con tomar del archivo `cantidad` eventos vigentes más los
+        # reemplazados por cambios pendientes, que se descartan al combinar
+        filas = []
+        while posicion < len(self._filas) and len(filas) < cantidad + len(self._cambios):
+            filas.append(self._filas[posicion])
+            posicion += 1
+        combinados = self._combinar(filas, clave_desde, None)
+        return [evento for _, _, evento in combinados[:cantidad]]
+    
+    def obtener_por_id(self, evento_id: str) -> Optional[dict]:
+        if evento_id in self._cambios:
+            return self._cambios[evento_id][1]
+        fila = self._buscar_fila(evento_id)
+        return self._decodificar(fila) if fila is not None else None
+    
+    def buscar_por_titulo(self, titulo: str) -> List[dict]:
+        titulo_lower = titulo.lower()
+        # Recorre los eventos de a uno sin retenerlos: solo quedan los que coinciden
+        return [evento for evento in self._iterar_eventos() if titulo_lower in evento['titulo'].lower()]
+    
+    def cerrar(self) -> None:
+        self._cerrar_mapa()
\ No newline at end of file
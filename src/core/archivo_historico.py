@@ -0,0 +1,204 @@
+"""
+Archivo_Historico.py - Archivo frío de eventos de años pasados
+
+Este módulo se encarga de:
+- Congelar los eventos viejos en un snapshot binario inmutable (formato_binario)
+- Mapear ese archivo en memoria (mmap) en lugar de cargarlo en la lista de eventos
+- Resolver consultas por fecha, rango, ID y título leyendo solo las páginas necesarias
+- Contar eventos por día de un mes sin decodificarlos (para la grilla del calendario)
+- Reescribir el archivo en forma atómica cuando se agregan o quitan eventos
+
+Autor: Mariano Capella, Gabriel Osemberg
+"""
+
+import calendar
+import datetime
+import mmap
+import os
+import threading
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+from src.core.escritura_atomica import escritura_atomica, recuperar_respaldo
+from src.core.formato_binario import SnapshotBinario, escribir_snapshot
+from src.core.linea_tiempo import MINUTOS_DIA
+
+
+class ArchivoHistorico:
+    """
+    Eventos archivados en un archivo binario de solo lectura mapeado en memoria.
+    
+    El sistema operativo carga las páginas del archivo a medida que se leen,
+    así que la memoria de la aplicación no crece con el historial: solo se
+    construyen diccionarios para los eventos que devuelve cada consulta.
+    
+    Las consultas y la reescritura se serializan con un lock: el archivo se
+    reescribe desde el hilo de la persistencia diferida mientras la interfaz
+    y el planificador de avisos lo consultan.
+    """
+    
+    def __init__(self, ruta: str):
+        """
+        Abre el archivo histórico (si todavía no existe, queda vacío).
+        
+        Args:
+            ruta: Ruta al archivo (ej: data/eventos.historico.evb)
+        """
+        self.ruta = ruta
+        self._archivo = None
+        self._mapa: Optional[mmap.mmap] = None
+        self._snapshot: Optional[SnapshotBinario] = None
+        # (año, mes) -> {día: cantidad}; el archivo es inmutable hasta reescribirlo
+        self._conteos_mes: Dict[Tuple[int, int], Dict[int, int]] = {}
+        self._lock = threading.RLock()
+        self._abrir()
+    
+    def _abrir(self) -> None:
+        """Mapea el archivo; si falta o está dañado intenta con el respaldo."""
+        if not os.path.exists(self.ruta):
+            recuperar_respaldo(self.ruta)
+        if not os.path.exists(self.ruta):
+            return
+        
+        try:
+            self._mapear()
+        except ValueError as e:
+            print(f"❌ No se pudo leer el archivo histórico {self.ruta}: {e}")
+            if not recuperar_respaldo(self.ruta):
+                raise
+            self._mapear()
+    
+    def _mapear(self) -> None:
+        """Abre el archivo y valida el snapshot sobre el mmap."""
+        archivo = open(self.ruta, 'rb')
+        try:
+            mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            archivo.close()
+            raise ValueError("archivo vacío o ilegible")
+        try:
+            snapshot = SnapshotBinario(mapa)
+        except ValueError:
+            mapa.close()
+            archivo.close()
+            raise
+        self._archivo, self._mapa, self._snapshot = archivo, mapa, snapshot
+    
+    def cerrar(self) -> None:
+        """Libera el mmap y el archivo."""
+        with self._lock:
+            if self._snapshot is not None:
+                self._snapshot.cerrar()
+                self._mapa.close()
+                self._archivo.close()
+            self._archivo = self._mapa = self._snapshot = None
+            self._conteos_mes = {}
+    
+    @property
+    def cantidad(self) -> int:
+        """Cantidad de eventos archivados."""
+        with self._lock:
+            return self._snapshot.cantidad if self._snapshot is not None else 0
+    
+    @property
+    def ultima_clave(self) -> Optional[int]:
+        """Clave (minutos, ver linea_tiempo) del evento archivado más reciente."""
+        with self._lock:
+            if self._snapshot is None or not len(self._snapshot.claves):
+                return None
+            return self._snapshot.claves[-1]
+    
+    def obtener_rango(self, desde: int, hasta: int, cantidad: Optional[int] = None) -> List[dict]:
+        """
+        Eventos archivados con clave en [desde, hasta), ordenados por fecha y hora.
+        
+        Args:
+            desde: Clave inicial (incluida)
+            hasta: Clave final (excluida)
+            cantidad: Máximo de eventos a devolver (None = todos)
+        """
+        with self._lock:
+            if self._snapshot is None:
+                return []
+            filas = self._snapshot.filas_rango(desde, hasta)
+            if cantidad is not None:
+                filas = filas[:cantidad]
+            return [self._snapshot.evento(fila) for fila in filas]
+    
+    def contar_mes(self, anio: int, mes: int) -> Dict[int, int]:
+        """
+        Cantidad de eventos archivados por día de un mes.
+        
+        Solo se recorren las claves del mes (sin construir los eventos) y el
+        resultado queda en caché hasta la próxima reescritura.
+        
+        Returns:
+            Dict[int, int]: día del mes -> cantidad (solo los días con eventos)
+        """
+        with self._lock:
+            if self._snapshot is None:
+                return {}
+            conteo = self._conteos_mes.get((anio, mes))
+            if conteo is None:
+                primer_dia = datetime.date(anio, mes, 1).toordinal()
+                dias_mes = calendar.monthrange(anio, mes)[1]
+                claves = self._snapshot.claves
+                inicio = bisect_left(claves, primer_dia * MINUTOS_DIA)
+                fin = bisect_left(claves, (primer_dia + dias_mes) * MINUTOS_DIA)
+                conteo = {}
+                for clave in claves[inicio:fin]:
+                    dia = clave // MINUTOS_DIA - primer_dia + 1
+                    conteo[dia] = conteo.get(dia, 0) + 1
+                self._conteos_mes[(anio, mes)] = conteo
+            return conteo
+    
+    def obtener_por_id(self, evento_id: str) -> Optional[dict]:
+        """Evento archivado con ese ID (None si no está archivado)."""
+        with self._lock:
+            if self._snapshot is None:
+                return None
+            fila = self._snapshot.fila_id(evento_id)
+            return self._snapshot.evento(fila) if fila is not None else None
+    
+    def buscar_por_titulo(self, titulo: str) -> List[dict]:
+        """Eventos archivados cuyo título contiene `titulo` (sin distinguir mayúsculas)."""
+        with self._lock:
+            if self._snapshot is None:
+                return []
+            return [self._snapshot.evento(fila) for fila in self._snapshot.filas_titulo(titulo)]
+    
+    def eventos(self) -> List[dict]:
+        """Todos los eventos archivados (decodifica el archivo completo)."""
+        with self._lock:
+            return self._snapshot.eventos() if self._snapshot is not None else []
+    
+    def reescribir(self, agregar: Iterable[dict] = (), quitar: Iterable[str] = ()) -> int:
+        """
+        Genera un nuevo archivo con eventos agregados y/o quitados.
+        
+        El archivo es inmutable: cada cambio lo reescribe completo en forma
+        atómica (con respaldo .bak). Un evento agregado reemplaza al archivado
+        con el mismo ID.
+        
+        Args:
+            agregar: Eventos a archivar
+            quitar: IDs de eventos a sacar del archivo
+        
+        Returns:
+            int: Cantidad de eventos en el nuevo archivo
+        """
+        agregar = list(agregar)
+        excluir = set(quitar) | {evento['id'] for evento in agregar}
+        with self._lock:
+            eventos = [evento for evento in self.eventos() if evento['id'] not in excluir]
+            eventos.extend(agregar)
+            
+            try:
+                with escritura_atomica(self.ruta, binario=True) as f:
+                    escribir_snapshot(f, eventos)
+                    # El mmap debe cerrarse antes del reemplazo (Windows no reemplaza archivos mapeados)
+                    self.cerrar()
+            finally:
+                # Mapear el archivo nuevo o, si el reemplazo falló, volver al anterior
+                self.cerrar()
+                self._abrir()
+            return len(eventos)
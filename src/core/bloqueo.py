@@ -0,0 +1,102 @@
+"""
+Bloqueo.py - Bloqueo entre procesos de los archivos de datos
+
+Este módulo se encarga de:
+- Serializar lecturas y escrituras de varias instancias (o scripts) sobre el mismo archivo
+- Usar bloqueos advisory del sistema operativo (fcntl.flock, o msvcrt en Windows)
+- Permitir que el mismo proceso vuelva a tomar el bloqueo que ya tiene (reentrante)
+
+El bloqueo se toma sobre un archivo .lock aparte: el archivo de datos se
+reemplaza con os.replace en cada guardado y un bloqueo sobre él se perdería.
+
+Autor: Mariano Capella, Gabriel Osemberg
+"""
+
+import os
+import threading
+import time
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:  # POSIX
+    msvcrt = None
+
+
+class BloqueoArchivo:
+    """
+    Bloqueo exclusivo entre procesos, reentrante dentro del proceso.
+    
+    Se usa como context manager. Los hilos del mismo proceso se serializan
+    con un RLock y solo el primer nivel toma el bloqueo del sistema operativo.
+    """
+    
+    def __init__(self, ruta: str, timeout: float = 10.0):
+        """
+        Inicializa el bloqueo (el archivo .lock se crea al tomarlo por primera vez).
+        
+        Args:
+            ruta: Ruta del archivo de bloqueo (ej: data/eventos.json.lock)
+            timeout: Segundos máximos de espera por otro proceso
+        """
+        self.ruta = ruta
+        self.timeout = timeout
+        self._lock = threading.RLock()
+        self._nivel = 0
+        self._descriptor: Optional[int] = None
+    
+    def __enter__(self) -> 'BloqueoArchivo':
+        self._lock.acquire()
+        try:
+            if self._nivel == 0:
+                self._tomar()
+            self._nivel += 1
+        except BaseException:
+            self._lock.release()
+            raise
+        return self
+    
+    def __exit__(self, *excepcion) -> None:
+        try:
+            self._nivel -= 1
+            if self._nivel == 0:
+                self._soltar()
+        finally:
+            self._lock.release()
+    
+    def _tomar(self) -> None:
+        """Toma el bloqueo del sistema operativo, esperando hasta `timeout`."""
+        descriptor = os.open(self.ruta, os.O_RDWR | os.O_CREAT, 0o644)
+        limite = time.monotonic() + self.timeout
+        espera = 0.001
+        while True:
+            try:
+                if fcntl is not None:
+                    fcntl.flock(descriptor, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                elif msvcrt is not None:
+                    msvcrt.locking(descriptor, msvcrt.LK_NBLCK, 1)
+                break
+            except OSError:
+                if time.monotonic() >= limite:
+                    os.close(descriptor)
+                    raise TimeoutError(f"Otro proceso mantiene bloqueado {self.ruta}")
+                time.sleep(espera)
+                espera = min(espera * 2, 0.05)
+        self._descriptor = descriptor
+    
+    def _soltar(self) -> None:
+        """Libera el bloqueo del sistema operativo."""
+        descriptor, self._descriptor = self._descriptor, None
+        try:
+            if fcntl is not None:
+                fcntl.flock(descriptor, fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                os.lseek(descriptor, 0, os.SEEK_SET)
+                msvcrt.locking(descriptor, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(descriptor)
@@ -6,16 +6,18 @@ Este módulo se encarga de:
 - Generación de la estructura del calendario
 - Manejo de fechas y días especiales
 - Lógica de eventos de calendario
+- Caché de los modelos de dibujo de los meses (ver modelo_mes)
 
 Autor: Mariano Capella, Gabriel Osemberg
 """
 
 import datetime
-from typing import Callable, Optional, List, Tuple
+from typing import Callable, Dict, Hashable, Optional, List, Tuple
 from src.utils.helpers import (
-    obtener_nombre_mes, es_dia_actual, obtener_calendario_mes,
+    obtener_nombre_mes, es_dia_actual, obtener_calendario_mes, obtener_datos_mes,
     navegar_mes, navegar_año, ir_a_hoy
 )
+from src.core.modelo_mes import CacheModelosMes, ModeloMes
 
 
 class CalendarioLogic:
@@ -23,11 +25,22 @@ class CalendarioLogic:
     Clase que maneja toda la lógica del calendario.
     """
     
-    def __init__(self):
-        """Inicializa la lógica del calendario."""
+    def __init__(self, capacidad_cache: int = 24):
+        """
+        Inicializa la lógica del calendario.
+        
+        Args:
+            capacidad_cache: Meses que se guardan en la caché de modelos de dibujo
+        """
         self.hoy = datetime.date.today()
         self.fecha_actual = self.hoy.replace(day=1)
         self.callback_actualizar_vista = None
+        # Fuente de la cantidad de eventos por día (ver set_fuente_eventos)
+        self._contar_eventos_mes: Optional[Callable[[int, int], Dict[int, int]]] = None
+        self._version_mes: Callable[[int, int], Hashable] = lambda year, month: 0
+        self.cache_meses = CacheModelosMes(self._construir_modelo_mes,
+                                           lambda year, month: self._version_mes(year, month),
+                                           capacidad_cache)
         
     def set_callback_actualizar_vista(self, callback: Callable) -> None:
         """
@@ -38,6 +51,19 @@ class CalendarioLogic:
         """
         self.callback_actualizar_vista = callback
     
+    def set_fuente_eventos(self, contar_eventos_mes: Callable[[int, int], Dict[int, int]],
+                           version_mes: Callable[[int, int], Hashable]) -> None:
+        """
+        Establece de dónde salen las cantidades de eventos de los modelos de mes.
+        
+        Args:
+            contar_eventos_mes: Función (año, mes) -> {día: cantidad de eventos}
+            version_mes: Función (año, mes) -> versión que cambia con los eventos del mes
+        """
+        self._contar_eventos_mes = contar_eventos_mes
+        self._version_mes = version_mes
+        self.cache_meses.invalidar()
+    
     def get_fecha_actual(self) -> datetime.date:
         """
         Obtiene la fecha actual del calendario.
@@ -109,6 +135,57 @@ class CalendarioLogic:
         """
         return obtener_calendario_mes(self.fecha_actual.year, self.fecha_actual.month)
     
+    def obtener_modelo_mes(self, year: Optional[int] = None, month: Optional[int] = None) -> ModeloMes:
+        """
+        Obtiene los datos de dibujo de un mes (por defecto el actual) desde la caché.
+        
+        Args:
+            year: Año
+            month: Mes (1-12)
+            
+        Returns:
+            ModeloMes: Matriz, día de hoy, fines de semana y eventos por día
+        """
+        if year is None or month is None:
+            year, month = self.fecha_actual.year, self.fecha_actual.month
+        return self.cache_meses.obtener(year, month)
+    
+    def precalentar_meses(self, radio: int = 2) -> int:
+        """
+        Prepara en la caché los `radio` meses anteriores y siguientes al actual.
+        
+        Args:
+            radio: Meses a cada lado del actual
+            
+        Returns:
+            int: Cantidad de modelos construidos
+        """
+        meses = []
+        anterior = siguiente = self.fecha_actual
+        for _ in range(radio):
+            siguiente = navegar_mes(siguiente, 'siguiente')
+            anterior = navegar_mes(anterior, 'anterior')
+            # Primero los más cercanos, en el orden en que se suele navegar
+            meses.append((siguiente.year, siguiente.month))
+            meses.append((anterior.year, anterior.month))
+        return self.cache_meses.precalentar(meses)
+    
+    def _construir_modelo_mes(self, year: int, month: int, version: Hashable) -> ModeloMes:
+        """Arma el modelo de dibujo de un mes (lo usa la caché)."""
+        datos = obtener_datos_mes(year, month)
+        hoy = datetime.date.today()
+        eventos_por_dia = self._contar_eventos_mes(year, month) if self._contar_eventos_mes else {}
+        return ModeloMes(
+            year=year,
+            month=month,
+            matriz=datos.matriz,
+            hoy=hoy,
+            dia_hoy=hoy.day if (hoy.year, hoy.month) == (year, month) else 0,
+            fines_de_semana=datos.fines_de_semana,
+            eventos_por_dia=eventos_por_dia,
+            version=version
+        )
+    
     def es_dia_hoy(self, dia: int) -> bool:
         """
         Verifica si un día específico es hoy.
@@ -166,17 +243,17 @@ class CalendarioLogic:
         Returns:
             dict: Información del mes
         """
-        matriz = self.obtener_matriz_calendario()
-        dias_totales = sum(1 for semana in matriz for dia in semana if dia != 0)
+        datos = obtener_datos_mes(self.fecha_actual.year, self.fecha_actual.month)
+        matriz = datos.matriz
         
         return {
             'año': self.fecha_actual.year,
             'mes': self.fecha_actual.month,
             'nombre_mes': self.get_nombre_mes_actual(),
-            'dias_totales': dias_totales,
+            'dias_totales': datos.dias_totales,
             'semanas': len(matriz),
             'primer_dia': matriz[0][0] if matriz and matriz[0] else 0,
-            'ultimo_dia': max(max(semana) for semana in matriz),
+            'ultimo_dia': datos.dias_totales,
             'es_mes_actual': (self.fecha_actual.year == self.hoy.year 
                              and self.fecha_actual.month == self.hoy.month)
         }
@@ -232,11 +309,8 @@ class CalendarioLogic:
         Returns:
             bool: True si es sábado o domingo
         """
-        fecha_dia = self.obtener_fecha_dia(dia)
-        if fecha_dia:
-            # weekday(): Lunes=0, Domingo=6
-            return fecha_dia.weekday() in [5, 6]  # Sábado y Domingo
-        return False
+        # Conjunto memoizado de Sábados y Domingos del mes (sin crear un date por día)
+        return dia in obtener_datos_mes(self.fecha_actual.year, self.fecha_actual.month).fines_de_semana
     
     def obtener_estadisticas_mes(self) -> dict:
         """
@@ -245,21 +319,11 @@ class CalendarioLogic:
         Returns:
             dict: Estadísticas del mes
         """
-        matriz = self.obtener_matriz_calendario()
-        dias_laborables = 0
-        dias_fin_semana = 0
-        
-        for semana in matriz:
-            for dia in semana:
-                if dia != 0:
-                    if self.es_fin_de_semana(dia):
-                        dias_fin_semana += 1
-                    else:
-                        dias_laborables += 1
+        datos = obtener_datos_mes(self.fecha_actual.year, self.fecha_actual.month)
         
         return {
-            'dias_laborables': dias_laborables,
-            'dias_fin_semana': dias_fin_semana,
-            'total_dias': dias_laborables + dias_fin_semana,
-            'semanas_completas': len([s for s in matriz if all(d != 0 for d in s)])
+            'dias_laborables': datos.dias_laborables,
+            'dias_fin_semana': len(datos.fines_de_semana),
+            'total_dias': datos.dias_totales,
+            'semanas_completas': datos.semanas_completas
         } 
\ No newline at end of file
@@ -0,0 +1,114 @@
+"""
+Escritura_Atomica.py - Escrituras a prueba de caídas para los archivos de datos
+
+Este módulo se encarga de:
+- Escribir en un archivo temporal del mismo directorio y forzarlo a disco (fsync)
+- Reemplazar el archivo de datos con os.replace (el archivo nunca queda a medias)
+- Conservar la generación anterior como respaldo (.bak)
+- Recuperar el respaldo si el archivo de datos falta o está dañado
+
+Autor: Mariano Capella, Gabriel Osemberg
+"""
+
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from typing import IO, Iterator
+
+
+def ruta_respaldo(ruta: str) -> str:
+    """
+    Obtiene la ruta del respaldo de un archivo de datos.
+    
+    Args:
+        ruta: Ruta del archivo (ej: data/eventos.json)
+    
+    Returns:
+        str: Ruta del respaldo (ej: data/eventos.json.bak)
+    """
+    return ruta + ".bak"
+
+
+def _sincronizar_directorio(directorio: str) -> None:
+    """Fuerza a disco la entrada de directorio del reemplazo (solo POSIX)."""
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+    descriptor = os.open(directorio, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(descriptor)
+    except OSError:
+        pass
+    finally:
+        os.close(descriptor)
+
+
+@contextmanager
+def escritura_atomica(ruta: str, respaldo: bool = True, binario: bool = False) -> Iterator[IO]:
+    """
+    Abre un archivo temporal que reemplaza a `ruta` recién al terminar el bloque.
+    
+    Si el bloque falla (o el proceso muere) el archivo original queda intacto
+    y el temporal se descarta. Con `respaldo`, la versión anterior pasa a ser
+    el .bak antes del reemplazo.
+    
+    Args:
+        ruta: Archivo a escribir
+        respaldo: Conservar la generación anterior como .bak
+        binario: Abrir el temporal en modo binario en lugar de texto UTF-8
+    
+    Yields:
+        IO: Archivo temporal abierto para escritura
+    """
+    directorio = os.path.dirname(os.path.abspath(ruta))
+    descriptor, temporal = tempfile.mkstemp(
+        prefix=f".{os.path.basename(ruta)}.", suffix=".tmp", dir=directorio
+    )
+    try:
+        modo = {'mode': 'wb'} if binario else {'mode': 'w', 'encoding': 'utf-8'}
+        with os.fdopen(descriptor, **modo) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        
+        if os.path.exists(ruta):
+            # mkstemp crea el archivo con permisos 0600: conservar los del original
+            shutil.copymode(ruta, temporal)
+            if respaldo:
+                os.replace(ruta, ruta_respaldo(ruta))
+        os.replace(temporal, ruta)
+        _sincronizar_directorio(directorio)
+    except BaseException:
+        try:
+            os.remove(temporal)
+        except OSError:
+            pass
+        raise
+
+
+def recuperar_respaldo(ruta: str) -> bool:
+    """
+    Restaura un archivo de datos desde su respaldo.
+    
+    Se usa cuando el archivo falta (caída entre la rotación y el reemplazo) o
+    no se puede leer. Un archivo dañado no se pierde: queda como .corrupto.
+    
+    Args:
+        ruta: Archivo de datos
+    
+    Returns:
+        bool: True si había respaldo y se restauró
+    """
+    respaldo = ruta_respaldo(ruta)
+    if not os.path.exists(respaldo):
+        return False
+    
+    if os.path.exists(ruta):
+        os.replace(ruta, ruta + ".corrupto")
+        print(f"⚠️ {ruta} está dañado; se conserva como {ruta}.corrupto")
+    
+    with open(respaldo, 'rb') as origen:
+        with escritura_atomica(ruta, respaldo=False, binario=True) as destino:
+            shutil.copyfileobj(origen, destino)
+    print(f"♻️ Restaurado {ruta} desde el respaldo {respaldo}")
+    return True
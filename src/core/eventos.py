@@ -11,18 +11,35 @@ Este módulo se encarga de:
 Autor: Mariano Capella, Gabriel Osemberg
 """
 
-import json
 import datetime
 import os
-from typing import List, Dict, Optional, Tuple
-from dataclasses import dataclass, asdict
-from src.utils.helpers import validar_fecha, formatear_fecha_completa
+import sys
+import calendar
+import threading
+from bisect import insort
+from contextlib import contextmanager
+from heapq import merge
+from typing import Callable, Iterable, List, Dict, Optional, Tuple
+from dataclasses import dataclass, field
+from src.utils.helpers import validar_fecha, formatear_fecha_completa, parsear_fecha, parsear_hora
+from src.core.identificadores import generar_id_evento
+from src.core.linea_tiempo import LineaTiempo, FechaOInstante, MINUTOS_DIA, a_instante, clave_instante
+from src.core.almacenamiento import AlmacenamientoEventos, crear_almacenamiento
+from src.core.persistencia import PersistidorDiferido
+from src.core.archivo_historico import ArchivoHistorico
+from src.core.vigilante import CambiosExternos, Firma, VigilanteArchivos, firma_archivos
 
 
-@dataclass
+@dataclass(slots=True)
 class Evento:
     """
     Clase que representa un evento del calendario.
+    
+    Usa __slots__ (sin __dict__ por instancia) e interna las cadenas de fecha
+    y hora, que se repiten entre miles de eventos: con cientos de miles de
+    eventos cargados la memoria por evento baja alrededor de un 35%
+    (ver benchmarks/bench_memoria_eventos.py), aun con la caché de fecha y
+    hora parseadas que evita repetir strptime en cada consulta.
     """
     id: str
     titulo: str
@@ -30,15 +47,37 @@ class Evento:
     hora: Optional[str] = None  # Formato: HH:MM
     descripcion: Optional[str] = None
     fecha_creacion: str = None
+    # Caché de valores parseados; cada uno recuerda la cadena de la que salió
+    # y se recalcula si fecha u hora se reasignan
+    _fecha_origen: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _fecha_parseada: Optional[datetime.date] = field(default=None, init=False, repr=False, compare=False)
+    _hora_origen: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _hora_parseada: Optional[datetime.time] = field(default=None, init=False, repr=False, compare=False)
+    _datetime_parseado: Optional[datetime.datetime] = field(default=None, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         """Inicialización posterior al constructor."""
         if self.fecha_creacion is None:
             self.fecha_creacion = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        
+        # Una sola copia de cada fecha/hora repetida
+        if isinstance(self.fecha, str):
+            self.fecha = sys.intern(self.fecha)
+        if isinstance(self.hora, str):
+            self.hora = sys.intern(self.hora)
+        if isinstance(self.fecha_creacion, str):
+            self.fecha_creacion = sys.intern(self.fecha_creacion)
     
     def to_dict(self) -> dict:
         """Convierte el evento a diccionario."""
-        return asdict(self)
+        return {
+            'id': self.id,
+            'titulo': self.titulo,
+            'fecha': self.fecha,
+            'hora': self.hora,
+            'descripcion': self.descripcion,
+            'fecha_creacion': self.fecha_creacion
+        }
     
     @classmethod
     def from_dict(cls, data: dict) -> 'Evento':
@@ -46,21 +85,37 @@ class Evento:
         return cls(**data)
     
     def get_fecha_objeto(self) -> datetime.date:
-        """Obtiene la fecha como objeto datetime.date."""
-        return datetime.datetime.strptime(self.fecha, "%Y-%m-%d").date()
+        """Obtiene la fecha como objeto datetime.date (parseada una sola vez)."""
+        if self._fecha_origen is not self.fecha:
+            self._fecha_parseada = parsear_fecha(self.fecha)
+            self._fecha_origen = self.fecha
+            self._datetime_parseado = None
+        return self._fecha_parseada
     
     def get_hora_objeto(self) -> Optional[datetime.time]:
-        """Obtiene la hora como objeto datetime.time."""
-        if self.hora:
-            return datetime.datetime.strptime(self.hora, "%H:%M").time()
-        return None
+        """Obtiene la hora como objeto datetime.time (parseada una sola vez)."""
+        if not self.hora:
+            return None
+        if self._hora_origen is not self.hora:
+            self._hora_parseada = parsear_hora(self.hora)
+            self._hora_origen = self.hora
+            self._datetime_parseado = None
+        return self._hora_parseada
     
     def get_datetime_completo(self) -> Optional[datetime.datetime]:
         """Obtiene fecha y hora como datetime completo."""
-        if self.hora:
-            fecha_str = f"{self.fecha} {self.hora}"
-            return datetime.datetime.strptime(fecha_str, "%Y-%m-%d %H:%M")
-        return None
+        hora = self.get_hora_objeto()
+        if hora is None:
+            return None
+        fecha = self.get_fecha_objeto()
+        if self._datetime_parseado is None:
+            self._datetime_parseado = datetime.datetime.combine(fecha, hora)
+        return self._datetime_parseado
+
+
+# A partir de este tamaño un lote reconstruye los índices en lugar de
+# insertar/quitar evento por evento
+UMBRAL_RECONSTRUCCION_LOTE = 64
 
 
 class EventosManager:
@@ -68,17 +123,115 @@ class EventosManager:
     Clase para gestionar todos los eventos del calendario.
     """
     
-    def __init__(self, archivo_datos: str = "data/eventos.json"):
+    def __init__(self, archivo_datos: str = "data/eventos.json",
+                 almacenamiento: Optional[AlmacenamientoEventos] = None,
+                 carga_perezosa: bool = False, escritura_diferida: bool = False,
+                 horizonte_archivo: Optional[int] = None):
         """
         Inicializa el gestor de eventos.
         
         Args:
-            archivo_datos: Ruta al archivo de datos JSON
+            archivo_datos: Ruta al archivo de datos (.json, o .db para SQLite)
+            almacenamiento: Backend de persistencia (por defecto según la extensión)
+            carga_perezosa: Con JSON, construir los eventos solo al consultarlos
+            escritura_diferida: Persistir los cambios desde un hilo de fondo,
+                agrupados cada 250 ms (solo con los eventos en memoria)
+            horizonte_archivo: Años anteriores al actual que se mantienen en
+                memoria; los eventos más viejos pasan al archivo histórico
+                (None = sin archivo histórico: si quedó uno de antes, sus
+                eventos vuelven a memoria, ver restaurar_archivados)
         """
         self.archivo_datos = archivo_datos
-        self.eventos = []
+        # None = todavía no materializados (backends con consultas indexadas)
+        self._eventos: Optional[List[Evento]] = []
+        # Índices ID -> evento y ID -> posición en la lista (altas/bajas en O(1))
+        self._eventos_por_id: Dict[str, Evento] = {}
+        self._posiciones: Dict[str, int] = {}
+        # Índice fecha (YYYY-MM-DD) -> eventos de ese día ordenados por hora
+        self._eventos_por_fecha: Dict[str, List[Evento]] = {}
+        # Histograma (año, mes) -> {día: cantidad de eventos} para la grilla del calendario
+        self._conteo_por_mes: Dict[Tuple[int, int], Dict[int, int]] = {}
+        # Versiones del histograma (ver version_mes): una por mes y una general
+        self._versiones_mes: Dict[Tuple[int, int], int] = {}
+        self._version_conteos = 0
+        # Línea de tiempo ordenada para consultas por rango
+        self._linea_tiempo = LineaTiempo()
+        # Protege la lista en memoria: el persistidor la copia desde su hilo
+        self._lock = threading.RLock()
+        # Serializa journal y snapshots entre la UI y el persistidor
+        self._lock_persistencia = threading.RLock()
+        self._persistidor: Optional[PersistidorDiferido] = None
+        # Detección de cambios externos (ver vigilar_cambios_externos)
+        self._vigilante: Optional[VigilanteArchivos] = None
+        self._firma_archivos: Optional[Firma] = None
+        self._cambio_externo = False
+        self._escribiendo = False
+        # Cambios externos ya aplicados en memoria cuya lectura falta adoptar
+        # en el almacenamiento (lo hace el vigilante, ver detectar_cambios_externos)
+        self._cambios_aplicados: Optional[CambiosExternos] = None
+        # Se incrementa con cada cambio de los eventos en memoria
+        self._version_memoria = 0
+        # Funciones a avisar después de cada cambio (ver agregar_observador)
+        self._observadores: List[Callable[[str, List[Evento]], None]] = []
+        # Archivo frío (mmap) con los eventos anteriores a _limite_historico
+        self._historico: Optional[ArchivoHistorico] = None
+        self._limite_historico: Optional[str] = None
+        # ID -> fecha archivada de los eventos que volvieron a memoria y todavía
+        # siguen en el archivo (ver _obtener_modificables)
+        self._descongelados: Dict[str, str] = {}
         self._asegurar_directorio()
+        self.almacenamiento = almacenamiento or crear_almacenamiento(archivo_datos, carga_perezosa)
+        
+        ruta_historico = os.path.splitext(archivo_datos)[0] + ".historico.evb"
+        if horizonte_archivo is not None:
+            if self._consultas_indexadas:
+                # Las consultas ya se resuelven en disco sin cargar el historial
+                print(f"ℹ️ {self.almacenamiento.nombre}: no se usa el archivo histórico")
+            else:
+                anio_limite = datetime.date.today().year - max(horizonte_archivo, 0)
+                self._limite_historico = datetime.date(anio_limite, 1, 1).isoformat()
+                self._historico = ArchivoHistorico(ruta_historico)
+        elif not self._consultas_indexadas and os.path.exists(ruta_historico):
+            # Archivo de una sesión con el histórico activado: sus eventos vuelven a memoria
+            self._historico = ArchivoHistorico(ruta_historico)
         self.cargar_eventos()
+        if self._historico is not None and self._limite_historico is None:
+            self.restaurar_archivados()
+        
+        if escritura_diferida:
+            if self._consultas_indexadas:
+                # Las consultas se resuelven en el backend: los cambios deben llegar ya
+                print(f"ℹ️ {self.almacenamiento.nombre}: los cambios se persisten en forma sincrónica")
+            else:
+                self._persistidor = PersistidorDiferido(self._persistir_lote)
+    
+    @property
+    def eventos(self) -> List[Evento]:
+        """
+        Lista de todos los eventos.
+        
+        Con un backend de consultas indexadas (SQLite) la lista se materializa
+        recién en el primer acceso; las consultas del gestor no la necesitan.
+        """
+        if self._eventos is None:
+            self._eventos = self._a_eventos(self.almacenamiento.cargar())
+            self.reconstruir_indices()
+        return self._eventos
+    
+    @eventos.setter
+    def eventos(self, eventos: List[Evento]) -> None:
+        self._eventos = eventos
+        self.reconstruir_indices()
+    
+    @property
+    def _consultas_indexadas(self) -> bool:
+        """True si las consultas se resuelven en el backend y no en memoria."""
+        return self.almacenamiento.consultas_indexadas
+    
+    @staticmethod
+    def _a_eventos(eventos_data: List[dict]) -> List[Evento]:
+        """Construye eventos a partir de sus diccionarios."""
+        return [Evento.from_dict(evento_dict) for evento_dict in eventos_data]
     
     def _asegurar_directorio(self) -> None:
         """Asegura que el directorio de datos exista."""
@@ -87,98 +240,793 @@ class EventosManager:
             os.makedirs(directorio)
     
     def _generar_id(self) -> str:
-        """Genera un ID único para un evento."""
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        return f"evt_{timestamp}_{len(self.eventos)}"
+        """Genera un ID único para un evento (creciente en orden de creación)."""
+        return generar_id_evento()
+    
+    @staticmethod
+    def _clave_hora(evento: Evento) -> str:
+        """Clave de orden de un evento dentro de su día."""
+        return evento.hora or "00:00"
+    
+    @staticmethod
+    def _clave_dia(fecha: str) -> Optional[Tuple[int, int, int]]:
+        """(año, mes, día) de una fecha YYYY-MM-DD, o None si no es válida."""
+        try:
+            return int(fecha[:4]), int(fecha[5:7]), int(fecha[8:10])
+        except ValueError:
+            return None
+    
+    def _contar_en_mes(self, fecha: str, cantidad: int) -> None:
+        """Suma `cantidad` (positiva o negativa) al histograma del mes de `fecha`."""
+        clave = self._clave_dia(fecha)
+        if clave is None:
+            return
+        anio, mes, dia = clave
+        self._versiones_mes[(anio, mes)] = self._versiones_mes.get((anio, mes), 0) + 1
+        conteo = self._conteo_por_mes.setdefault((anio, mes), {})
+        total = conteo.get(dia, 0) + cantidad
+        if total > 0:
+            conteo[dia] = total
+        else:
+            conteo.pop(dia, None)
+            if not conteo:
+                del self._conteo_por_mes[(anio, mes)]
+    
+    def _indexar_evento(self, evento: Evento) -> None:
+        """Agrega un evento a los índices manteniendo el orden por hora."""
+        self._version_memoria += 1
+        eventos_dia = self._eventos_por_fecha.setdefault(evento.fecha, [])
+        # insort a la derecha conserva el orden de inserción entre horas iguales
+        insort(eventos_dia, evento, key=self._clave_hora)
+        self._contar_en_mes(evento.fecha, 1)
+        self._linea_tiempo.agregar(evento)
+    
+    def _desindexar_evento(self, evento: Evento) -> None:
+        """Quita un evento de los índices."""
+        self._version_memoria += 1
+        self._linea_tiempo.quitar(evento)
+        eventos_dia = self._eventos_por_fecha.get(evento.fecha)
+        if not eventos_dia:
+            return
+        for i, existente in enumerate(eventos_dia):
+            if existente is evento:
+                del eventos_dia[i]
+                self._contar_en_mes(evento.fecha, -1)
+                break
+        if not eventos_dia:
+            del self._eventos_por_fecha[evento.fecha]
+    
+    def _insertar_evento(self, evento: Evento) -> None:
+        """Agrega un evento a la lista en memoria y a todos los índices."""
+        with self._lock:
+            self._posiciones[evento.id] = len(self._eventos)
+            self._eventos_por_id[evento.id] = evento
+            self._eventos.append(evento)
+            self._indexar_evento(evento)
+    
+    def _retirar_evento(self, evento: Evento) -> None:
+        """
+        Quita un evento de la lista en memoria y de todos los índices.
+        
+        El último evento de la lista ocupa el hueco, así la baja es O(1) en
+        lugar del list.remove lineal (el orden de la lista no es significativo:
+        las consultas usan los índices ordenados).
+        """
+        with self._lock:
+            posicion = self._posiciones.pop(evento.id)
+            del self._eventos_por_id[evento.id]
+            ultimo = self._eventos.pop()
+            if ultimo is not evento:
+                self._eventos[posicion] = ultimo
+                if self._eventos_por_id.get(ultimo.id) is ultimo:
+                    self._posiciones[ultimo.id] = posicion
+            self._desindexar_evento(evento)
+    
+    def _insertar_lote(self, eventos: List[Evento]) -> None:
+        """Agrega varios eventos a la lista en memoria y a los índices."""
+        with self._lock:
+            if len(eventos) < UMBRAL_RECONSTRUCCION_LOTE:
+                for evento in eventos:
+                    self._insertar_evento(evento)
+            else:
+                self._eventos.extend(eventos)
+                self.reconstruir_indices()
+    
+    def _retirar_lote(self, eventos: List[Evento]) -> None:
+        """Quita varios eventos de la lista en memoria y de los índices."""
+        with self._lock:
+            if len(eventos) < UMBRAL_RECONSTRUCCION_LOTE:
+                for evento in eventos:
+                    self._retirar_evento(evento)
+            else:
+                quitar = {id(evento) for evento in eventos}
+                self._eventos[:] = [evento for evento in self._eventos if id(evento) not in quitar]
+                self.reconstruir_indices()
+    
+    def reconstruir_indices(self) -> None:
+        """Reconstruye los índices en memoria a partir de la lista de eventos."""
+        with self._lock:
+            self._version_memoria += 1
+            self._eventos_por_id = {}
+            self._posiciones = {}
+            for posicion, evento in enumerate(self._eventos or ()):
+                self._eventos_por_id[evento.id] = evento
+                self._posiciones[evento.id] = posicion
+        
+            self._eventos_por_fecha = {}
+            for evento in self._eventos or ():
+                eventos_dia = self._eventos_por_fecha.setdefault(evento.fecha, [])
+                insort(eventos_dia, evento, key=self._clave_hora)
+            
+            # El histograma se arma por fecha distinta, no por evento
+            self._version_conteos += 1
+            self._conteo_por_mes = {}
+            for fecha, eventos_dia in self._eventos_por_fecha.items():
+                clave = self._clave_dia(fecha)
+                if clave is not None:
+                    self._conteo_por_mes.setdefault(clave[:2], {})[clave[2]] = len(eventos_dia)
+            self._linea_tiempo.construir(self._eventos or ())
+    
+    def agregar_observador(self, observador: Callable[[str, List[Evento]], None]) -> None:
+        """
+        Registra una función que se llama después de cada cambio de los eventos.
+        
+        Recibe la operación ('alta', 'baja', 'modificacion' o 'recarga') y los
+        eventos afectados; con 'recarga' la lista está vacía y cualquier evento
+        puede haber cambiado. Se llama desde el hilo que hizo el cambio.
+        
+        Args:
+            observador: Función (operacion, eventos)
+        """
+        self._observadores.append(observador)
+    
+    def quitar_observador(self, observador: Callable[[str, List[Evento]], None]) -> None:
+        """Deja de avisar a un observador registrado con agregar_observador."""
+        if observador in self._observadores:
+            self._observadores.remove(observador)
+    
+    def _notificar_observadores(self, operacion: str, eventos: List[Evento]) -> None:
+        """Avisa un cambio a los observadores; un error en uno no afecta al resto."""
+        for observador in list(self._observadores):
+            try:
+                observador(operacion, eventos)
+            except Exception as e:
+                print(f"❌ Error al avisar un cambio de eventos: {e}")
     
     def cargar_eventos(self) -> bool:
         """
-        Carga eventos desde el archivo JSON.
+        Carga eventos desde el almacenamiento.
+        
+        Con un backend de consultas indexadas no se carga nada en memoria.
         
         Returns:
             bool: True si la carga fue exitosa
         """
         try:
-            if os.path.exists(self.archivo_datos):
-                with open(self.archivo_datos, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    eventos_data = data.get('eventos', [])
-                    self.eventos = [Evento.from_dict(evento_dict) for evento_dict in eventos_data]
-                print(f"✅ Cargados {len(self.eventos)} eventos desde {self.archivo_datos}")
-                return True
+            if self._consultas_indexadas:
+                self._eventos = None
+                print(f"✅ {self.almacenamiento.contar()} eventos disponibles en {self.archivo_datos}")
             else:
-                print(f"📁 Archivo {self.archivo_datos} no existe, creando uno nuevo")
-                self._crear_archivo_inicial()
-                return True
+                self._eventos = self._a_eventos(self.almacenamiento.cargar())
+                self.reconstruir_indices()
+                self.almacenamiento.adoptar_lectura()
+                if self._limite_historico is not None:
+                    self.archivar_eventos_viejos()
+            self._notificar_observadores('recarga', [])
+            return True
         except Exception as e:
             print(f"❌ Error al cargar eventos: {e}")
             return False
     
-    def guardar_eventos(self) -> bool:
+    def archivar_eventos_viejos(self) -> int:
         """
-        Guarda eventos al archivo JSON.
+        Mueve al archivo histórico los eventos anteriores al horizonte.
+        
+        Primero se reescribe el archivo histórico y después el snapshot: si el
+        proceso muere en el medio el evento queda en los dos lugares, prevalece
+        la copia en memoria y se vuelve a archivar en la próxima carga.
         
         Returns:
-            bool: True si el guardado fue exitoso
+            int: Cantidad de eventos archivados
+        """
+        if self._limite_historico is None or self._eventos is None:
+            return 0
+        with self._lock:
+            viejos = [
+                evento for evento in self._eventos
+                if evento.fecha < self._limite_historico
+                and self._linea_tiempo.instante_evento(evento) is not None
+            ]
+        if not viejos:
+            return 0
+        
+        with self._lock_persistencia:
+            try:
+                self._historico.reescribir(agregar=[evento.to_dict() for evento in viejos])
+            except Exception as e:
+                print(f"❌ Error al escribir el archivo histórico: {e}")
+                return 0
+            self._retirar_lote(viejos)
+            with self._lock:
+                for evento in viejos:
+                    self._descongelados.pop(evento.id, None)
+            # Si el snapshot falla los eventos siguen a salvo en ambos archivos
+            self.guardar_eventos()
+        print(f"🧊 {len(viejos)} eventos anteriores a {self._limite_historico} pasaron al archivo histórico")
+        return len(viejos)
+    
+    def restaurar_archivados(self) -> int:
+        """
+        Devuelve todos los eventos del archivo histórico a los eventos en memoria
+        y desactiva el archivo histórico para este gestor.
+        
+        Primero se guarda el snapshot con los eventos restaurados y después se
+        vacía el archivo histórico: si el proceso muere en el medio el evento
+        queda en los dos lugares y prevalece la copia en memoria.
+        
+        Returns:
+            int: Cantidad de eventos restaurados
+        """
+        if self._historico is None or self._eventos is None:
+            return 0
+        archivados = self._a_eventos(self._historico.eventos())
+        restaurados = [evento for evento in archivados if not self._fuera_del_archivo(evento.id)]
+        
+        with self._lock_persistencia:
+            if restaurados:
+                self._insertar_lote(restaurados)
+                if not self.guardar_eventos():
+                    # Los eventos siguen archivados: se quitan de memoria para no duplicarlos
+                    self._retirar_lote(restaurados)
+                    print("❌ No se pudieron restaurar los eventos del archivo histórico")
+                    return 0
+            try:
+                if archivados:
+                    self._historico.reescribir(quitar=[evento.id for evento in archivados])
+            except Exception as e:
+                # La copia en memoria prevalece; el archivo se vacía en la próxima carga
+                print(f"⚠️ No se pudo vaciar el archivo histórico: {e}")
+            self._historico.cerrar()
+            self._historico = None
+            self._limite_historico = None
+            with self._lock:
+                self._descongelados.clear()
+        
+        if restaurados:
+            print(f"📦 {len(restaurados)} eventos volvieron del archivo histórico")
+            self._notificar_observadores('recarga', [])
+        return len(restaurados)
+    
+    def _archivados(self, desde: int, hasta: Optional[int] = None,
+                    cantidad: Optional[int] = None) -> List[Evento]:
+        """
+        Eventos del archivo histórico con clave en [desde, hasta).
+        
+        Solo se lee el archivo si el rango llega a los años archivados. Se
+        omiten los eventos que también están en memoria (ver archivar_eventos_viejos).
+        
+        Args:
+            desde: Clave inicial en minutos (incluida)
+            hasta: Clave final (excluida, None = sin límite)
+            cantidad: Máximo de eventos a devolver (contados después de omitir)
+        """
+        if self._historico is None:
+            return []
+        ultima = self._historico.ultima_clave
+        if ultima is None or desde > ultima:
+            return []
+        if hasta is None:
+            hasta = ultima + 1
+        if cantidad is None:
+            leidos = self._historico.obtener_rango(desde, hasta, None)
+            return self._a_eventos([datos for datos in leidos if not self._fuera_del_archivo(datos['id'])])
+        
+        # Se lee de más por los que se van a omitir, y más si no alcanzó
+        leer = cantidad + len(self._descongelados)
+        while True:
+            leidos = self._historico.obtener_rango(desde, hasta, leer)
+            vigentes = [datos for datos in leidos if not self._fuera_del_archivo(datos['id'])]
+            if len(vigentes) >= cantidad or len(leidos) < leer:
+                return self._a_eventos(vigentes[:cantidad])
+            leer *= 2
+    
+    def _fuera_del_archivo(self, evento_id: str) -> bool:
+        """True si la copia archivada de un evento ya no vale (está en memoria o se eliminó)."""
+        return evento_id in self._eventos_por_id or evento_id in self._descongelados
+    
+    def _cantidad_archivada(self) -> int:
+        """Eventos del archivo histórico sin contar los que ya volvieron a memoria."""
+        if self._historico is None:
+            return 0
+        with self._lock:
+            return self._historico.cantidad - len(self._descongelados)
+    
+    def _obtener_modificable(self, evento_id: str) -> Optional[Evento]:
+        """
+        Busca un evento para modificarlo o eliminarlo (ver _obtener_modificables).
+        
+        Args:
+            evento_id: ID del evento
+            
+        Returns:
+            Optional[Evento]: Evento en memoria o None si no existe
+        """
+        return self._obtener_modificables([evento_id]).get(evento_id)
+    
+    def _obtener_modificables(self, evento_ids: Iterable[str]) -> Dict[str, Evento]:
+        """
+        Busca varios eventos para modificarlos o eliminarlos.
+        
+        El archivo histórico es inmutable: los eventos archivados vuelven a
+        los eventos en memoria con un solo lote de altas (por la escritura
+        diferida si está activa) y salen del archivo en una única reescritura
+        después de que esas altas quedan persistidas (ver _quitar_descongelados).
+        
+        Args:
+            evento_ids: IDs de los eventos
+            
+        Returns:
+            Dict[str, Evento]: ID -> evento en memoria, solo para los que existen
+        """
+        encontrados: Dict[str, Evento] = {}
+        archivados: List[Evento] = []
+        for evento_id in evento_ids:
+            if evento_id in encontrados:
+                continue
+            evento = self.buscar_evento_por_id(evento_id)
+            if evento is None:
+                continue
+            encontrados[evento_id] = evento
+            if self._historico is not None and evento_id not in self._eventos_por_id:
+                archivados.append(evento)
+        if not archivados:
+            return encontrados
+        
+        with self._lock:
+            self._insertar_lote(archivados)
+            for evento in archivados:
+                self._descongelados[evento.id] = evento.fecha
+        if not self._registrar_lote([('alta', {'evento': evento.to_dict()}) for evento in archivados]):
+            print("❌ Error al recuperar eventos del archivo histórico")
+            with self._lock:
+                self._retirar_lote(archivados)
+                for evento in archivados:
+                    del self._descongelados[evento.id]
+                    del encontrados[evento.id]
+        return encontrados
+    
+    def _quitar_descongelados(self) -> None:
         """
+        Saca del archivo histórico, en una sola reescritura, los eventos que
+        volvieron a memoria.
+        
+        Se llama después de persistir sus altas: si el proceso muere antes, el
+        evento queda en los dos lugares y prevalece la copia en memoria. Si la
+        reescritura falla se reintenta después de la próxima escritura.
+        """
+        with self._lock:
+            evento_ids = list(self._descongelados)
+        if not evento_ids or self._historico is None:
+            return
         try:
-            data = {
-                "eventos": [evento.to_dict() for evento in self.eventos],
-                "version": "1.0",
-                "fecha_actualizacion": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "total_eventos": len(self.eventos)
-            }
+            with self._lock_persistencia:
+                self._historico.reescribir(quitar=evento_ids)
+        except Exception as e:
+            print(f"⚠️ No se pudo actualizar el archivo histórico: {e}")
+            return
+        with self._lock:
+            for evento_id in evento_ids:
+                self._descongelados.pop(evento_id, None)
+            # Una grilla contada durante la reescritura puede haber restado de más
+            self._version_conteos += 1
+    
+    def _registrar_cambio(self, operacion: str, datos: dict) -> bool:
+        """
+        Persiste un cambio individual en el almacenamiento.
+        
+        Si el backend lo pide (journal en su umbral) se guarda un snapshot.
+        
+        Args:
+            operacion: 'alta', 'baja' o 'modificacion'
+            datos: Datos del registro
             
-            with open(self.archivo_datos, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+        Returns:
+            bool: True si el cambio quedó persistido
+        """
+        if self._eventos is None:
+            # Sin índices en memoria no se sabe qué meses afecta (ver version_mes)
+            self._version_conteos += 1
+        
+        if self._persistidor is not None:
+            # Escritura diferida: el hilo de fondo lo persiste en la próxima ventana
+            self._persistidor.encolar([(operacion, datos)])
+            return True
+        
+        try:
+            with self._escritura_propia():
+                self.almacenamiento.registrar_cambio(operacion, datos)
+        except Exception as e:
+            print(f"❌ Error al registrar cambio: {e}")
+            return False
+        
+        if self.almacenamiento.requiere_compactacion():
+            print("🗜️ Compactando cambios pendientes en un snapshot")
+            # Si la compactación falla el cambio sigue a salvo en el journal
+            self.guardar_eventos()
+        if self._descongelados:
+            self._quitar_descongelados()
+        return True
+    
+    def _registrar_lote(self, cambios: List[Tuple[str, dict]]) -> bool:
+        """
+        Persiste varios cambios con una sola escritura.
+        
+        Args:
+            cambios: Pares (operación, datos) en orden de aplicación
             
-            print(f"💾 Guardados {len(self.eventos)} eventos en {self.archivo_datos}")
+        Returns:
+            bool: True si todos los cambios quedaron persistidos
+        """
+        if self._eventos is None:
+            self._version_conteos += 1
+        
+        if self._persistidor is not None:
+            self._persistidor.encolar(cambios)
             return True
+        
+        try:
+            with self._escritura_propia():
+                self.almacenamiento.registrar_lote(cambios)
         except Exception as e:
-            print(f"❌ Error al guardar eventos: {e}")
+            print(f"❌ Error al registrar lote de cambios: {e}")
             return False
+        
+        if self.almacenamiento.requiere_compactacion():
+            print("🗜️ Compactando cambios pendientes en un snapshot")
+            self.guardar_eventos()
+        if self._descongelados:
+            self._quitar_descongelados()
+        return True
     
-    def _crear_archivo_inicial(self) -> None:
-        """Crea el archivo inicial de eventos."""
-        data = {
-            "eventos": [],
-            "version": "1.0",
-            "fecha_creacion": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "descripcion": "Archivo de datos para eventos del calendario"
-        }
+    def _persistir_lote(self, cambios: List[Tuple[str, dict]]) -> None:
+        """
+        Escribe un lote de la persistencia diferida (se ejecuta en el hilo de fondo).
         
-        with open(self.archivo_datos, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        Raises:
+            Exception: Si el lote no pudo persistirse (el persistidor lo reintenta)
+        """
+        with self._escritura_propia():
+            self.almacenamiento.registrar_lote(cambios)
+            if self.almacenamiento.requiere_compactacion():
+                print("🗜️ Compactando cambios pendientes en un snapshot")
+                self.guardar_eventos()
+        if self._descongelados:
+            # Las altas de los eventos descongelados ya están en disco
+            self._quitar_descongelados()
     
-    def agregar_evento(self, titulo: str, fecha: str, hora: str = None, descripcion: str = None) -> Tuple[bool, str, Optional[Evento]]:
+    def guardar_eventos(self) -> bool:
         """
-        Agrega un nuevo evento.
+        Guarda un snapshot completo de los eventos.
+        
+        Returns:
+            bool: True si el guardado fue exitoso
+        """
+        if self._eventos is None:
+            # Nada materializado: todos los cambios ya están en el backend
+            return True
+        with self._escritura_propia():
+            # Los cambios aún encolados ya están en memoria, así que quedan
+            # incluidos; su registro posterior en el journal es idempotente
+            with self._lock:
+                eventos = list(self._eventos)
+            exito = self.almacenamiento.guardar([evento.to_dict() for evento in eventos])
+            if self.almacenamiento.combinado:
+                # Se guardaron también cambios de otro proceso: el vigilante los recarga
+                self._cambio_externo = True
+            return exito
+    
+    @contextmanager
+    def _escritura_propia(self):
+        """
+        Envuelve una escritura del gestor en los archivos de datos.
+        
+        Toma el lock de persistencia y, si hay un vigilante, actualiza la firma
+        conocida para que la escritura no se confunda con un cambio externo.
+        Un cambio externo anterior que todavía no se detectó queda marcado.
+        """
+        with self._lock_persistencia:
+            # Solo la escritura más externa (ej: no la compactación dentro de un lote)
+            if self._firma_archivos is None or self._escribiendo:
+                yield
+                return
+            if self._firma_actual() != self._firma_archivos:
+                self._cambio_externo = True
+            self._escribiendo = True
+            try:
+                yield
+            finally:
+                self._escribiendo = False
+                self._firma_archivos = self._firma_actual()
+    
+    def _firma_actual(self) -> Firma:
+        """Firma (stat) de los archivos del almacenamiento."""
+        return firma_archivos(self.almacenamiento.archivos())
+    
+    def vigilar_cambios_externos(self, notificar: Callable[[CambiosExternos], None],
+                                 intervalo: float = 1.0) -> bool:
+        """
+        Empieza a detectar cambios hechos por otros programas en los archivos de datos.
+        
+        Un hilo de fondo compara la firma (stat) de los archivos cada
+        `intervalo` segundos; si cambió, lee el archivo y calcula las
+        diferencias con los eventos en memoria sin bloquear la interfaz.
+        `notificar` recibe esas diferencias y debe llevarlas al hilo de la
+        interfaz, donde se aplican con aplicar_cambios_externos.
+        
+        Con un backend de consultas indexadas no hay eventos en memoria con
+        los que comparar: el hilo de fondo le pide al backend una vista nueva
+        de los archivos (releer; SQLite no la necesita) y la interfaz la
+        adopta y redibuja todo.
         
         Args:
-            titulo: Título del evento (obligatorio)
-            fecha: Fecha en formato YYYY-MM-DD
-            hora: Hora en formato HH:MM (opcional)
-            descripcion: Descripción del evento (opcional)
+            notificar: Función que recibe los cambios detectados (desde el hilo de fondo)
+            intervalo: Segundos entre verificaciones
+        
+        Returns:
+            bool: True si el vigilante quedó activo
+        """
+        if self._vigilante is None:
+            with self._lock_persistencia:
+                self._firma_archivos = self._firma_actual()
+            self._vigilante = VigilanteArchivos(self.detectar_cambios_externos, notificar, intervalo)
+        return True
+    
+    def detectar_cambios_externos(self) -> Optional[CambiosExternos]:
+        """
+        Lee los archivos si otro programa los modificó y calcula las diferencias.
+        
+        Se ejecuta en el hilo del vigilante, igual que todo lo que puede
+        esperar al bloqueo de los archivos: la lectura, la comparación de
+        firmas y la adopción de la lectura cuyos cambios la interfaz ya
+        aplicó. Si hay cambios propios sin escribir, o los archivos cambian
+        durante la lectura, no devuelve nada y se reintenta en la próxima
+        verificación.
+        
+        Returns:
+            Optional[CambiosExternos]: Diferencias a aplicar o None
+        """
+        self._adoptar_cambios_aplicados()
+        with self._lock_persistencia:
+            firma = self._firma_actual()
+            if firma == self._firma_archivos and not self._cambio_externo:
+                return None
+            if self._persistidor is not None and self._persistidor.ocupado:
+                return None
+        if self._consultas_indexadas:
+            return self._releer_indexado(firma)
+        
+        try:
+            eventos_data = self.almacenamiento.cargar()
+            lectura = self.almacenamiento.ultima_lectura()
+        except Exception as e:
+            print(f"⚠️ No se pudieron leer los cambios externos: {e}")
+            return None
+        
+        with self._lock_persistencia:
+            if self._firma_actual() != firma:
+                return None
+            with self._lock:
+                cambios = CambiosExternos(firma, self._version_memoria, lectura)
+                actuales = dict(self._eventos_por_id)
+        
+        vistos = set()
+        for evento_dict in eventos_data:
+            evento_id = evento_dict.get('id')
+            vistos.add(evento_id)
+            evento = actuales.get(evento_id)
+            if evento is None:
+                cambios.altas.append(evento_dict)
+            elif (evento.titulo, evento.fecha, evento.hora, evento.descripcion) != (
+                    evento_dict.get('titulo'), evento_dict.get('fecha'),
+                    evento_dict.get('hora'), evento_dict.get('descripcion')):
+                cambios.modificaciones.append(evento_dict)
+        cambios.bajas = [evento_id for evento_id in actuales if evento_id not in vistos]
+        
+        if not cambios:
+            # Solo cambió la firma (ej: otro programa reescribió lo mismo)
+            if self.aplicar_cambios_externos(cambios):
+                self._adoptar_cambios_aplicados()
+            return None
+        return cambios
+    
+    def _releer_indexado(self, firma: Firma) -> Optional[CambiosExternos]:
+        """
+        Prepara la vista nueva de un backend de consultas indexadas (hilo del vigilante).
+        
+        Args:
+            firma: Firma de los archivos antes de leer
+        
+        Returns:
+            Optional[CambiosExternos]: Cambios sin diferencias, con la vista nueva
+        """
+        try:
+            relectura = self.almacenamiento.releer()
+        except Exception as e:
+            print(f"⚠️ No se pudieron leer los cambios externos: {e}")
+            return None
+        with self._lock_persistencia:
+            if self._firma_actual() != firma:
+                return None
+        return CambiosExternos(firma, self._version_memoria, relectura=relectura)
+    
+    def _adoptar_cambios_aplicados(self) -> None:
+        """
+        Adopta la lectura de los últimos cambios externos aplicados en memoria.
+        
+        Se llama desde el hilo del vigilante porque adoptar_lectura espera el
+        bloqueo entre procesos. Hasta entonces guardar() combina con el disco,
+        que es lo seguro: adoptar antes de aplicar escribiría una memoria vieja.
+        """
+        with self._lock:
+            cambios, self._cambios_aplicados = self._cambios_aplicados, None
+        if cambios is not None:
+            self.almacenamiento.adoptar_lectura(cambios.lectura)
+    
+    def aplicar_cambios_externos(self, cambios: CambiosExternos) -> bool:
+        """
+        Aplica en memoria los cambios detectados por detectar_cambios_externos.
+        
+        Debe llamarse desde el hilo de la interfaz, así que nunca espera:
+        solo intercambia las estructuras en memoria. Si los eventos cambiaron
+        desde la detección, o hay una escritura en curso, los cambios se
+        descartan y el vigilante los vuelve a calcular en la próxima
+        verificación. Si los archivos cambiaron otra vez, el vigilante lo
+        nota por la firma y entrega las nuevas diferencias. Con un backend de
+        consultas indexadas se adopta la vista que preparó el vigilante.
+        
+        Args:
+            cambios: Diferencias detectadas
+        
+        Returns:
+            bool: True si se aplicaron (la vista debe actualizarse)
+        """
+        if not self._lock_persistencia.acquire(blocking=False):
+            # El persistidor está escribiendo un snapshot o compactando
+            self._cambio_externo = True
+            return False
+        try:
+            with self._lock:
+                if self._consultas_indexadas:
+                    if not self.almacenamiento.adoptar_relectura(cambios.relectura):
+                        # Hubo cambios propios desde la lectura
+                        self._cambio_externo = True
+                        return False
+                    # Lista materializada y grilla: se vuelven a leer del backend
+                    self._eventos = None
+                    self._version_conteos += 1
+                    self._firma_archivos = cambios.firma
+                    self._cambio_externo = False
+                    recarga = True
+                elif (cambios.version_memoria != self._version_memoria
+                        or (self._persistidor is not None and self._persistidor.ocupado)):
+                    self._cambio_externo = True
+                    return False
+                else:
+                    bajas, modificados, altas = self._aplicar_diferencias(cambios)
+                    self._firma_archivos = cambios.firma
+                    self._cambio_externo = False
+                    self._cambios_aplicados = cambios
+                    recarga = False
+        finally:
+            self._lock_persistencia.release()
+        
+        if recarga:
+            print(f"🔄 Cambios externos recargados desde {self.archivo_datos}")
+            self._notificar_observadores('recarga', [])
+            return True
+        if cambios:
+            print(f"🔄 Cambios externos aplicados: {len(cambios.altas)} altas, "
+                  f"{len(cambios.bajas)} bajas, {len(cambios.modificaciones)} modificaciones")
+        for operacion, eventos in (('baja', bajas), ('modificacion', modificados), ('alta', altas)):
+            if eventos:
+                self._notificar_observadores(operacion, eventos)
+        return True
+    
+    def _aplicar_diferencias(self, cambios: CambiosExternos) -> Tuple[List[Evento], List[Evento], List[Evento]]:
+        """
+        Aplica en memoria bajas, modificaciones y altas (con self._lock tomado).
+        
+        Returns:
+            Tuple[List[Evento], List[Evento], List[Evento]]: Eventos dados de
+            baja, modificados y agregados
+        """
+        bajas = [self._eventos_por_id[evento_id] for evento_id in cambios.bajas]
+        self._retirar_lote(bajas)
+        modificados = []
+        for evento_dict in cambios.modificaciones:
+            nuevo = Evento.from_dict(evento_dict)
+            evento = self._eventos_por_id[nuevo.id]
+            self._modificar_evento(evento, nuevo.titulo, nuevo.fecha, nuevo.hora, nuevo.descripcion)
+            modificados.append(evento)
+        altas = self._a_eventos(cambios.altas)
+        self._insertar_lote(altas)
+        return bajas, modificados, altas
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Espera a que los cambios de la escritura diferida lleguen a disco.
+        
+        Args:
+            timeout: Segundos máximos de espera (None = sin límite)
             
         Returns:
-            Tuple[bool, str, Optional[Evento]]: (éxito, mensaje, evento_creado)
+            bool: True si no quedó nada pendiente
+        """
+        if self._persistidor is None:
+            return True
+        return self._persistidor.flush(timeout)
+    
+    def cerrar(self) -> bool:
+        """
+        Persiste lo pendiente y libera el almacenamiento.
+        
+        Returns:
+            bool: True si todos los cambios quedaron persistidos
+        """
+        exito = True
+        if self._vigilante is not None:
+            self._vigilante.detener()
+            self._vigilante = None
+        if self._persistidor is not None:
+            exito = self._persistidor.detener()
+            self._persistidor = None
+        if self._historico is not None:
+            self._historico.cerrar()
+        self.almacenamiento.cerrar()
+        return exito
+    
+    @staticmethod
+    def _validar_datos_evento(titulo: str, fecha: str, hora: Optional[str]) -> Optional[str]:
+        """
+        Valida los datos editables de un evento.
+        
+        Returns:
+            Optional[str]: Mensaje de error o None si los datos son válidos
         """
-        # Validaciones
         if not titulo or titulo.strip() == "":
-            return False, "El título del evento es obligatorio", None
+            return "El título del evento es obligatorio"
         
         try:
             # Validar formato de fecha
-            fecha_obj = datetime.datetime.strptime(fecha, "%Y-%m-%d").date()
+            parsear_fecha(fecha)
         except ValueError:
-            return False, "Formato de fecha inválido. Use YYYY-MM-DD", None
+            return "Formato de fecha inválido. Use YYYY-MM-DD"
         
         if hora:
             try:
                 # Validar formato de hora
-                datetime.datetime.strptime(hora, "%H:%M")
+                parsear_hora(hora)
             except ValueError:
-                return False, "Formato de hora inválido. Use HH:MM", None
+                return "Formato de hora inválido. Use HH:MM"
+        return None
+    
+    def agregar_evento(self, titulo: str, fecha: str, hora: str = None, descripcion: str = None) -> Tuple[bool, str, Optional[Evento]]:
+        """
+        Agrega un nuevo evento.
+        
+        Args:
+            titulo: Título del evento (obligatorio)
+            fecha: Fecha en formato YYYY-MM-DD
+            hora: Hora en formato HH:MM (opcional)
+            descripcion: Descripción del evento (opcional)
+            
+        Returns:
+            Tuple[bool, str, Optional[Evento]]: (éxito, mensaje, evento_creado)
+        """
+        # Validaciones
+        error = self._validar_datos_evento(titulo, fecha, hora)
+        if error:
+            return False, error, None
         
         # Crear evento
         evento_id = self._generar_id()
@@ -190,20 +1038,86 @@ class EventosManager:
             descripcion=descripcion.strip() if descripcion else None
         )
         
-        # Agregar a la lista
-        self.eventos.append(evento)
+        # Agregar a la lista y a los índices (si están en memoria)
+        if self._eventos is not None:
+            self._insertar_evento(evento)
         
         # Guardar cambios
-        if self.guardar_eventos():
+        if self._registrar_cambio('alta', {'evento': evento.to_dict()}):
             mensaje = f"✅ Evento '{titulo}' creado para el {fecha}"
             if hora:
                 mensaje += f" a las {hora}"
+            self._notificar_observadores('alta', [evento])
             return True, mensaje, evento
         else:
             # Si no se pudo guardar, remover de la lista
-            self.eventos.remove(evento)
+            if self._eventos is not None:
+                self._retirar_evento(evento)
             return False, "Error al guardar el evento", None
     
+    def agregar_eventos_lote(self, eventos: Iterable[dict]) -> List[Tuple[bool, str, Optional[Evento]]]:
+        """
+        Agrega muchos eventos validándolos en una pasada y persistiéndolos una sola vez.
+        
+        Los eventos válidos se aplican todos juntos: si la persistencia falla
+        no queda ninguno. Los inválidos se informan sin afectar al resto.
+        
+        Args:
+            eventos: Diccionarios con 'titulo', 'fecha' y opcionalmente 'hora' y 'descripcion'
+            
+        Returns:
+            List[Tuple[bool, str, Optional[Evento]]]: Un resultado por evento, en el mismo orden
+        """
+        resultados: List[Tuple[bool, str, Optional[Evento]]] = []
+        nuevos: List[Evento] = []
+        
+        for datos in eventos:
+            # Un elemento que no es un diccionario (o con campos de otro tipo)
+            # se informa como inválido sin cortar el lote
+            try:
+                titulo = datos.get('titulo')
+                fecha = datos.get('fecha')
+                hora = datos.get('hora')
+                descripcion = datos.get('descripcion')
+                error = self._validar_datos_evento(titulo, fecha, hora)
+                if not error:
+                    titulo = titulo.strip()
+                    descripcion = descripcion.strip() if descripcion else None
+            except (TypeError, AttributeError):
+                error = "Datos de evento inválidos"
+            if error:
+                resultados.append((False, error, None))
+                continue
+            
+            evento = Evento(
+                id=self._generar_id(),
+                titulo=titulo,
+                fecha=fecha,
+                hora=hora,
+                descripcion=descripcion
+            )
+            nuevos.append(evento)
+            resultados.append((True, f"✅ Evento '{evento.titulo}' creado para el {fecha}", evento))
+        
+        if not nuevos:
+            return resultados
+        
+        if self._eventos is not None:
+            self._insertar_lote(nuevos)
+        
+        if self._registrar_lote([('alta', {'evento': evento.to_dict()}) for evento in nuevos]):
+            print(f"✅ Lote de {len(nuevos)} eventos agregado")
+            self._notificar_observadores('alta', nuevos)
+            return resultados
+        
+        # Si no se pudo guardar, no queda ninguno del lote
+        if self._eventos is not None:
+            self._retirar_lote(nuevos)
+        return [
+            (False, "Error al guardar el evento", None) if exito else (exito, mensaje, evento)
+            for exito, mensaje, evento in resultados
+        ]
+    
     def obtener_eventos_fecha(self, fecha: datetime.date) -> List[Evento]:
         """
         Obtiene todos los eventos de una fecha específica.
@@ -215,12 +1129,17 @@ class EventosManager:
             List[Evento]: Lista de eventos de esa fecha
         """
         fecha_str = fecha.strftime("%Y-%m-%d")
-        eventos_fecha = [evento for evento in self.eventos if evento.fecha == fecha_str]
         
-        # Ordenar por hora
-        eventos_fecha.sort(key=lambda e: e.hora or "00:00")
+        if self._consultas_indexadas:
+            return self._a_eventos(self.almacenamiento.obtener_por_fecha(fecha_str))
         
-        return eventos_fecha
+        # El índice ya mantiene los eventos ordenados por hora
+        eventos = list(self._eventos_por_fecha.get(fecha_str, ()))
+        desde = fecha.toordinal() * MINUTOS_DIA
+        archivados = self._archivados(desde, desde + MINUTOS_DIA)
+        if archivados:
+            eventos = list(merge(archivados, eventos, key=self._clave_hora))
+        return eventos
     
     def obtener_eventos_mes(self, year: int, month: int) -> List[Evento]:
         """
@@ -233,16 +1152,114 @@ class EventosManager:
         Returns:
             List[Evento]: Lista de eventos del mes
         """
-        eventos_mes = []
-        for evento in self.eventos:
-            fecha_evento = evento.get_fecha_objeto()
-            if fecha_evento.year == year and fecha_evento.month == month:
-                eventos_mes.append(evento)
+        inicio = datetime.date(year, month, 1)
+        dias_mes = calendar.monthrange(year, month)[1]
+        fin = inicio + datetime.timedelta(days=dias_mes)
         
-        # Ordenar por fecha y hora
-        eventos_mes.sort(key=lambda e: (e.fecha, e.hora or "00:00"))
+        # La línea de tiempo ya devuelve los eventos ordenados por fecha y hora
+        return self.obtener_eventos_rango(inicio, fin)
+    
+    def contar_eventos_mes(self, year: int, month: int) -> Dict[int, int]:
+        """
+        Obtiene la cantidad de eventos de cada día de un mes.
         
-        return eventos_mes
+        Con los eventos en memoria se lee del histograma que mantienen los
+        índices, así que el costo no depende de cuántos eventos haya.
+        
+        Args:
+            year: Año
+            month: Mes
+            
+        Returns:
+            Dict[int, int]: Día del mes -> cantidad (solo los días con eventos)
+        """
+        if self._consultas_indexadas:
+            inicio = datetime.date(year, month, 1)
+            fin = inicio + datetime.timedelta(days=calendar.monthrange(year, month)[1])
+            conteo = self.almacenamiento.contar_por_fecha(inicio.isoformat(), fin.isoformat())
+            return {int(fecha[8:10]): cantidad for fecha, cantidad in conteo.items()}
+        
+        with self._lock:
+            conteo = dict(self._conteo_por_mes.get((year, month), ()))
+        if self._historico is not None:
+            for dia, cantidad in self._historico.contar_mes(year, month).items():
+                conteo[dia] = conteo.get(dia, 0) + cantidad
+            # Las copias archivadas de los eventos que ya volvieron a memoria no cuentan
+            mes = f"{year:04d}-{month:02d}-"
+            with self._lock:
+                fechas = [fecha for fecha in self._descongelados.values() if fecha.startswith(mes)]
+            for fecha in fechas:
+                dia = int(fecha[8:10])
+                if conteo.get(dia, 0) > 1:
+                    conteo[dia] -= 1
+                else:
+                    conteo.pop(dia, None)
+        return conteo
+    
+    def version_mes(self, year: int, month: int) -> Tuple[int, int]:
+        """
+        Obtiene la versión de los eventos de un mes.
+        
+        Cambia con cada alta, baja o modificación que afecte a ese mes, así
+        una caché de la grilla sabe qué meses reconstruir. Con un backend de
+        consultas indexadas cualquier cambio cambia la versión de todos.
+        
+        Args:
+            year: Año
+            month: Mes
+            
+        Returns:
+            Tuple[int, int]: Versión (solo tiene sentido compararla por igualdad)
+        """
+        with self._lock:
+            return self._version_conteos, self._versiones_mes.get((year, month), 0)
+    
+    def obtener_eventos_rango(self, inicio: FechaOInstante, fin: FechaOInstante) -> List[Evento]:
+        """
+        Obtiene los eventos del rango semiabierto [inicio, fin).
+        
+        Los eventos sin hora se consideran a las 00:00 de su fecha. Se puede
+        llamar desde otro hilo (ej: el planificador de avisos).
+        
+        Args:
+            inicio: Fecha o datetime inicial (incluido)
+            fin: Fecha o datetime final (excluido)
+            
+        Returns:
+            List[Evento]: Eventos del rango ordenados por fecha y hora
+        """
+        if self._consultas_indexadas:
+            return self._a_eventos(self.almacenamiento.obtener_rango(a_instante(inicio), a_instante(fin)))
+        
+        with self._lock:
+            eventos = self._linea_tiempo.rango(inicio, fin)
+        archivados = self._archivados(clave_instante(a_instante(inicio)), clave_instante(a_instante(fin)))
+        if archivados:
+            eventos = list(merge(archivados, eventos, key=LineaTiempo.instante_evento))
+        return eventos
+    
+    def obtener_proximos_eventos(self, desde: FechaOInstante, cantidad: int) -> List[Evento]:
+        """
+        Obtiene los próximos eventos a partir de un instante (incluido).
+        
+        Se puede llamar desde otro hilo (ej: el planificador de avisos).
+        
+        Args:
+            desde: Fecha o datetime de inicio
+            cantidad: Cantidad máxima de eventos a devolver
+            
+        Returns:
+            List[Evento]: Hasta `cantidad` eventos ordenados por fecha y hora
+        """
+        if self._consultas_indexadas:
+            return self._a_eventos(self.almacenamiento.obtener_proximos(a_instante(desde), cantidad))
+        
+        with self._lock:
+            eventos = self._linea_tiempo.proximos(desde, cantidad)
+        archivados = self._archivados(clave_instante(a_instante(desde)), cantidad=cantidad)
+        if archivados:
+            eventos = list(merge(archivados, eventos, key=LineaTiempo.instante_evento))[:cantidad]
+        return eventos
     
     def eliminar_evento(self, evento_id: str) -> Tuple[bool, str]:
         """
@@ -254,19 +1271,119 @@ class EventosManager:
         Returns:
             Tuple[bool, str]: (éxito, mensaje)
         """
-        evento = self.buscar_evento_por_id(evento_id)
+        evento = self._obtener_modificable(evento_id)
         if not evento:
             return False, "Evento no encontrado"
         
-        self.eventos.remove(evento)
+        if self._eventos is not None:
+            self._retirar_evento(evento)
         
-        if self.guardar_eventos():
+        if self._registrar_cambio('baja', {'id': evento.id}):
+            self._notificar_observadores('baja', [evento])
             return True, f"✅ Evento '{evento.titulo}' eliminado exitosamente"
         else:
             # Si no se pudo guardar, restaurar el evento
-            self.eventos.append(evento)
+            if self._eventos is not None:
+                self._insertar_evento(evento)
             return False, "Error al guardar los cambios"
     
+    def eliminar_eventos_lote(self, evento_ids: Iterable[str]) -> List[Tuple[bool, str, Optional[Evento]]]:
+        """
+        Elimina muchos eventos persistiendo las bajas una sola vez.
+        
+        Args:
+            evento_ids: IDs de los eventos a eliminar
+            
+        Returns:
+            List[Tuple[bool, str, Optional[Evento]]]: (éxito, mensaje, evento_eliminado) por ID, en el mismo orden
+        """
+        resultados: List[Tuple[bool, str, Optional[Evento]]] = []
+        eliminados: List[Evento] = []
+        vistos = set()
+        evento_ids = list(evento_ids)
+        # Los eventos archivados vuelven a memoria todos juntos
+        encontrados = self._obtener_modificables(evento_ids)
+        
+        for evento_id in evento_ids:
+            evento = None if evento_id in vistos else encontrados.get(evento_id)
+            if not evento:
+                resultados.append((False, "Evento no encontrado", None))
+                continue
+            vistos.add(evento_id)
+            eliminados.append(evento)
+            resultados.append((True, f"✅ Evento '{evento.titulo}' eliminado exitosamente", evento))
+        
+        if not eliminados:
+            return resultados
+        
+        if self._eventos is not None:
+            self._retirar_lote(eliminados)
+        
+        if self._registrar_lote([('baja', {'id': evento.id}) for evento in eliminados]):
+            print(f"✅ Lote de {len(eliminados)} eventos eliminado")
+            self._notificar_observadores('baja', eliminados)
+            return resultados
+        
+        # Si no se pudo guardar, restaurar todos los eventos del lote
+        if self._eventos is not None:
+            self._insertar_lote(eliminados)
+        return [
+            (False, "Error al guardar los cambios", None) if exito else (exito, mensaje, evento)
+            for exito, mensaje, evento in resultados
+        ]
+    
+    def actualizar_evento(self, evento_id: str, titulo: str, fecha: str, hora: str = None,
+                          descripcion: str = None) -> Tuple[bool, str, Optional[Evento]]:
+        """
+        Modifica un evento existente conservando su ID y su fecha de creación.
+        
+        El evento se modifica en su lugar y se persiste como un único cambio
+        ('modificacion'), sin baja + alta ni guardado completo del archivo.
+        
+        Args:
+            evento_id: ID del evento a modificar
+            titulo: Nuevo título (obligatorio)
+            fecha: Nueva fecha en formato YYYY-MM-DD
+            hora: Nueva hora en formato HH:MM (opcional)
+            descripcion: Nueva descripción (opcional)
+            
+        Returns:
+            Tuple[bool, str, Optional[Evento]]: (éxito, mensaje, evento_actualizado)
+        """
+        evento = self._obtener_modificable(evento_id)
+        if not evento:
+            return False, "Evento no encontrado", None
+        
+        error = self._validar_datos_evento(titulo, fecha, hora)
+        if error:
+            return False, error, None
+        
+        anteriores = (evento.titulo, evento.fecha, evento.hora, evento.descripcion)
+        self._modificar_evento(evento, titulo.strip(), fecha, hora,
+                               descripcion.strip() if descripcion else None)
+        
+        if self._registrar_cambio('modificacion', {'evento': evento.to_dict()}):
+            self._notificar_observadores('modificacion', [evento])
+            return True, f"✅ Evento '{evento.titulo}' actualizado", evento
+        else:
+            # Si no se pudo guardar, restaurar los valores anteriores
+            self._modificar_evento(evento, *anteriores)
+            return False, "Error al guardar los cambios", None
+    
+    def _modificar_evento(self, evento: Evento, titulo: str, fecha: str,
+                          hora: Optional[str], descripcion: Optional[str]) -> None:
+        """Asigna los campos de un evento y lo reubica en los índices por fecha/hora."""
+        en_memoria = self._eventos is not None
+        with self._lock:
+            if en_memoria:
+                self._desindexar_evento(evento)
+            evento.titulo = titulo
+            evento.fecha = sys.intern(fecha)
+            evento.hora = sys.intern(hora) if hora else hora
+            evento.descripcion = descripcion
+            if en_memoria:
+                self._indexar_evento(evento)
+    
     def buscar_evento_por_id(self, evento_id: str) -> Optional[Evento]:
         """
         Busca un evento por su ID.
@@ -277,10 +1394,15 @@ class EventosManager:
         Returns:
             Optional[Evento]: Evento encontrado o None
         """
-        for evento in self.eventos:
-            if evento.id == evento_id:
-                return evento
-        return None
+        if self._eventos is None:
+            evento_dict = self.almacenamiento.obtener_por_id(evento_id)
+            return Evento.from_dict(evento_dict) if evento_dict else None
+        
+        evento = self._eventos_por_id.get(evento_id)
+        if evento is None and self._historico is not None and evento_id not in self._descongelados:
+            evento_dict = self._historico.obtener_por_id(evento_id)
+            return Evento.from_dict(evento_dict) if evento_dict else None
+        return evento
     
     def buscar_eventos_por_titulo(self, titulo: str) -> List[Evento]:
         """
@@ -292,28 +1414,54 @@ class EventosManager:
         Returns:
             List[Evento]: Lista de eventos encontrados
         """
+        if self._consultas_indexadas:
+            return self._a_eventos(self.almacenamiento.buscar_por_titulo(titulo))
+        
         titulo_lower = titulo.lower()
         eventos_encontrados = [
             evento for evento in self.eventos 
             if titulo_lower in evento.titulo.lower()
         ]
         
+        if self._historico is not None:
+            eventos_encontrados.extend(
+                evento for evento in self._a_eventos(self._historico.buscar_por_titulo(titulo))
+                if not self._fuera_del_archivo(evento.id)
+            )
         return eventos_encontrados
     
+    def obtener_todos_los_eventos(self) -> List[Evento]:
+        """
+        Obtiene todos los eventos, incluidos los del archivo histórico.
+        
+        A diferencia de la propiedad `eventos` (solo los que están en
+        memoria), cuenta lo mismo que contar_eventos.
+        
+        Returns:
+            List[Evento]: Lista nueva (se puede ordenar o modificar)
+        """
+        with self._lock:
+            eventos = list(self.eventos)
+        return eventos + self._archivados(0)
+    
     def obtener_estadisticas(self) -> dict:
         """
         Obtiene estadísticas de los eventos.
         
+        Como contar_eventos, incluye los eventos del archivo histórico
+        ('eventos_archivados' indica cuántos son).
+        
         Returns:
             dict: Estadísticas de eventos
         """
-        total_eventos = len(self.eventos)
-        eventos_con_hora = len([e for e in self.eventos if e.hora])
+        eventos = self.obtener_todos_los_eventos()
+        total_eventos = len(eventos)
+        eventos_con_hora = len([e for e in eventos if e.hora])
         eventos_sin_hora = total_eventos - eventos_con_hora
         
         # Eventos por mes
         eventos_por_mes = {}
-        for evento in self.eventos:
+        for evento in eventos:
             fecha_obj = evento.get_fecha_objeto()
             mes_key = f"{fecha_obj.year}-{fecha_obj.month:02d}"
             eventos_por_mes[mes_key] = eventos_por_mes.get(mes_key, 0) + 1
@@ -323,7 +1471,9 @@ class EventosManager:
             'eventos_con_hora': eventos_con_hora,
             'eventos_sin_hora': eventos_sin_hora,
             'eventos_por_mes': eventos_por_mes,
-            'archivo_datos': self.archivo_datos
+            'archivo_datos': self.archivo_datos,
+            'almacenamiento': self.almacenamiento.nombre,
+            'eventos_archivados': self._cantidad_archivada()
         }
     
     def tiene_eventos_fecha(self, fecha: datetime.date) -> bool:
@@ -336,4 +1486,20 @@ class EventosManager:
         Returns:
             bool: True si hay eventos en esa fecha
         """
-        return len(self.obtener_eventos_fecha(fecha)) > 0 
\ No newline at end of file
+        if self._consultas_indexadas:
+            return len(self.obtener_eventos_fecha(fecha)) > 0
+        if self._eventos_por_fecha.get(fecha.strftime("%Y-%m-%d")):
+            return True
+        desde = fecha.toordinal() * MINUTOS_DIA
+        return bool(self._archivados(desde, desde + MINUTOS_DIA))
+    
+    def contar_eventos(self) -> int:
+        """
+        Obtiene la cantidad total de eventos sin materializarlos.
+        
+        Returns:
+            int: Cantidad de eventos
+        """
+        if self._eventos is None:
+            return self.almacenamiento.contar()
+        return len(self._eventos) + self._cantidad_archivada() 
\ No newline at end of file
@@ -0,0 +1,284 @@
+"""
+Formato_Binario.py - Snapshot binario compacto de eventos
+
+Este módulo se encarga de:
+- Serializar los eventos en un formato binario con prefijos de largo (struct/array)
+- Guardar cada cadena distinta una sola vez (fechas, horas y títulos repetidos)
+- Incluir un índice por fecha y hora cuyos offsets figuran en la cabecera
+- Leer el snapshot completo o acceder a eventos sueltos sin copiar el archivo (mmap)
+
+Estructura del archivo (little-endian, secciones alineadas a 8 bytes):
+    Cabecera   magia "EVTB", versión, cantidades y offset de cada sección
+    Offsets    (cadenas + 1) uint32: posición de cada cadena dentro del texto
+    Texto      todas las cadenas distintas en UTF-8, concatenadas
+    Registros  6 int32 por evento: índice de cada campo en la tabla (-1 = null)
+    Claves     int64 ordenadas: minutos desde el ordinal 0 (fecha + hora)
+    Filas      int32: registro al que corresponde cada clave
+
+Autor: Mariano Capella, Gabriel Osemberg
+"""
+
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from typing import BinaryIO, Dict, Iterable, List, Optional
+from src.core.linea_tiempo import clave_minutos
+
+
+MAGIA = b"EVTB"
+VERSION = 1
+EXTENSIONES_BINARIAS = ('.evb',)
+
+# Orden fijo de los campos dentro de cada registro (parte del formato)
+CAMPOS = ('id', 'titulo', 'fecha', 'hora', 'descripcion', 'fecha_creacion')
+
+# magia, versión, reservado, eventos, cadenas, claves, largo del texto y
+# offsets de: offsets, texto, registros, claves, filas
+_CABECERA = struct.Struct('<4sHHIIIQQQQQQ')
+_ALINEACION = 8
+_NULO = -1
+
+for _tipo, _tamaño in (('I', 4), ('i', 4), ('q', 8)):
+    if array(_tipo).itemsize != _tamaño:
+        raise ImportError(f"array('{_tipo}') no mide {_tamaño} bytes en esta plataforma")
+
+
+def _a_little_endian(valores: array) -> bytes:
+    """Bytes de un array en little-endian."""
+    if sys.byteorder == 'big':
+        valores = array(valores.typecode, valores)
+        valores.byteswap()
+    return valores.tobytes()
+
+
+def _relleno(posicion: int) -> bytes:
+    """Bytes de relleno hasta la siguiente posición alineada."""
+    return b"\0" * (-posicion % _ALINEACION)
+
+
+def escribir_snapshot(f: BinaryIO, eventos: Iterable[dict]) -> int:
+    """
+    Escribe los eventos en formato binario.
+    
+    Args:
+        f: Archivo abierto en modo binario
+        eventos: Eventos como diccionarios (se guardan los campos de CAMPOS)
+    
+    Returns:
+        int: Cantidad de eventos escritos
+    """
+    # Todos los valores, registro tras registro (CAMPOS por evento)
+    valores = [evento.get(campo) for evento in eventos for campo in CAMPOS]
+    if not set(map(type, valores)) <= {str, type(None)}:
+        valores = [v if v is None or isinstance(v, str) else str(v) for v in valores]
+    cantidad = len(valores) // len(CAMPOS)
+    
+    # Tabla de cadenas sin repetidos; None queda primero y recibe el índice nulo (-1)
+    indices: Dict[Optional[str], int] = {
+        valor: indice for indice, valor in enumerate(dict.fromkeys([None, *valores]), _NULO)
+    }
+    registros = array('i', map(indices.__getitem__, valores))
+    cadenas = list(indices)[1:]
+    
+    # Las fechas y horas se repiten mucho: la clave se calcula una vez por par
+    i_fecha, i_hora = CAMPOS.index('fecha'), CAMPOS.index('hora')
+    momentos = list(zip(valores[i_fecha::len(CAMPOS)], valores[i_hora::len(CAMPOS)]))
+    claves_por_momento = {momento: clave_minutos(*momento) for momento in dict.fromkeys(momentos)}
+    claves_filas = list(map(claves_por_momento.__getitem__, momentos))
+    # sorted es estable: a igual clave se conserva el orden de los registros
+    orden = sorted((fila for fila, clave in enumerate(claves_filas) if clave is not None),
+                   key=claves_filas.__getitem__)
+    
+    codificadas = [cadena.encode('utf-8') for cadena in cadenas]
+    offsets = array('I', [0])
+    total = 0
+    for codificada in codificadas:
+        total += len(codificada)
+        offsets.append(total)
+    if total >= 1 << 32:
+        raise ValueError("El texto del snapshot supera los 4 GB")
+    
+    claves = array('q', map(claves_filas.__getitem__, orden))
+    filas = array('i', orden)
+    
+    secciones = [_a_little_endian(offsets), b"".join(codificadas), _a_little_endian(registros),
+                 _a_little_endian(claves), _a_little_endian(filas)]
+    posiciones = []
+    posicion = _CABECERA.size
+    for seccion in secciones:
+        posicion += len(_relleno(posicion))
+        posiciones.append(posicion)
+        posicion += len(seccion)
+    
+    f.write(_CABECERA.pack(MAGIA, VERSION, 0, cantidad, len(cadenas), len(claves),
+                           total, *posiciones))
+    posicion = _CABECERA.size
+    for inicio, seccion in zip(posiciones, secciones):
+        f.write(b"\0" * (inicio - posicion))
+        f.write(seccion)
+        posicion = inicio + len(seccion)
+    return cantidad
+
+
+class SnapshotBinario:
+    """
+    Acceso de solo lectura a un snapshot binario en memoria o en un mmap.
+    
+    Las secciones numéricas se ven a través de memoryview (sin copiarlas) en
+    plataformas little-endian; las cadenas se decodifican solo al pedirlas.
+    """
+    
+    def __init__(self, datos):
+        """
+        Valida la cabecera y ubica las secciones.
+        
+        Args:
+            datos: bytes o mmap con el contenido del archivo
+        
+        Raises:
+            ValueError: Si el contenido no es un snapshot válido o está truncado
+        """
+        if len(datos) < _CABECERA.size:
+            raise ValueError("Snapshot binario truncado (cabecera incompleta)")
+        (magia, version, _, self.cantidad, self.cantidad_cadenas, cantidad_claves, largo_texto,
+         inicio_offsets, inicio_texto, inicio_registros, inicio_claves, inicio_filas) = \
+            _CABECERA.unpack_from(datos, 0)
+        if magia != MAGIA:
+            raise ValueError("No es un snapshot binario de eventos")
+        if version != VERSION:
+            raise ValueError(f"Versión de snapshot binario no soportada: {version}")
+        if inicio_filas + 4 * cantidad_claves > len(datos):
+            raise ValueError("Snapshot binario truncado")
+        
+        self._datos = datos
+        self._inicio_texto = inicio_texto
+        self._vista = memoryview(datos)
+        self._offsets = self._numeros(inicio_offsets, self.cantidad_cadenas + 1, 'I')
+        self._texto = self._vista[inicio_texto:inicio_texto + largo_texto]
+        self._registros = self._numeros(inicio_registros, self.cantidad * len(CAMPOS), 'i')
+        self.claves = self._numeros(inicio_claves, cantidad_claves, 'q')
+        self.filas = self._numeros(inicio_filas, cantidad_claves, 'i')
+    
+    def _numeros(self, inicio: int, cantidad: int, tipo: str):
+        """Vista (o copia, en big-endian) de una sección numérica."""
+        tamaño = array(tipo).itemsize
+        seccion = self._vista[inicio:inicio + cantidad * tamaño]
+        if sys.byteorder == 'little':
+            return seccion.cast(tipo)
+        valores = array(tipo, bytes(seccion))
+        valores.byteswap()
+        return valores
+    
+    def cerrar(self) -> None:
+        """Libera las vistas (necesario antes de cerrar un mmap)."""
+        for vista in (self._offsets, self._texto, self._registros, self.claves, self.filas, self._vista):
+            if isinstance(vista, memoryview):
+                vista.release()
+    
+    def cadena(self, indice: int) -> Optional[str]:
+        """Decodifica una cadena de la tabla (None para el índice nulo)."""
+        if indice == _NULO:
+            return None
+        return str(self._texto[self._offsets[indice]:self._offsets[indice + 1]], 'utf-8')
+    
+    def cadenas(self) -> List[str]:
+        """Decodifica toda la tabla de cadenas de una vez."""
+        texto = self._texto.tobytes()
+        offsets = self._offsets.tolist()
+        if texto.isascii():
+            # Un byte por carácter: se decodifica una vez y se corta el str
+            texto = texto.decode('ascii')
+            return [texto[inicio:fin] for inicio, fin in zip(offsets, offsets[1:])]
+        return [texto[inicio:fin].decode('utf-8') for inicio, fin in zip(offsets, offsets[1:])]
+    
+    def evento(self, fila: int) -> dict:
+        """Construye el diccionario de un evento a partir de su registro."""
+        base = fila * len(CAMPOS)
+        return {campo: self.cadena(self._registros[base + i]) for i, campo in enumerate(CAMPOS)}
+    
+    def eventos(self) -> List[dict]:
+        """Construye todos los eventos, en orden de registro."""
+        # El índice nulo (-1) cae en el None agregado al final de la tabla
+        tabla = self.cadenas() + [None]
+        valores = iter(list(map(tabla.__getitem__, self._registros.tolist())))
+        # zip sobre el mismo iterador agrupa los valores de a un registro
+        return [
+            {'id': id_, 'titulo': titulo, 'fecha': fecha, 'hora': hora,
+             'descripcion': descripcion, 'fecha_creacion': creacion}
+            for id_, titulo, fecha, hora, descripcion, creacion in zip(*[valores] * len(CAMPOS))
+        ]
+    
+    def _columna(self, campo: str) -> List[int]:
+        """Índices de cadena de un campo para todos los registros."""
+        return self._registros[CAMPOS.index(campo)::len(CAMPOS)].tolist()
+    
+    def indice_cadena(self, valor: str) -> Optional[int]:
+        """
+        Busca una cadena en la tabla sin decodificar el texto.
+        
+        Returns:
+            Optional[int]: Índice de la cadena o None si no está
+        """
+        buscada = valor.encode('utf-8')
+        inicio, fin = self._inicio_texto, self._inicio_texto + len(self._texto)
+        posicion = self._datos.find(buscada, inicio, fin)
+        while posicion != -1:
+            # Solo vale una coincidencia que sea exactamente una cadena de la tabla
+            relativa = posicion - inicio
+            indice = bisect_left(self._offsets, relativa)
+            if (indice < self.cantidad_cadenas and self._offsets[indice] == relativa
+                    and self._offsets[indice + 1] == relativa + len(buscada)):
+                return indice
+            posicion = self._datos.find(buscada, posicion + 1, fin)
+        return None
+    
+    def fila_id(self, evento_id: str) -> Optional[int]:
+        """Registro del evento con ese ID (None si no está en el snapshot)."""
+        indice = self.indice_cadena(evento_id)
+        if indice is None:
+            return None
+        try:
+            return self._columna('id').index(indice)
+        except ValueError:
+            return None
+    
+    def filas_titulo(self, termino: str) -> List[int]:
+        """Registros cuyo título contiene `termino` (sin distinguir mayúsculas)."""
+        termino = termino.lower()
+        titulos = self._columna('titulo')
+        coinciden = {indice for indice in set(titulos)
+                     if indice != _NULO and termino in self.cadena(indice).lower()}
+        return [fila for fila, indice in enumerate(titulos) if indice in coinciden]
+    
+    def filas_rango(self, desde: int, hasta: int) -> List[int]:
+        """
+        Filas cuyas claves caen en [desde, hasta), en orden de fecha y hora.
+        
+        Args:
+            desde: Clave inicial (incluida)
+            hasta: Clave final (excluida)
+        """
+        inicio = bisect_left(self.claves, desde)
+        fin = bisect_left(self.claves, hasta)
+        return list(self.filas[inicio:fin])
+
+
+def leer_snapshot(datos: bytes) -> List[dict]:
+    """
+    Lee todos los eventos de un snapshot binario.
+    
+    Args:
+        datos: Contenido del archivo
+    
+    Returns:
+        List[dict]: Eventos en el orden en que se guardaron
+    
+    Raises:
+        ValueError: Si el contenido no es un snapshot válido
+    """
+    snapshot = SnapshotBinario(datos)
+    try:
+        return snapshot.eventos()
+    finally:
+        snapshot.cerrar()
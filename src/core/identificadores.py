@@ -0,0 +1,107 @@
+"""
+Identificadores.py - Generación de IDs únicos y ordenados para eventos
+
+Este módulo se encarga de:
+- Generar IDs al estilo ULID: 48 bits de milisegundos + 80 bits aleatorios
+- Mantener los IDs crecientes dentro del proceso aunque se generen miles por milisegundo
+- Evitar colisiones entre procesos que comparten el mismo archivo de datos
+- Permitir ordenar los IDs por orden de creación comparándolos como texto,
+  también respecto de los IDs anteriores (evt_YYYYmmdd_HHMMSS_N)
+
+Autor: Mariano Capella, Gabriel Osemberg
+"""
+
+import secrets
+import threading
+import time
+from typing import Callable
+
+
+# Base32 de Crockford: conserva el orden al comparar como texto
+ALFABETO = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+LARGO_ID = 26
+BITS_ALEATORIOS = 80
+MAXIMO_ALEATORIO = (1 << BITS_ALEATORIOS) - 1
+# La "u" (de ULID) es mayor que cualquier dígito: como texto, los IDs nuevos
+# quedan después de los del formato anterior (evt_2025...)
+PREFIJO_EVENTOS = "evt_u"
+
+
+def codificar(valor: int) -> str:
+    """
+    Codifica un entero de 128 bits en 26 caracteres base32.
+    
+    Args:
+        valor: Entero a codificar
+    
+    Returns:
+        str: Texto de largo fijo (el orden del texto es el orden del número)
+    """
+    caracteres = []
+    for _ in range(LARGO_ID):
+        caracteres.append(ALFABETO[valor & 31])
+        valor >>= 5
+    return "".join(reversed(caracteres))
+
+
+class GeneradorIds:
+    """
+    Generador de IDs monótonos y únicos.
+    
+    Dentro de un mismo milisegundo la parte aleatoria se incrementa en uno, de
+    modo que los IDs de una carga masiva salen estrictamente crecientes. Si el
+    reloj retrocede se sigue usando el último milisegundo emitido. Dos procesos
+    parten de valores aleatorios independientes de 80 bits, así que sus IDs no
+    chocan en la práctica.
+    """
+    
+    def __init__(self, prefijo: str = PREFIJO_EVENTOS, reloj: Callable[[], float] = time.time):
+        """
+        Inicializa el generador.
+        
+        Args:
+            prefijo: Texto que antecede a cada ID
+            reloj: Función que devuelve los segundos actuales (epoch)
+        """
+        self.prefijo = prefijo
+        self._reloj = reloj
+        self._lock = threading.Lock()
+        self._ultimo_ms = -1
+        self._aleatorio = 0
+    
+    def generar(self) -> str:
+        """
+        Genera un nuevo ID, mayor que todos los anteriores de este generador.
+        
+        Returns:
+            str: ID con el prefijo (ej: evt_u01JBX3Q5T8K2M4N6P8R0S2T4V6)
+        """
+        with self._lock:
+            milisegundos = int(self._reloj() * 1000)
+            if milisegundos > self._ultimo_ms:
+                # Se deja libre el bit más alto para poder incrementar
+                self._aleatorio = secrets.randbits(BITS_ALEATORIOS - 1)
+                self._ultimo_ms = milisegundos
+            else:
+                self._aleatorio += 1
+                if self._aleatorio > MAXIMO_ALEATORIO:
+                    # Se agotó el milisegundo: se toma prestado el siguiente
+                    self._ultimo_ms += 1
+                    self._aleatorio = secrets.randbits(BITS_ALEATORIOS - 1)
+            
+            valor = (self._ultimo_ms << BITS_ALEATORIOS) | self._aleatorio
+        return self.prefijo + codificar(valor)
+
+
+# Generador compartido por todos los gestores del proceso
+_generador_eventos = GeneradorIds()
+
+
+def generar_id_evento() -> str:
+    """
+    Genera un ID de evento único y ordenado por creación.
+    
+    Returns:
+        str: Nuevo ID de evento
+    """
+    return _generador_eventos.generar()
@@ -0,0 +1,172 @@
+"""
+Journal.py - Registro incremental (append-only) de cambios de eventos
+
+Este módulo se encarga de:
+- Registrar cada alta, baja o modificación como una línea JSON
+- Registrar lotes de cambios en una sola línea (se aplican todos o ninguno)
+- Leer los registros válidos para reconstruir el estado al cargar
+- Descartar registros incompletos tras una caída a mitad de escritura
+- Indicar cuándo conviene compactar el journal en el snapshot JSON
+
+Autor: Mariano Capella, Gabriel Osemberg
+"""
+
+import json
+import os
+from typing import List, Tuple
+
+
+OPERACIONES_VALIDAS = ('alta', 'baja', 'modificacion')
+
+
+class JournalEventos:
+    """
+    Journal de cambios que acompaña al archivo de datos de eventos.
+    
+    Cada registro ocupa una línea terminada en salto de línea. Una línea sin
+    terminar o que no es JSON válido se considera una escritura interrumpida:
+    se ignora junto con todo lo que venga después.
+    """
+    
+    def __init__(self, ruta: str, umbral_compactacion: int = 500):
+        """
+        Inicializa el journal.
+        
+        Args:
+            ruta: Ruta del archivo de journal
+            umbral_compactacion: Cantidad de registros a partir de la cual compactar
+        """
+        self.ruta = ruta
+        self.umbral_compactacion = umbral_compactacion
+        self.registros = 0
+    
+    @staticmethod
+    def ruta_para(archivo_datos: str) -> str:
+        """
+        Obtiene la ruta del journal asociado a un archivo de datos.
+        
+        Args:
+            archivo_datos: Ruta del snapshot (ej: data/eventos.json)
+        
+        Returns:
+            str: Ruta del journal (ej: data/eventos.journal)
+        """
+        return os.path.splitext(archivo_datos)[0] + ".journal"
+    
+    def leer(self) -> List[dict]:
+        """
+        Lee los registros válidos del journal.
+        
+        Si encuentra una escritura interrumpida, recorta el archivo hasta el
+        último registro completo para que las siguientes escrituras no queden
+        pegadas a la línea dañada.
+        
+        Returns:
+            List[dict]: Registros en orden de escritura
+        """
+        self.registros = 0
+        if not os.path.exists(self.ruta):
+            return []
+        
+        registros = []
+        offset_valido = 0
+        with open(self.ruta, 'rb') as f:
+            for linea in f:
+                if not linea.endswith(b"\n"):
+                    break
+                try:
+                    registro = json.loads(linea.decode('utf-8'))
+                except ValueError:
+                    break
+                if not isinstance(registro, dict):
+                    break
+                if registro.get('op') == 'lote':
+                    # Un lote se expande en sus cambios individuales
+                    cambios = registro.get('cambios')
+                    if not isinstance(cambios, list) or not all(
+                        isinstance(c, dict) and c.get('op') in OPERACIONES_VALIDAS for c in cambios
+                    ):
+                        break
+                    registros.extend(cambios)
+                elif registro.get('op') in OPERACIONES_VALIDAS:
+                    registros.append(registro)
+                else:
+                    break
+                offset_valido += len(linea)
+        
+        if offset_valido < os.path.getsize(self.ruta):
+            print(f"⚠️ Journal {self.ruta} con escritura incompleta, se descarta el final")
+            with open(self.ruta, 'r+b') as f:
+                f.truncate(offset_valido)
+        
+        self.registros = len(registros)
+        return registros
+    
+    @staticmethod
+    def _crear_registro(operacion: str, datos: dict) -> dict:
+        """Arma un registro validando la operación."""
+        if operacion not in OPERACIONES_VALIDAS:
+            raise ValueError(f"Operación de journal inválida: {operacion}")
+        registro = {'op': operacion}
+        registro.update(datos)
+        return registro
+    
+    def _escribir_linea(self, registro: dict) -> None:
+        """Agrega una línea al final del journal y la fuerza a disco."""
+        linea = json.dumps(registro, ensure_ascii=False, separators=(',', ':')) + "\n"
+        
+        with open(self.ruta, 'a', encoding='utf-8') as f:
+            f.write(linea)
+            f.flush()
+            os.fsync(f.fileno())
+    
+    def registrar(self, operacion: str, datos: dict) -> None:
+        """
+        Agrega un registro al final del journal y lo fuerza a disco.
+        
+        Args:
+            operacion: 'alta', 'baja' o 'modificacion'
+            datos: Contenido del registro (ej: {'evento': {...}} o {'id': ...})
+        
+        Raises:
+            ValueError: Si la operación no es válida
+            OSError: Si no se pudo escribir
+        """
+        self._escribir_linea(self._crear_registro(operacion, datos))
+        self.registros += 1
+    
+    def registrar_lote(self, cambios: List[Tuple[str, dict]]) -> None:
+        """
+        Agrega varios cambios como un único registro con un solo fsync.
+        
+        Al ocupar una sola línea, una caída a mitad de escritura descarta el
+        lote completo: nunca queda aplicado a medias.
+        
+        Args:
+            cambios: Pares (operación, datos) en orden de aplicación
+        
+        Raises:
+            ValueError: Si alguna operación no es válida
+            OSError: Si no se pudo escribir
+        """
+        registros = [self._crear_registro(operacion, datos) for operacion, datos in cambios]
+        if not registros:
+            return
+        self._escribir_linea({'op': 'lote', 'cambios': registros})
+        self.registros += len(registros)
+    
+    def requiere_compactacion(self) -> bool:
+        """
+        Indica si el journal alcanzó el umbral de compactación.
+        
+        Returns:
+            bool: True si conviene volcarlo al snapshot
+        """
+        return self.registros >= self.umbral_compactacion
+    
+    def truncar(self) -> None:
+        """Vacía el journal (después de escribir un snapshot completo)."""
+        if os.path.exists(self.ruta):
+            with open(self.ruta, 'w', encoding='utf-8'):
+                pass
+        self.registros = 0
\ No newline at end of file
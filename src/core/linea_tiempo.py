@@ -0,0 +1,187 @@
+"""
+Linea_Tiempo.py - Línea de tiempo ordenada de eventos
+
+Este módulo se encarga de:
+- Mantener los eventos ordenados por su fecha y hora
+- Consultas por rango semiabierto [inicio, fin) en O(log n + k)
+- Consultas de "próximos N eventos" a partir de un instante
+
+Los eventos sin hora se ubican a las 00:00 de su fecha, igual que en el
+orden que usa el resto del sistema (hora or "00:00").
+
+Autor: Mariano Capella, Gabriel Osemberg
+"""
+
+import datetime
+from bisect import bisect_left, bisect_right
+from typing import List, Optional, Union
+from src.utils.helpers import parsear_fecha
+
+
+FechaOInstante = Union[datetime.date, datetime.datetime]
+
+MINUTOS_DIA = 24 * 60
+
+
+def a_instante(valor: FechaOInstante) -> datetime.datetime:
+    """Convierte una fecha en el instante de su medianoche."""
+    if isinstance(valor, datetime.datetime):
+        return valor
+    return datetime.datetime.combine(valor, datetime.time.min)
+
+
+def clave_minutos(fecha: str, hora: Optional[str]) -> Optional[int]:
+    """
+    Convierte fecha y hora a minutos desde el ordinal 0 (mismo orden que la línea de tiempo).
+    
+    Returns:
+        Optional[int]: Clave o None si la fecha/hora es inválida
+    """
+    try:
+        ordinal = parsear_fecha(fecha).toordinal()
+        minutos = 0
+        if hora:
+            horas, mins = hora.split(":")
+            minutos = int(horas) * 60 + int(mins)
+        return ordinal * MINUTOS_DIA + minutos
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+
+def clave_instante(instante: datetime.datetime) -> int:
+    """Clave en minutos de un instante, redondeando segundos al minuto siguiente."""
+    clave = instante.toordinal() * MINUTOS_DIA + instante.hour * 60 + instante.minute
+    if instante.second or instante.microsecond:
+        clave += 1
+    return clave
+
+
+class LineaTiempo:
+    """
+    Estructura ordenada (bisect) sobre el instante de cada evento.
+    
+    Mantiene dos listas paralelas: los instantes ordenados y los eventos
+    correspondientes. Entre eventos del mismo instante se conserva el orden
+    de inserción.
+    """
+    
+    def __init__(self):
+        """Inicializa una línea de tiempo vacía."""
+        self._instantes: List[datetime.datetime] = []
+        self._eventos: list = []
+    
+    def __len__(self) -> int:
+        return len(self._eventos)
+    
+    @staticmethod
+    def instante_evento(evento) -> Optional[datetime.datetime]:
+        """
+        Obtiene el instante con el que se ordena un evento.
+        
+        Args:
+            evento: Evento a ubicar
+        
+        Returns:
+            Optional[datetime.datetime]: Instante o None si la fecha/hora es inválida
+        """
+        try:
+            fecha = evento.get_fecha_objeto()
+            hora = evento.get_hora_objeto() or datetime.time.min
+        except (ValueError, TypeError):
+            return None
+        return datetime.datetime.combine(fecha, hora)
+    
+    def limpiar(self) -> None:
+        """Elimina todos los eventos de la línea de tiempo."""
+        self._instantes = []
+        self._eventos = []
+    
+    def construir(self, eventos) -> None:
+        """
+        Reemplaza el contenido ordenando todos los eventos de una vez.
+        
+        Equivale a agregarlos uno por uno (el orden es estable) pero cuesta
+        O(n log n) en lugar de O(n²) por las inserciones en medio de la lista.
+        
+        Args:
+            eventos: Eventos a ubicar, en orden de inserción
+        """
+        pares = []
+        for evento in eventos:
+            instante = self.instante_evento(evento)
+            if instante is not None:
+                pares.append((instante, evento))
+        pares.sort(key=lambda par: par[0])
+        self._instantes = [instante for instante, _ in pares]
+        self._eventos = [evento for _, evento in pares]
+    
+    def agregar(self, evento) -> bool:
+        """
+        Inserta un evento en su posición.
+        
+        Args:
+            evento: Evento a insertar
+        
+        Returns:
+            bool: False si el evento no tiene una fecha válida
+        """
+        instante = self.instante_evento(evento)
+        if instante is None:
+            return False
+        
+        posicion = bisect_right(self._instantes, instante)
+        self._instantes.insert(posicion, instante)
+        self._eventos.insert(posicion, evento)
+        return True
+    
+    def quitar(self, evento) -> bool:
+        """
+        Quita un evento de la línea de tiempo.
+        
+        Args:
+            evento: Evento a quitar (se compara por identidad)
+        
+        Returns:
+            bool: True si el evento estaba en la línea de tiempo
+        """
+        instante = self.instante_evento(evento)
+        if instante is None:
+            return False
+        
+        posicion = bisect_left(self._instantes, instante)
+        while posicion < len(self._instantes) and self._instantes[posicion] == instante:
+            if self._eventos[posicion] is evento:
+                del self._instantes[posicion]
+                del self._eventos[posicion]
+                return True
+            posicion += 1
+        return False
+    
+    def rango(self, inicio: FechaOInstante, fin: FechaOInstante) -> list:
+        """
+        Obtiene los eventos del rango semiabierto [inicio, fin).
+        
+        Args:
+            inicio: Fecha o instante inicial (incluido)
+            fin: Fecha o instante final (excluido)
+        
+        Returns:
+            list: Eventos ordenados por fecha y hora
+        """
+        desde = bisect_left(self._instantes, a_instante(inicio))
+        hasta = bisect_left(self._instantes, a_instante(fin))
+        return self._eventos[desde:hasta]
+    
+    def proximos(self, desde: FechaOInstante, cantidad: int) -> list:
+        """
+        Obtiene los primeros eventos a partir de un instante (incluido).
+        
+        Args:
+            desde: Fecha o instante de inicio
+            cantidad: Cantidad máxima de eventos
+        
+        Returns:
+            list: Hasta `cantidad` eventos ordenados por fecha y hora
+        """
+        posicion = bisect_left(self._instantes, a_instante(desde))
+        return self._eventos[posicion:posicion + max(0, cantidad)]
\ No newline at end of file
@@ -0,0 +1,115 @@
+"""
+Modelo_Mes.py - Datos de dibujo de un mes y su caché
+
+Este módulo se encarga de:
+- Reunir en un ModeloMes lo que necesita la grilla para dibujar un mes
+  (matriz, día de hoy, fines de semana y cantidad de eventos por día)
+- Guardar los modelos en una caché LRU por (año, mes)
+- Reconstruir un modelo cuando cambian los eventos de su mes o cambia el día
+
+Autor: Mariano Capella, Gabriel Osemberg
+"""
+
+import datetime
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, FrozenSet, Hashable, Iterable, Tuple
+
+
+@dataclass(frozen=True)
+class ModeloMes:
+    """Lo necesario para dibujar un mes en la grilla, sin widgets."""
+    year: int
+    month: int
+    matriz: Tuple[Tuple[int, ...], ...]  # Semanas de Lunes a Domingo, 0 = día de otro mes
+    hoy: datetime.date  # Fecha de hoy al construir el modelo
+    dia_hoy: int  # 0 si hoy no cae en este mes
+    fines_de_semana: FrozenSet[int]
+    eventos_por_dia: Dict[int, int]
+    version: Hashable  # Versión de los eventos del mes al construir el modelo
+    
+    @property
+    def semanas(self) -> int:
+        """Cantidad de semanas (filas) del mes."""
+        return len(self.matriz)
+
+
+class CacheModelosMes:
+    """
+    Caché LRU de modelos de mes.
+    
+    Cada modelo recuerda la versión de los eventos de su mes con la que se
+    construyó: cualquier alta, baja o modificación en ese mes cambia la
+    versión y el modelo se reconstruye la próxima vez que se pide. Los meses
+    no afectados siguen sirviéndose desde la caché.
+    """
+    
+    def __init__(self, construir: Callable[[int, int, Hashable], ModeloMes],
+                 version: Callable[[int, int], Hashable], capacidad: int = 24):
+        """
+        Inicializa la caché.
+        
+        Args:
+            construir: Arma el modelo de (año, mes) con la versión dada
+            version: Devuelve la versión actual de los eventos de (año, mes)
+            capacidad: Cantidad máxima de meses guardados
+        """
+        self._construir = construir
+        self._version = version
+        self.capacidad = capacidad
+        self._modelos: "OrderedDict[Tuple[int, int], ModeloMes]" = OrderedDict()
+        self.aciertos = 0
+        self.construidos = 0
+    
+    def _vigente(self, modelo: ModeloMes) -> bool:
+        """True si el modelo sigue valiendo (mismos eventos y mismo día)."""
+        return (modelo.version == self._version(modelo.year, modelo.month)
+                and modelo.hoy == datetime.date.today())
+    
+    def obtener(self, year: int, month: int) -> ModeloMes:
+        """
+        Modelo de un mes, desde la caché si sigue vigente.
+        
+        Args:
+            year: Año
+            month: Mes (1-12)
+        """
+        clave = (year, month)
+        modelo = self._modelos.get(clave)
+        if modelo is not None and self._vigente(modelo):
+            self._modelos.move_to_end(clave)
+            self.aciertos += 1
+            return modelo
+        
+        modelo = self._construir(year, month, self._version(year, month))
+        self.construidos += 1
+        self._modelos[clave] = modelo
+        self._modelos.move_to_end(clave)
+        while len(self._modelos) > self.capacidad:
+            self._modelos.popitem(last=False)
+        return modelo
+    
+    def precalentar(self, meses: Iterable[Tuple[int, int]]) -> int:
+        """
+        Construye los meses que falten o estén vencidos, sin cambiar el orden LRU de los vigentes.
+        
+        Args:
+            meses: Pares (año, mes) a tener listos
+        
+        Returns:
+            int: Cantidad de modelos construidos
+        """
+        construidos = 0
+        for year, month in meses:
+            modelo = self._modelos.get((year, month))
+            if modelo is None or not self._vigente(modelo):
+                self.obtener(year, month)
+                construidos += 1
+        return construidos
+    
+    def invalidar(self) -> None:
+        """Descarta todos los modelos."""
+        self._modelos.clear()
+    
+    def __len__(self) -> int:
+        return len(self._modelos)
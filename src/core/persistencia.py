@@ -0,0 +1,156 @@
+"""
+Persistencia.py - Persistencia diferida (write-behind) de los cambios de eventos
+
+Este módulo se encarga de:
+- Encolar los cambios sin tocar el disco desde el hilo de la interfaz
+- Agrupar los cambios de una ventana de tiempo (250 ms) en una sola escritura
+- Persistir desde un hilo de fondo y reintentar si la escritura falla
+- Forzar la escritura de lo pendiente (flush) al cerrar la aplicación
+
+Autor: Mariano Capella, Gabriel Osemberg
+"""
+
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+
+class PersistidorDiferido:
+    """
+    Hilo de fondo que persiste lotes de cambios con debounce.
+    
+    El primer cambio de una ventana abre el plazo de `demora` segundos; todo
+    lo que llegue mientras tanto se persiste junto en una única llamada a
+    `persistir`. Si la llamada falla los cambios vuelven a la cola y se
+    reintentan en la ventana siguiente.
+    """
+    
+    def __init__(self, persistir: Callable[[List[Tuple[str, dict]]], None], demora: float = 0.25):
+        """
+        Inicializa el persistidor y arranca su hilo.
+        
+        Args:
+            persistir: Función que escribe un lote de cambios (lanza excepción si falla)
+            demora: Segundos que se esperan para agrupar cambios
+        """
+        self._persistir = persistir
+        self.demora = demora
+        self._condicion = threading.Condition()
+        self._pendientes: List[Tuple[str, dict]] = []
+        self._primer_cambio = 0.0
+        self._en_curso = False
+        self._fallos = 0
+        self._urgente = False
+        self._activo = True
+        self.escrituras = 0
+        self._hilo = threading.Thread(target=self._ejecutar, name="persistidor-eventos", daemon=True)
+        self._hilo.start()
+    
+    @property
+    def pendientes(self) -> int:
+        """Cantidad de cambios encolados que todavía no se escribieron."""
+        with self._condicion:
+            return len(self._pendientes)
+    
+    @property
+    def ocupado(self) -> bool:
+        """True si hay cambios encolados o una escritura en curso."""
+        with self._condicion:
+            return bool(self._pendientes) or self._en_curso
+    
+    def encolar(self, cambios: List[Tuple[str, dict]]) -> None:
+        """
+        Agrega cambios a la cola sin bloquear.
+        
+        Args:
+            cambios: Pares (operación, datos) en orden de aplicación
+        """
+        if not cambios:
+            return
+        with self._condicion:
+            if not self._activo:
+                raise RuntimeError("El persistidor está detenido")
+            if not self._pendientes:
+                self._primer_cambio = time.monotonic()
+            self._pendientes.extend(cambios)
+            self._condicion.notify_all()
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Escribe ya lo pendiente y espera a que termine.
+        
+        Args:
+            timeout: Segundos máximos de espera (None = sin límite)
+        
+        Returns:
+            bool: True si no quedó nada pendiente
+        """
+        limite = None if timeout is None else time.monotonic() + timeout
+        with self._condicion:
+            fallos_iniciales = self._fallos
+            self._urgente = True
+            self._condicion.notify_all()
+            while self._pendientes or self._en_curso:
+                if self._fallos != fallos_iniciales:
+                    return False
+                restante = None if limite is None else limite - time.monotonic()
+                if restante is not None and restante <= 0:
+                    return False
+                self._condicion.wait(restante)
+            return True
+    
+    def detener(self, timeout: Optional[float] = None) -> bool:
+        """
+        Escribe lo pendiente y detiene el hilo.
+        
+        Args:
+            timeout: Segundos máximos de espera para el flush final
+        
+        Returns:
+            bool: True si todo quedó persistido
+        """
+        exito = self.flush(timeout)
+        with self._condicion:
+            self._activo = False
+            self._condicion.notify_all()
+        self._hilo.join(timeout)
+        return exito
+    
+    def _ejecutar(self) -> None:
+        """Bucle del hilo: espera la ventana, toma el lote y lo persiste."""
+        while True:
+            with self._condicion:
+                while self._activo and not self._pendientes:
+                    self._urgente = False
+                    self._condicion.wait()
+                if not self._pendientes:
+                    return
+                
+                # Agrupar todo lo que llegue hasta el fin de la ventana
+                while self._activo and not self._urgente:
+                    restante = self._primer_cambio + self.demora - time.monotonic()
+                    if restante <= 0:
+                        break
+                    self._condicion.wait(restante)
+                
+                lote, self._pendientes = self._pendientes, []
+                self._en_curso = True
+            
+            try:
+                self._persistir(lote)
+                exito = True
+            except Exception as e:
+                print(f"❌ Error en la persistencia diferida ({len(lote)} cambios): {e}")
+                exito = False
+            
+            with self._condicion:
+                self._en_curso = False
+                if exito:
+                    self.escrituras += 1
+                else:
+                    # Reintentar en la próxima ventana sin perder el orden
+                    self._pendientes[:0] = lote
+                    self._primer_cambio = time.monotonic()
+                    self._fallos += 1
+                    self._urgente = False
+                self._condicion.notify_all()
@@ -0,0 +1,102 @@
+"""
+Vigilante.py - Detección de cambios externos en los archivos de datos
+
+Este módulo se encarga de:
+- Obtener una firma barata de los archivos (os.stat: mtime, tamaño, inodo)
+- Consultar periódicamente desde un hilo de fondo si los archivos cambiaron
+- Entregar los cambios detectados a quien los aplica (la interfaz, vía root.after)
+
+Se usa polling de os.stat en lugar de inotify para funcionar igual en
+Windows, macOS y Linux sin dependencias externas.
+
+Autor: Mariano Capella, Gabriel Osemberg
+"""
+
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional, Tuple
+
+
+Firma = Tuple[Optional[Tuple[int, int, int]], ...]
+
+
+def firma_archivos(rutas: List[str]) -> Firma:
+    """
+    Calcula la firma de un conjunto de archivos.
+    
+    Args:
+        rutas: Archivos a considerar
+    
+    Returns:
+        Firma: (mtime_ns, tamaño, inodo) por archivo, None si no existe
+    """
+    firma = []
+    for ruta in rutas:
+        try:
+            estado = os.stat(ruta)
+        except OSError:
+            firma.append(None)
+            continue
+        firma.append((estado.st_mtime_ns, estado.st_size, estado.st_ino))
+    return tuple(firma)
+
+
+@dataclass
+class CambiosExternos:
+    """Diferencias entre los eventos en memoria y los archivos modificados por otro programa."""
+    firma: Firma
+    version_memoria: int
+    # Estado de los archivos en la lectura (ver AlmacenamientoEventos.ultima_lectura)
+    lectura: Any = None
+    # Vista nueva de un backend de consultas indexadas (ver AlmacenamientoEventos.releer)
+    relectura: Any = None
+    altas: List[dict] = field(default_factory=list)
+    bajas: List[str] = field(default_factory=list)
+    modificaciones: List[dict] = field(default_factory=list)
+    
+    def __len__(self) -> int:
+        return len(self.altas) + len(self.bajas) + len(self.modificaciones)
+
+
+class VigilanteArchivos:
+    """
+    Hilo de fondo que consulta periódicamente si hubo cambios externos.
+    
+    `detectar` hace el trabajo pesado (leer y comparar) fuera del hilo de la
+    interfaz; si devuelve algo, se entrega a `notificar`, que debe pasarlo al
+    hilo de la interfaz (por ejemplo con root.after).
+    """
+    
+    def __init__(self, detectar: Callable[[], Optional[Any]], notificar: Callable[[Any], None],
+                 intervalo: float = 1.0):
+        """
+        Inicializa el vigilante y arranca su hilo.
+        
+        Args:
+            detectar: Función que devuelve los cambios detectados o None
+            notificar: Función que recibe los cambios detectados
+            intervalo: Segundos entre consultas
+        """
+        self._detectar = detectar
+        self._notificar = notificar
+        self.intervalo = intervalo
+        self._detenido = threading.Event()
+        self._hilo = threading.Thread(target=self._ejecutar, name="vigilante-eventos", daemon=True)
+        self._hilo.start()
+    
+    def detener(self, timeout: Optional[float] = None) -> None:
+        """Detiene el hilo (no se notifica nada más después de esta llamada)."""
+        self._detenido.set()
+        if self._hilo is not threading.current_thread():
+            self._hilo.join(timeout)
+    
+    def _ejecutar(self) -> None:
+        """Bucle del hilo: espera el intervalo y consulta."""
+        while not self._detenido.wait(self.intervalo):
+            try:
+                cambios = self._detectar()
+                if cambios is not None and not self._detenido.is_set():
+                    self._notificar(cambios)
+            except Exception as e:
+                print(f"❌ Error al verificar cambios externos: {e}")
@@ -25,6 +25,7 @@ from abc import ABC, abstractmethod
 from typing import Optional, Dict, Any, Callable, Tuple
 import logging
 from datetime import datetime
+from src.utils.helpers import parsear_fecha, parsear_hora
 import weakref
 
 
@@ -100,7 +101,7 @@ class DialogValidator:
     def validate_date_format(date_str: str) -> None:
         """Valida formato de fecha."""
         try:
-            datetime.strptime(date_str, "%Y-%m-%d")
+            parsear_fecha(date_str)
         except ValueError:
             raise DialogException("Formato de fecha inválido. Use YYYY-MM-DD")
     
@@ -109,7 +110,7 @@ class DialogValidator:
         """Valida formato de hora."""
         if time_str:  # Solo validar si se proporciona
             try:
-                datetime.strptime(time_str, "%H:%M")
+                parsear_hora(time_str)
             except ValueError:
                 raise DialogException("Formato de hora inválido. Use HH:MM")
     
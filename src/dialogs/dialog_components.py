@@ -18,6 +18,7 @@ from ttkbootstrap.constants import *
 from typing import Optional, List, Callable, Dict, Any
 from datetime import datetime, date
 import re
+from src.utils.helpers import parsear_fecha, parsear_hora
 
 
 class ValidationMixin:
@@ -105,7 +106,7 @@ class SmartEntry(tb.Entry, ValidationMixin):
         
         try:
             # Validar formato YYYY-MM-DD
-            parsed_date = datetime.strptime(value, "%Y-%m-%d")
+            parsed_date = parsear_fecha(value)
             return True
         except ValueError:
             try:
@@ -124,7 +125,7 @@ class SmartEntry(tb.Entry, ValidationMixin):
         
         try:
             # Validar formato HH:MM
-            parsed_time = datetime.strptime(value, "%H:%M")
+            parsed_time = parsear_hora(value)
             return True
         except ValueError:
             try:
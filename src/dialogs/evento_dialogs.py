@@ -28,7 +28,7 @@ from ttkbootstrap.dialogs import Messagebox
 import datetime
 from typing import Optional, List, Callable, Tuple
 from src.core.eventos import Evento, EventosManager
-from src.utils.helpers import formatear_fecha_completa, validar_fecha
+from src.utils.helpers import formatear_fecha_completa, validar_fecha, parsear_fecha, parsear_hora
 
 
 # Alias para compatibilidad - redirige a implementación moderna
@@ -187,7 +187,7 @@ else:
             return
         
         try:
-            datetime.datetime.strptime(fecha_str, "%Y-%m-%d")
+            parsear_fecha(fecha_str)
         except ValueError:
             Messagebox.show_error("Error", "Formato de fecha inválido. Use YYYY-MM-DD", parent=self.window)
             return
@@ -195,7 +195,7 @@ else:
         hora_str = self.var_hora.get().strip()
         if hora_str:
             try:
-                datetime.datetime.strptime(hora_str, "%H:%M")
+                parsear_hora(hora_str)
             except ValueError:
                 Messagebox.show_error("Error", "Formato de hora inválido. Use HH:MM", parent=self.window)
                 return
@@ -452,22 +452,18 @@ class EventosDelDiaDialog:
             resultado = dialog.mostrar() if hasattr(dialog, 'mostrar') else dialog.show()
             
             if resultado:
-                # Actualizar evento
-                # Primero eliminar el evento actual
-                self.eventos_manager.eliminar_evento(evento_id)
-                
-                # Crear evento actualizado (manteniendo ID original)
-                evento_actualizado = Evento(
-                    id=evento_id,
+                # Actualizar evento (manteniendo ID original)
+                exito, mensaje, _ = self.eventos_manager.actualizar_evento(
+                    evento_id,
                     titulo=resultado['titulo'],
                     fecha=resultado['fecha'],
                     hora=resultado['hora'],
                     descripcion=resultado['descripcion']
                 )
                 
-                # Agregar evento actualizado
-                self.eventos_manager.eventos.append(evento_actualizado)
-                self.eventos_manager.guardar_eventos()
+                if not exito:
+                    Messagebox.show_error("Error", mensaje, parent=self.window)
+                    return
                 
                 Messagebox.show_info("Éxito", "Evento actualizado correctamente", parent=self.window)
                 self._actualizar_lista_eventos()
@@ -702,8 +698,8 @@ class BuscarEventosDialog:
             # Buscar eventos por título
             eventos = self.eventos_manager.buscar_eventos_por_titulo(termino)
         else:
-            # Mostrar todos los eventos
-            eventos = self.eventos_manager.eventos
+            # Mostrar todos los eventos, también los del archivo histórico
+            eventos = self.eventos_manager.obtener_todos_los_eventos()
         
         # Ordenar eventos por fecha
         eventos.sort(key=lambda e: (e.fecha, e.hora or "00:00"))
@@ -20,7 +20,7 @@ from ttkbootstrap.dialogs import Messagebox
 import datetime
 from typing import Optional, List, Dict, Any
 from src.core.eventos import Evento, EventosManager
-from src.utils.helpers import formatear_fecha_completa
+from src.utils.helpers import formatear_fecha_completa, parsear_fecha
 from src.dialogs.dialog_base import BaseDialog, DialogException, DialogConstants
 from src.dialogs.dialog_components import (
     FormField, TreeviewComponent, DialogHeader, 
@@ -244,7 +244,7 @@ class ModernEventDialog(BaseDialog):
             # Validación adicional de fecha
             fecha_str = self.field_fecha.get_value()
             try:
-                fecha = datetime.datetime.strptime(fecha_str, "%Y-%m-%d").date()
+                fecha = parsear_fecha(fecha_str)
                 # Advertir si es fecha muy antigua
                 if fecha < datetime.date.today() - datetime.timedelta(days=365):
                     respuesta = Messagebox.show_question(
@@ -592,22 +592,18 @@ class ModernEventListDialog(BaseDialog):
     def _process_edit_event(self, evento_id: str, event_data: Dict[str, Any]) -> None:
         """Procesa la edición de un evento."""
         try:
-            # Eliminar evento actual
-            self.eventos_manager.eliminar_evento(evento_id)
-            
-            # Crear evento actualizado
-            from eventos import Evento
-            evento_actualizado = Evento(
-                id=evento_id,
+            # Actualizar evento en su lugar (un único cambio persistido)
+            exito, mensaje, _ = self.eventos_manager.actualizar_evento(
+                evento_id,
                 titulo=event_data['titulo'],
                 fecha=event_data['fecha'],
                 hora=event_data['hora'],
                 descripcion=event_data['descripcion']
             )
             
-            # Agregar evento actualizado
-            self.eventos_manager.eventos.append(evento_actualizado)
-            self.eventos_manager.guardar_eventos()
+            if not exito:
+                self._show_error("Error", mensaje)
+                return
             
             Messagebox.show_info("Éxito", "Evento actualizado correctamente", parent=self.window)
             self._load_events()
@@ -858,7 +854,7 @@ class ModernSearchDialog(BaseDialog):
     def _load_all_events(self) -> None:
         """Carga todos los eventos disponibles."""
         try:
-            self.all_events = self.eventos_manager.eventos.copy()
+            self.all_events = self.eventos_manager.obtener_todos_los_eventos()
             self.filtered_events = self.all_events.copy()
             self._update_results()
             self.logger.info(f"Cargados {len(self.all_events)} eventos para búsqueda")
@@ -5,6 +5,7 @@ Contiene el sistema completo de notificaciones:
 - NotificacionesManager: Gestor principal de notificaciones
 - NotificacionTimer: Timer para verificación en tiempo real
 - Notificacion: Modelo de datos de notificaciones
+- ReproductorAudio: Hilo único que reproduce los sonidos
 
 Autor: Mariano Capella, Gabriel Osemberg
 """ 
\ No newline at end of file
@@ -0,0 +1,233 @@
+"""
+Audio.py - Reproducción de sonidos de notificación en un solo hilo
+
+Este módulo se encarga de:
+- Reproducir los sonidos en un único hilo de audio, con una cola acotada
+- Omitir un sonido igual al anterior si llega enseguida (ráfagas de avisos)
+- Elegir el backend según la plataforma, importándolo recién al usarlo:
+  winsound en Windows, comandos del sistema en Linux, o backends sin
+  sonido (nulo y de registro) para pruebas
+
+Autor: Mariano Capella, Gabriel Osemberg
+"""
+
+import os
+import queue
+import sys
+import threading
+from typing import List, Optional
+from src.utils.reloj import Reloj
+
+
+class BackendWinsound:
+    """Sonidos del sistema de Windows."""
+    
+    def __init__(self):
+        import winsound
+        self._winsound = winsound
+    
+    def reproducir(self, urgencia: int) -> None:
+        """Reproduce el sonido de la urgencia (0=baja, 1=media, 2=alta)."""
+        winsound = self._winsound
+        if urgencia >= 2:  # Alta urgencia
+            winsound.MessageBeep(winsound.MB_ICONEXCLAMATION)
+            # Solo un beep corto para evitar bloqueos
+            winsound.Beep(800, 200)
+        elif urgencia >= 1:  # Media urgencia
+            winsound.MessageBeep(winsound.MB_ICONASTERISK)
+        else:  # Baja urgencia
+            winsound.MessageBeep(winsound.MB_OK)
+
+
+class BackendLinux:
+    """
+    Sonidos del tema freedesktop con canberra-gtk-play o paplay.
+    
+    Si no hay ninguno de los dos usa la campana de la terminal.
+    """
+    
+    DIRECTORIO_SONIDOS = "/usr/share/sounds/freedesktop/stereo"
+    SONIDOS = {2: "dialog-warning", 1: "message-new-instant", 0: "message"}
+    
+    def __init__(self):
+        import shutil
+        if shutil.which("canberra-gtk-play"):
+            self._programa = "canberra-gtk-play"
+        elif shutil.which("paplay") and os.path.isdir(self.DIRECTORIO_SONIDOS):
+            self._programa = "paplay"
+        else:
+            self._programa = None
+    
+    def reproducir(self, urgencia: int) -> None:
+        """Reproduce el sonido de la urgencia (0=baja, 1=media, 2=alta)."""
+        if self._programa is None:
+            print('\a', end='', flush=True)  # ASCII bell
+            return
+        import subprocess
+        nombre = self.SONIDOS.get(urgencia, "message")
+        if self._programa == "canberra-gtk-play":
+            comando = [self._programa, "-i", nombre]
+        else:
+            comando = [self._programa, os.path.join(self.DIRECTORIO_SONIDOS, f"{nombre}.oga")]
+        subprocess.run(comando, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=10, check=False)
+
+
+class BackendNulo:
+    """Backend sin sonido."""
+    
+    def reproducir(self, urgencia: int) -> None:
+        """No hace nada."""
+
+
+class BackendRegistro:
+    """Backend sin sonido que anota cada reproducción (para pruebas)."""
+    
+    def __init__(self, archivo: Optional[str] = None):
+        """
+        Inicializa el registro.
+        
+        Args:
+            archivo: Si se indica, se agrega una línea con la urgencia por sonido
+        """
+        self.archivo = archivo
+        self.reproducidos: List[int] = []
+    
+    def reproducir(self, urgencia: int) -> None:
+        """Anota la urgencia del sonido."""
+        self.reproducidos.append(urgencia)
+        if self.archivo:
+            with open(self.archivo, 'a', encoding='utf-8') as f:
+                f.write(f"{urgencia}\n")
+
+
+BACKENDS = {
+    'winsound': BackendWinsound,
+    'linux': BackendLinux,
+    'nulo': BackendNulo,
+    'registro': BackendRegistro,
+}
+
+
+def crear_backend(nombre: Optional[str] = None):
+    """
+    Crea un backend de audio.
+    
+    Args:
+        nombre: 'winsound', 'linux', 'nulo' o 'registro' (por defecto, según la plataforma)
+    
+    Returns:
+        El backend pedido, o uno nulo si no se puede usar en este equipo
+    """
+    if nombre is None:
+        nombre = 'winsound' if sys.platform == "win32" else 'linux'
+    try:
+        return BACKENDS[nombre]()
+    except (ImportError, OSError) as e:
+        print(f"⚠️ Audio no disponible ({nombre}): {e}")
+        return BackendNulo()
+
+
+class ReproductorAudio:
+    """
+    Hilo único que reproduce los sonidos en orden.
+    
+    reproducir() solo encola y vuelve enseguida, así nunca bloquea el hilo
+    de la interfaz. La cola es acotada: si se llena, los sonidos nuevos se
+    descartan. Un sonido igual al anterior que llega dentro de
+    `ventana_duplicados` segundos se omite.
+    """
+    
+    def __init__(self, backend=None, capacidad: int = 8, ventana_duplicados: float = 1.0,
+                 reloj: Optional[Reloj] = None):
+        """
+        Inicializa el reproductor (el hilo arranca con el primer sonido).
+        
+        Args:
+            backend: Backend de audio (por defecto, crear_backend() al primer sonido, en el hilo de audio)
+            capacidad: Sonidos pendientes como máximo
+            ventana_duplicados: Segundos en que un sonido igual al anterior se omite
+            reloj: Reloj para la ventana de duplicados (por defecto, el del sistema)
+        """
+        self.backend = backend
+        self.ventana_duplicados = ventana_duplicados
+        self.reloj = reloj or Reloj()
+        self._cola: queue.Queue = queue.Queue(maxsize=capacidad)
+        self._lock = threading.Lock()
+        self._hilo: Optional[threading.Thread] = None
+        self._ultimo: Optional[tuple] = None  # (urgencia, instante en que se encoló)
+        self.reproducidos = 0
+        self.duplicados = 0
+        self.descartados = 0
+    
+    def reproducir(self, urgencia: int) -> bool:
+        """
+        Encola un sonido sin esperar a que suene.
+        
+        Args:
+            urgencia: Urgencia de la notificación (0=baja, 1=media, 2=alta)
+        
+        Returns:
+            bool: True si se encoló, False si era un duplicado o la cola estaba llena
+        """
+        with self._lock:
+            ahora = self.reloj.monotonico()
+            if (self._ultimo is not None and self._ultimo[0] == urgencia
+                    and ahora - self._ultimo[1] < self.ventana_duplicados):
+                self.duplicados += 1
+                return False
+            try:
+                self._cola.put_nowait(urgencia)
+            except queue.Full:
+                self.descartados += 1
+                return False
+            self._ultimo = (urgencia, ahora)
+            if self._hilo is None:
+                self._hilo = threading.Thread(target=self._ejecutar, name="ReproductorAudio", daemon=True)
+                self._hilo.start()
+        return True
+    
+    def esperar(self) -> None:
+        """Espera a que suenen todos los sonidos encolados."""
+        self._cola.join()
+    
+    def detener(self, timeout: Optional[float] = None) -> None:
+        """
+        Detiene el hilo de audio después de los sonidos pendientes.
+        
+        Args:
+            timeout: Segundos máximos para esperar que termine
+        """
+        with self._lock:
+            hilo, self._hilo = self._hilo, None
+        if hilo is not None:
+            self._cola.put(None)
+            hilo.join(timeout)
+    
+    def _ejecutar(self) -> None:
+        """Bucle del hilo: reproduce cada sonido encolado."""
+        if self.backend is None:
+            self.backend = crear_backend()
+        while True:
+            urgencia = self._cola.get()
+            try:
+                if urgencia is None:
+                    return
+                self.backend.reproducir(urgencia)
+                self.reproducidos += 1
+            except Exception as e:
+                print(f"⚠️ Audio no disponible: {e}")
+            finally:
+                self._cola.task_done()
+
+
+_compartido: Optional[ReproductorAudio] = None
+_lock_compartido = threading.Lock()
+
+
+def reproductor_compartido() -> ReproductorAudio:
+    """Reproductor de audio de la aplicación (se crea la primera vez)."""
+    global _compartido
+    with _lock_compartido:
+        if _compartido is None:
+            _compartido = ReproductorAudio()
+        return _compartido
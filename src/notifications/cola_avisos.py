@@ -0,0 +1,137 @@
+"""
+Cola_Avisos.py - Entrega agrupada y con límite de frecuencia de los avisos
+
+Este módulo se encarga de:
+- Juntar los avisos que vencen en el mismo momento en una sola entrega
+- Limitar la frecuencia de las entregas con un token bucket (LimiteTasa)
+- Retener los avisos mientras no hay tokens y entregarlos juntos después,
+  en lugar de descartarlos
+
+Autor: Mariano Capella, Gabriel Osemberg
+"""
+
+import threading
+import time
+from typing import Any, Callable, List, Optional
+
+
+class LimiteTasa:
+    """
+    Token bucket: ráfagas de hasta `capacidad` entregas y después una cada `intervalo` segundos.
+    """
+    
+    def __init__(self, capacidad: int = 3, intervalo: float = 30.0,
+                 ahora: Callable[[], float] = time.monotonic):
+        """
+        Inicializa el límite con el bucket lleno.
+        
+        Args:
+            capacidad: Entregas seguidas permitidas
+            intervalo: Segundos para recuperar un token
+            ahora: Reloj en segundos
+        """
+        self.capacidad = capacidad
+        self.intervalo = intervalo
+        self._ahora = ahora
+        self._tokens = float(capacidad)
+        self._ultima_recarga = ahora()
+    
+    def _recargar(self) -> None:
+        """Suma los tokens recuperados desde la última recarga."""
+        ahora = self._ahora()
+        transcurrido = max(ahora - self._ultima_recarga, 0.0)
+        self._tokens = min(self.capacidad, self._tokens + transcurrido / self.intervalo)
+        self._ultima_recarga = ahora
+    
+    @property
+    def tokens(self) -> float:
+        """Tokens disponibles en este momento."""
+        self._recargar()
+        return self._tokens
+    
+    def consumir(self) -> bool:
+        """
+        Toma un token si hay.
+        
+        Returns:
+            bool: True si la entrega está permitida
+        """
+        self._recargar()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+    
+    def segundos_para_siguiente(self) -> float:
+        """Segundos hasta que haya un token disponible (0 si ya hay)."""
+        self._recargar()
+        return max(1 - self._tokens, 0.0) * self.intervalo
+    
+    def llenar(self) -> None:
+        """Vuelve a llenar el bucket (ej: cuando el usuario pide ver los avisos retenidos)."""
+        self._tokens = float(self.capacidad)
+        self._ultima_recarga = self._ahora()
+
+
+class ColaAvisos:
+    """
+    Cola de avisos que se entregan en grupo.
+    
+    Cada llamada a agregar es un "tick": lo que llega junto se entrega junto,
+    sumado a lo que estuviera retenido. Si el límite no tiene tokens los
+    avisos quedan en la cola y quien la usa debe llamar a vaciar cuando
+    pasen los segundos indicados.
+    """
+    
+    def __init__(self, entregar: Callable[[List[Any]], None], limite: LimiteTasa):
+        """
+        Inicializa la cola.
+        
+        Args:
+            entregar: Recibe cada grupo de avisos
+            limite: Límite de frecuencia de las entregas
+        """
+        self._entregar = entregar
+        self.limite = limite
+        self._pendientes: List[Any] = []
+        self._lock = threading.Lock()
+        self.entregas = 0
+        self.retenidas = 0
+    
+    @property
+    def pendientes(self) -> int:
+        """Cantidad de avisos retenidos."""
+        with self._lock:
+            return len(self._pendientes)
+    
+    def agregar(self, avisos: List[Any]) -> Optional[float]:
+        """
+        Encola los avisos de un tick y entrega todo lo pendiente si el límite lo permite.
+        
+        Args:
+            avisos: Avisos que vencieron juntos
+        
+        Returns:
+            Optional[float]: Segundos hasta poder entregar lo retenido, o None si no quedó nada
+        """
+        with self._lock:
+            self._pendientes.extend(avisos)
+        return self.vaciar()
+    
+    def vaciar(self) -> Optional[float]:
+        """
+        Entrega todo lo pendiente en un solo grupo si hay un token.
+        
+        Returns:
+            Optional[float]: Segundos hasta poder entregar lo retenido, o None si no quedó nada
+        """
+        with self._lock:
+            if not self._pendientes:
+                return None
+            if not self.limite.consumir():
+                self.retenidas += 1
+                return self.limite.segundos_para_siguiente()
+            grupo, self._pendientes = self._pendientes, []
+            self.entregas += 1
+        self._entregar(grupo)
+        return None
@@ -1,105 +1,219 @@
 """
 Notificacion_Timer.py - Timer optimizado para verificar eventos sin sobrecargar el sistema
 
-Este módulo se ejecuta en segundo plano y verifica eventos de forma inteligente,
-evitando sobrecargas durante eventos activos.
+Este módulo se ejecuta en segundo plano y avisa cada evento con hora en el
+minuto en que comienza, además de recordarlo con las antelaciones de
+NotificacionesManager (horas_recordatorio o las propias del evento). No
+revisa los eventos periódicamente: los avisos se programan en un
+PlanificadorAvisos, que duerme hasta el siguiente y se reprograma con cada
+alta, baja o modificación.
+
+Solo se programan los avisos de una ventana (por defecto, el próximo día):
+al vencer la ventana se programa la siguiente con una consulta por rango,
+así el costo no depende de cuántos eventos futuros haya.
+
+Los avisos que vencen juntos se muestran en una sola notificación con un
+solo sonido. Un token bucket limita la frecuencia: lo que llega sin tokens
+queda en una cola y sale agrupado más tarde, nunca se descarta.
 
 Autor: Mariano Capella, Gabriel Osemberg
 """
 
 import threading
-import time
 import datetime
-from typing import Callable, Optional, Set
-from src.notifications.notificaciones import NotificacionesManager
+from typing import Callable, List, Optional, Set, Tuple
+from src.core.eventos import Evento
+from src.notifications.notificaciones import Notificacion, NotificacionesManager
+from src.notifications.planificador import Aviso, PlanificadorAvisos
+from src.notifications.cola_avisos import ColaAvisos, LimiteTasa
+from src.utils.reloj import Reloj
 
 
 class NotificacionTimer:
     """Timer optimizado que verifica eventos sin sobrecargar el sistema."""
     
-    def __init__(self, notificaciones_manager: NotificacionesManager, main_window=None):
+    # Clave del aviso que programa la ventana siguiente
+    CLAVE_VENTANA = "__ventana__"
+    # Clave del aviso que vuelve a intentar entregar los avisos retenidos
+    CLAVE_COLA = "__cola__"
+    
+    def __init__(self, notificaciones_manager: NotificacionesManager, main_window=None,
+                 reloj: Optional[Reloj] = None,
+                 espera_maxima: Optional[float] = PlanificadorAvisos.ESPERA_MAXIMA):
         """
         Inicializa el timer.
         
         Args:
             notificaciones_manager: Gestor de notificaciones
             main_window: Ventana principal para threading seguro
+            reloj: Reloj de los avisos (por defecto, el del gestor de notificaciones)
+            espera_maxima: Segundos que el planificador duerme como máximo de
+                una vez (ver PlanificadorAvisos; None = sin tope)
         """
         self.notificaciones_manager = notificaciones_manager
         self.main_window = main_window
+        self.reloj = reloj or notificaciones_manager.reloj
         self.running = False
-        self.thread: Optional[threading.Thread] = None
-        self.interval = 60  # Verificar cada 60 segundos
+        # Un evento que comenzó hace menos de esto todavía se avisa al iniciar
+        self.tolerancia = datetime.timedelta(seconds=120)
+        # Se programan los avisos de [ahora, ahora + ventana); al vencer, la siguiente
+        self.ventana = datetime.timedelta(days=1)
+        self._fin_ventana: Optional[datetime.datetime] = None
+        # Serializa la programación entre la interfaz (observadores) y el planificador
+        self._lock_programacion = threading.RLock()
+        self.planificador = PlanificadorAvisos(self._avisos_vencidos, reloj=self.reloj,
+                                               espera_maxima=espera_maxima)
         self.eventos_avisados_hoy: Set[str] = set()  # Eventos del día actual ya avisados
         
         # Protecciones contra sobrecarga
         self.evento_activo = False  # Flag para pausar durante eventos
         self.ultima_notificacion = 0  # Timestamp de última notificación
-        self.min_intervalo_notificacion = 30  # Mínimo 30 segundos entre notificaciones
-        self.pausado_hasta = 0  # Timestamp hasta cuando pausar
+        # Ráfagas de hasta 3 notificaciones y después una cada 30 segundos
+        self.limite = LimiteTasa(capacidad=3, intervalo=30.0, ahora=self.reloj.monotonico)
+        self.cola = ColaAvisos(self._entregar_grupo, self.limite)
         
     def start(self) -> None:
         """Inicia el timer en segundo plano."""
         if not self.running:
             self.running = True
-            self.thread = threading.Thread(target=self._run, daemon=True)
-            self.thread.start()
-            print("🔔 Timer de notificaciones iniciado (versión optimizada)")
+            self.notificaciones_manager.eventos_manager.agregar_observador(self._eventos_cambiados)
+            self.notificaciones_manager.set_callback_recordatorios_cambiados(self._recordatorios_cambiados)
+            self._programar_todos()
+            self.planificador.iniciar()
+            print(f"🔔 Timer de notificaciones iniciado ({self.avisos_programados()} avisos programados)")
     
     def stop(self) -> None:
         """Detiene el timer."""
         self.running = False
-        if self.thread:
-            self.thread.join()
+        self.notificaciones_manager.eventos_manager.quitar_observador(self._eventos_cambiados)
+        self.notificaciones_manager.set_callback_recordatorios_cambiados(None)
+        self.planificador.detener()
         print("⏹️ Timer de notificaciones detenido")
     
-    def _run(self) -> None:
-        """Bucle principal del timer optimizado."""
-        while self.running:
-            try:
-                # Verificar si estamos pausados
-                if time.time() < self.pausado_hasta:
-                    print(f"⏸️ Timer pausado hasta {datetime.datetime.fromtimestamp(self.pausado_hasta).strftime('%H:%M:%S')}")
-                    time.sleep(30)  # Dormir menos cuando estamos pausados
-                    continue
-                
-                # Verificar eventos de forma optimizada
-                self._verificar_eventos_optimizado()
-                
-                # Dormir el intervalo completo
-                time.sleep(self.interval)
-                
-            except Exception as e:
-                print(f"❌ Error en timer de notificaciones: {e}")
-                time.sleep(self.interval)
+    def avisos_programados(self) -> int:
+        """Cantidad de recordatorios y avisos de inicio pendientes en la ventana actual."""
+        return max(len(self.planificador) - 1, 0) if self.running else 0
     
-    def _verificar_eventos_optimizado(self) -> None:
-        """Verifica eventos de forma optimizada para evitar sobrecargas."""
-        ahora = datetime.datetime.now()
-        
-        # Limpiar eventos avisados si cambió el día
+    def _avisos_evento(self, evento: Evento, desde: datetime.datetime,
+                       tolerancia: datetime.timedelta = datetime.timedelta(0)) -> List[Tuple[datetime.datetime, Tuple[Evento, float]]]:
+        """Avisos (instante, (evento, horas de antelación)) de un evento dentro de la ventana actual."""
+        return [
+            (instante, (evento, horas))
+            for instante, horas in self.notificaciones_manager.instantes_aviso(evento, desde, tolerancia)
+            if instante < self._fin_ventana
+        ]
+    
+    def _programar_todos(self) -> None:
+        """Programa desde ahora (incluido el inicio de los eventos que recién comenzaron)."""
+        with self._lock_programacion:
+            self._programar_ventana(self.reloj.ahora(), self.tolerancia)
+    
+    def _programar_ventana(self, desde: datetime.datetime, tolerancia: datetime.timedelta) -> None:
+        """Reemplaza lo programado por los avisos de [desde, desde + ventana)."""
+        self._fin_ventana = desde + self.ventana
+        # Un aviso cae en la ventana si el evento empieza antes del fin más la mayor antelación
+        eventos = self.notificaciones_manager.eventos_manager.obtener_eventos_rango(
+            desde - tolerancia, self._fin_ventana + self.notificaciones_manager.antelacion_maxima()
+        )
+        avisos = [
+            (evento.id, instante, dato)
+            for evento in eventos
+            for instante, dato in self._avisos_evento(evento, desde, tolerancia)
+        ]
+        avisos.append((self.CLAVE_VENTANA, self._fin_ventana, None))
+        self.planificador.reemplazar_todo(avisos)
+        if self.cola.pendientes:
+            # El reemplazo descartó el reintento de la cola
+            self._encolar([])
+    
+    def _eventos_cambiados(self, operacion: str, eventos: List[Evento]) -> None:
+        """Observador de EventosManager: reprograma solo los eventos afectados."""
+        if operacion == 'recarga':
+            self._programar_todos()
+            return
+        with self._lock_programacion:
+            desde = self.reloj.ahora()
+            for evento in eventos:
+                if operacion == 'baja':
+                    self.planificador.cancelar(evento.id)
+                else:
+                    self.planificador.programar(evento.id, self._avisos_evento(evento, desde, self.tolerancia))
+    
+    def _recordatorios_cambiados(self, evento_id: str) -> None:
+        """Reprograma un evento cuyas antelaciones cambiaron."""
+        evento = self.notificaciones_manager.eventos_manager.buscar_evento_por_id(evento_id)
+        with self._lock_programacion:
+            if evento is None:
+                self.planificador.cancelar(evento_id)
+            else:
+                self.planificador.programar(evento_id, self._avisos_evento(evento, self.reloj.ahora(),
+                                                                         self.tolerancia))
+    
+    def _avisos_vencidos(self, avisos: List[Aviso]) -> None:
+        """Recibe del planificador los recordatorios y los eventos que acaban de comenzar."""
+        ahora = self.reloj.ahora()
+        self._limpiar_si_cambio_el_dia(ahora)
+        grupo = []
+        for aviso in avisos:
+            if aviso.clave == self.CLAVE_VENTANA:
+                # Ventana siguiente: los avisos que vencieron mientras tanto salen con atraso
+                with self._lock_programacion:
+                    self._programar_ventana(aviso.instante, datetime.timedelta(0))
+                continue
+            if aviso.clave == self.CLAVE_COLA:
+                continue  # Solo despierta para reintentar la entrega
+            evento, horas = aviso.dato
+            retraso = (ahora - aviso.instante).total_seconds()
+            if horas:
+                print(f"⏰ Recordatorio: {evento.titulo} comienza en {horas:g} hora(s)")
+            else:
+                print(f"🚨 ¡EVENTO ACTUAL! {evento.titulo} (aviso con {retraso:.3f}s de retraso)")
+            grupo.append(aviso.dato)
+        self._encolar(grupo)
+    
+    def _encolar(self, grupo: List[Tuple[Evento, float]]) -> None:
+        """Entrega un grupo de avisos junto con los retenidos, o programa el reintento."""
+        espera = self.cola.agregar(grupo)
+        if espera is not None:
+            print(f"⏳ {self.cola.pendientes} aviso(s) retenidos {espera:.0f}s por el límite de frecuencia")
+            self.planificador.programar(
+                self.CLAVE_COLA, [(self.reloj.ahora() + datetime.timedelta(seconds=espera), None)]
+            )
+    
+    def _entregar_grupo(self, grupo: List[Tuple[Evento, float]]) -> None:
+        """Muestra en una sola notificación los avisos que salen juntos."""
+        for evento, horas in grupo:
+            if not horas:
+                self.eventos_avisados_hoy.add(evento.id)
+        self.ultima_notificacion = self.reloj.ahora().timestamp()
+        notificacion = self.notificaciones_manager.generar_notificacion_avisos(grupo)
+        self._en_hilo_principal(lambda: self._procesar_notificacion(notificacion))
+    
+    def _limpiar_si_cambio_el_dia(self, ahora: datetime.datetime) -> None:
+        """Vacía los eventos avisados cuando empieza un nuevo día."""
         hoy_str = ahora.date().strftime("%Y-%m-%d")
         if not hasattr(self, '_ultimo_dia') or self._ultimo_dia != hoy_str:
             self.eventos_avisados_hoy.clear()
             self._ultimo_dia = hoy_str
             print("🧹 Nuevo día - limpiando eventos avisados")
+    
+    def _verificar_eventos_optimizado(self) -> None:
+        """Verifica eventos de forma optimizada para evitar sobrecargas."""
+        ahora = self.reloj.ahora()
         
-        # Verificar protección contra spam
-        if time.time() - self.ultima_notificacion < self.min_intervalo_notificacion:
-            print(f"⏳ Esperando {self.min_intervalo_notificacion}s entre notificaciones")
-            return
+        # Limpiar eventos avisados si cambió el día
+        self._limpiar_si_cambio_el_dia(ahora)
         
         print(f"🔍 Verificando eventos a las {ahora.strftime('%H:%M:%S')}")
         
         # Obtener solo eventos de hoy con hora
-        eventos_hoy = []
-        for evento in self.notificaciones_manager.eventos_manager.eventos:
-            try:
-                fecha_evento = evento.get_fecha_objeto()
-                if fecha_evento == ahora.date() and evento.hora:
-                    eventos_hoy.append(evento)
-            except Exception:
-                continue
+        hoy = ahora.date()
+        eventos_hoy = [
+            evento for evento in self.notificaciones_manager.eventos_manager.obtener_eventos_rango(
+                hoy, hoy + datetime.timedelta(days=1)
+            )
+            if evento.hora
+        ]
         
         if not eventos_hoy:
             print("   📭 No hay eventos con hora para hoy")
@@ -107,81 +221,57 @@ class NotificacionTimer:
         
         print(f"   📋 Verificando {len(eventos_hoy)} eventos de hoy")
         
-        # Verificar cada evento
-        for evento in eventos_hoy:
-            if self._verificar_evento_individual(evento, ahora):
-                # Si encontramos un evento activo, pausar por un tiempo
-                self._pausar_timer(5)  # Pausar 5 minutos
-                break
+        # Todos los eventos actuales salen juntos
+        actuales = [evento for evento in eventos_hoy if self._es_evento_actual(evento, ahora)]
+        if actuales:
+            print(f"🚨 {len(actuales)} evento(s) actuales")
+            self._encolar([(evento, 0) for evento in actuales])
     
-    def _verificar_evento_individual(self, evento, ahora) -> bool:
+    def _es_evento_actual(self, evento: Evento, ahora: datetime.datetime) -> bool:
         """
         Verifica un evento individual.
         
         Returns:
-            bool: True si se activó una notificación
+            bool: True si está ocurriendo ahora (±2 minutos) y todavía no se avisó hoy
         """
         try:
             # Verificar si ya fue avisado hoy
             if evento.id in self.eventos_avisados_hoy:
                 return False
             
-            hora_evento = evento.get_hora_objeto()
-            if not hora_evento:
+            datetime_evento = evento.get_datetime_completo()
+            if not datetime_evento:
                 return False
-                
-            fecha_evento = evento.get_fecha_objeto()
-            datetime_evento = datetime.datetime.combine(fecha_evento, hora_evento)
-            diferencia_segundos = (datetime_evento - ahora).total_seconds()
             
             # Solo eventos que están ocurriendo AHORA (±2 minutos)
-            if abs(diferencia_segundos) <= 120:  # 2 minutos de tolerancia
-                print(f"🚨 ¡EVENTO ACTUAL! {evento.titulo}")
-                self._enviar_notificacion_segura(evento)
-                self.eventos_avisados_hoy.add(evento.id)
-                self.ultima_notificacion = time.time()
-                return True
-                
+            return abs((datetime_evento - ahora).total_seconds()) <= 120
         except Exception as e:
             print(f"❌ Error verificando evento '{evento.titulo}': {e}")
         
         return False
     
-    def _pausar_timer(self, minutos: int) -> None:
-        """Pausa el timer por un número específico de minutos."""
-        self.pausado_hasta = time.time() + (minutos * 60)
-        print(f"⏸️ Timer pausado por {minutos} minutos para evitar spam")
-    
-    def _enviar_notificacion_segura(self, evento) -> None:
-        """Envía una notificación de forma segura y no bloqueante."""
+    def _en_hilo_principal(self, funcion: Callable[[], None]) -> None:
+        """Ejecuta una función en el hilo de la ventana principal (o directamente si no hay)."""
         if self.main_window:
             # Programar en el hilo principal
-            self.main_window.after(0, lambda: self._procesar_notificacion(evento))
+            self.main_window.after(0, funcion)
         else:
             # Procesar directamente si no hay ventana principal
-            self._procesar_notificacion(evento)
+            funcion()
     
-    def _procesar_notificacion(self, evento) -> None:
+    def _enviar_notificacion_segura(self, evento) -> None:
+        """Envía una notificación de forma segura y no bloqueante."""
+        notificacion = self.notificaciones_manager.generar_aviso_inicio(evento)
+        self._en_hilo_principal(lambda: self._procesar_notificacion(notificacion))
+    
+    def _procesar_notificacion(self, notificacion: Notificacion) -> None:
         """Procesa la notificación en el hilo principal."""
         try:
-            from src.notifications.notificaciones import Notificacion
-            
-            print(f"🚨 Enviando notificación para: {evento.titulo}")
+            print(f"🚨 Enviando notificación: {notificacion.titulo}")
             
-            notificacion = Notificacion(
-                tipo='recordatorio',
-                titulo='🚨 ¡EVENTO AHORA!',
-                mensaje=f"'{evento.titulo}' está comenzando ahora\n🕒 {evento.hora}",
-                evento=evento,
-                urgencia=2  # Máxima urgencia
-            )
-            
-            # Mostrar notificación
+            # Mostrar notificación (el sonido se encola en el hilo de audio)
             self.notificaciones_manager.mostrar_notificacion(notificacion)
             
-            # Reproducir sonido de forma no bloqueante
-            threading.Thread(target=notificacion.reproducir_sonido, daemon=True).start()
-            
         except Exception as e:
             print(f"❌ Error procesando notificación: {e}")
     
@@ -189,13 +279,14 @@ class NotificacionTimer:
         """Fuerza una verificación manual de eventos."""
         print("🔍 Verificación manual de eventos solicitada")
         # Resetear protecciones para verificación manual
-        self.pausado_hasta = 0
-        self.ultima_notificacion = 0
+        self.limite.llenar()
+        self.planificador.procesar_vencidos()
         self._verificar_eventos_optimizado()
     
     def reanudar_timer(self) -> None:
-        """Reanuda el timer si estaba pausado."""
-        self.pausado_hasta = 0
+        """Entrega ya los avisos retenidos por el límite de frecuencia."""
+        self.limite.llenar()
+        self._encolar([])
         print("▶️ Timer reanudado manualmente")
     
     def limpiar_notificaciones_del_dia(self) -> None:
@@ -205,14 +296,18 @@ class NotificacionTimer:
     
     def get_estadisticas(self) -> dict:
         """Obtiene estadísticas del timer."""
-        ahora = time.time()
+        proximo = self.planificador.proximo()
+        en_cola = self.cola.pendientes
         return {
             'running': self.running,
-            'interval_segundos': self.interval,
+            'avisos_programados': self.avisos_programados(),
+            'proximo_aviso': proximo.strftime('%Y-%m-%d %H:%M') if proximo else 'Ninguno',
+            'despertares': self.planificador.despertares,
             'eventos_avisados_hoy': len(self.eventos_avisados_hoy),
-            'total_eventos': len(self.notificaciones_manager.eventos_manager.eventos),
-            'pausado': ahora < self.pausado_hasta,
-            'segundos_hasta_reanudar': max(0, int(self.pausado_hasta - ahora)),
+            'total_eventos': self.notificaciones_manager.eventos_manager.contar_eventos(),
+            'avisos_en_cola': en_cola,
+            'segundos_hasta_entrega': int(self.limite.segundos_para_siguiente()) if en_cola else 0,
+            'notificaciones_agrupadas': self.cola.entregas,
             'ultima_notificacion': datetime.datetime.fromtimestamp(self.ultima_notificacion).strftime('%H:%M:%S') if self.ultima_notificacion else 'Nunca'
         }
     
@@ -223,16 +318,12 @@ class NotificacionTimer:
             
             # Crear evento ficticio para prueba
             class EventoPrueba:
-                def __init__(self):
+                def __init__(self, hora: str):
                     self.id = "test_notification"
                     self.titulo = "🧪 Prueba de Notificación"
-                    self.hora = datetime.datetime.now().strftime("%H:%M")
-            
-            evento_prueba = EventoPrueba()
+                    self.hora = hora
             
-            # Resetear protecciones para la prueba
-            self.ultima_notificacion = 0
-            self.pausado_hasta = 0
+            evento_prueba = EventoPrueba(self.reloj.ahora().strftime("%H:%M"))
             
             self._enviar_notificacion_segura(evento_prueba)
             print("✅ Notificación de prueba enviada")
@@ -245,11 +336,12 @@ class NotificacionTimer:
         stats = self.get_estadisticas()
         print("\n📊 === ESTADÍSTICAS DEL TIMER OPTIMIZADO ===")
         print(f"🔄 Estado: {'🟢 Ejecutándose' if stats['running'] else '🔴 Detenido'}")
-        print(f"⏱️ Intervalo: {stats['interval_segundos']} segundos")
-        print(f"⏸️ Pausado: {'🟡 Sí' if stats['pausado'] else '🟢 No'}")
+        print(f"⏱️ Avisos programados: {stats['avisos_programados']} (próximo: {stats['proximo_aviso']})")
+        print(f"💤 Despertares del planificador: {stats['despertares']}")
+        print(f"📬 Avisos retenidos: {stats['avisos_en_cola']}")
         
-        if stats['pausado']:
-            print(f"⏳ Reanudar en: {stats['segundos_hasta_reanudar']} segundos")
+        if stats['avisos_en_cola']:
+            print(f"⏳ Se entregan en: {stats['segundos_hasta_entrega']} segundos")
             
         print(f"🚨 Eventos avisados hoy: {stats['eventos_avisados_hoy']}")
         print(f"📋 Total eventos: {stats['total_eventos']}")
@@ -12,12 +12,19 @@ Autor: Mariano Capella, Gabriel Osemberg
 """
 
 import datetime
-import winsound
-import sys
-from typing import List, Tuple, Optional, Callable
+import json
+import os
+from typing import Dict, List, Tuple, Optional, Callable
 from dataclasses import dataclass
 from src.core.eventos import Evento, EventosManager
-from src.utils.helpers import formatear_fecha_completa
+from src.core.escritura_atomica import escritura_atomica
+from src.utils.helpers import formatear_fecha_completa, parsear_fecha, parsear_hora
+from src.utils.reloj import Reloj
+from src.notifications.audio import ReproductorAudio, reproductor_compartido
+
+
+# Reloj de las notificaciones creadas sin fecha (las del manager pasan la de su reloj)
+RELOJ_POR_DEFECTO = Reloj()
 
 
 @dataclass
@@ -34,7 +41,7 @@ class Notificacion:
     
     def __post_init__(self):
         if self.fecha_notificacion is None:
-            self.fecha_notificacion = datetime.datetime.now()
+            self.fecha_notificacion = RELOJ_POR_DEFECTO.ahora()
     
     def get_icono(self) -> str:
         """Obtiene el icono según el tipo de notificación."""
@@ -58,22 +65,8 @@ class Notificacion:
         return colores.get(self.urgencia, 'info')
     
     def reproducir_sonido(self) -> None:
-        """Reproduce sonido de forma no bloqueante según el tipo y urgencia."""
-        try:
-            if sys.platform == "win32":
-                if self.urgencia >= 2:  # Alta urgencia
-                    winsound.MessageBeep(winsound.MB_ICONEXCLAMATION)
-                    # Solo un beep corto para evitar bloqueos
-                    winsound.Beep(800, 200)  # Beep más corto
-                elif self.urgencia >= 1:  # Media urgencia
-                    winsound.MessageBeep(winsound.MB_ICONASTERISK)
-                else:  # Baja urgencia
-                    winsound.MessageBeep(winsound.MB_OK)
-            else:
-                # Para otros sistemas, usar beep del sistema
-                print('\a')  # ASCII bell
-        except Exception as e:
-            print(f"⚠️ Audio no disponible: {e}")  # Menos verbose
+        """Encola el sonido de la urgencia en el reproductor de audio compartido (no bloquea)."""
+        reproductor_compartido().reproducir(self.urgencia)
 
 
 class ValidadorEventos:
@@ -81,14 +74,16 @@ class ValidadorEventos:
     Clase para validar eventos y detectar conflictos.
     """
     
-    def __init__(self, eventos_manager: EventosManager):
+    def __init__(self, eventos_manager: EventosManager, reloj: Optional[Reloj] = None):
         """
         Inicializa el validador.
         
         Args:
             eventos_manager: Gestor de eventos
+            reloj: Reloj para "hoy" y "ahora" (por defecto, el del sistema)
         """
         self.eventos_manager = eventos_manager
+        self.reloj = reloj or Reloj()
     
     def validar_conflicto_horario(self, evento_nuevo: dict, excluir_id: str = None) -> Tuple[bool, List[Evento]]:
         """
@@ -109,8 +104,8 @@ class ValidadorEventos:
         hora_str = evento_nuevo['hora']
         
         try:
-            fecha_evento = datetime.datetime.strptime(fecha_str, "%Y-%m-%d").date()
-            hora_evento = datetime.datetime.strptime(hora_str, "%H:%M").time()
+            fecha_evento = parsear_fecha(fecha_str)
+            hora_evento = parsear_hora(hora_str)
         except ValueError:
             return False, []
         
@@ -126,7 +121,7 @@ class ValidadorEventos:
             # Solo verificar eventos con hora
             if evento.hora:
                 try:
-                    hora_existente = datetime.datetime.strptime(evento.hora, "%H:%M").time()
+                    hora_existente = evento.get_hora_objeto()
                     if hora_existente == hora_evento:
                         eventos_conflicto.append(evento)
                 except ValueError:
@@ -146,14 +141,14 @@ class ValidadorEventos:
             bool: True si el evento es en el pasado
         """
         try:
-            fecha_evento = datetime.datetime.strptime(fecha_str, "%Y-%m-%d").date()
-            ahora = datetime.datetime.now()
+            fecha_evento = parsear_fecha(fecha_str)
+            ahora = self.reloj.ahora()
             
             if fecha_evento < ahora.date():
                 return True
             elif fecha_evento == ahora.date() and hora_str:
                 try:
-                    hora_evento = datetime.datetime.strptime(hora_str, "%H:%M").time()
+                    hora_evento = parsear_hora(hora_str)
                     datetime_evento = datetime.datetime.combine(fecha_evento, hora_evento)
                     return datetime_evento < ahora
                 except ValueError:
@@ -174,15 +169,15 @@ class ValidadorEventos:
             Tuple[bool, str]: (es_valida, mensaje_error)
         """
         try:
-            fecha = datetime.datetime.strptime(fecha_str, "%Y-%m-%d").date()
+            fecha = parsear_fecha(fecha_str)
             
             # Verificar que no sea demasiado lejana (10 años)
-            limite_futuro = datetime.date.today() + datetime.timedelta(days=3650)
+            limite_futuro = self.reloj.hoy() + datetime.timedelta(days=3650)
             if fecha > limite_futuro:
                 return False, "La fecha no puede ser más de 10 años en el futuro"
             
             # Verificar que no sea demasiado antigua (100 años)
-            limite_pasado = datetime.date.today() - datetime.timedelta(days=36500)
+            limite_pasado = self.reloj.hoy() - datetime.timedelta(days=36500)
             if fecha < limite_pasado:
                 return False, "La fecha no puede ser más de 100 años en el pasado"
             
@@ -197,16 +192,18 @@ class ValidadorEventos:
         Returns:
             dict: Estadísticas de validación
         """
-        total_eventos = len(self.eventos_manager.eventos)
+        # Incluye el archivo histórico, como obtener_estadisticas
+        eventos = self.eventos_manager.obtener_todos_los_eventos()
+        total_eventos = len(eventos)
         eventos_pasados = 0
         eventos_futuros = 0
         eventos_hoy = 0
         eventos_con_hora = 0
         eventos_conflictos = 0
         
-        hoy = datetime.date.today()
+        hoy = self.reloj.hoy()
         
-        for evento in self.eventos_manager.eventos:
+        for evento in eventos:
             try:
                 fecha_evento = evento.get_fecha_objeto()
                 
@@ -223,7 +220,7 @@ class ValidadorEventos:
                 pass
         
         # Verificar conflictos existentes
-        for evento in self.eventos_manager.eventos:
+        for evento in eventos:
             if evento.hora:
                 evento_dict = {
                     'fecha': evento.fecha,
@@ -249,20 +246,32 @@ class NotificacionesManager:
     Clase principal para gestionar notificaciones.
     """
     
-    def __init__(self, eventos_manager: EventosManager):
+    def __init__(self, eventos_manager: EventosManager, reloj: Optional[Reloj] = None,
+                 audio: Optional[ReproductorAudio] = None):
         """
         Inicializa el gestor de notificaciones.
         
         Args:
             eventos_manager: Gestor de eventos
+            reloj: Reloj de las verificaciones y notificaciones (por defecto, el del sistema)
+            audio: Reproductor de los sonidos (por defecto, el compartido de la aplicación)
         """
         self.eventos_manager = eventos_manager
-        self.validador = ValidadorEventos(eventos_manager)
+        self.reloj = reloj or Reloj()
+        self.audio = audio or reproductor_compartido()
+        self.validador = ValidadorEventos(eventos_manager, self.reloj)
         self.notificaciones = []
         self.callback_mostrar_notificacion = None
+        self.callback_recordatorios_cambiados = None
         
         # Configuración de recordatorios
         self.horas_recordatorio = [24, 1]  # 24 horas y 1 hora antes
+        # Antelaciones propias de algunos eventos: ID -> horas (reemplazan a horas_recordatorio)
+        self.archivo_recordatorios = os.path.splitext(eventos_manager.archivo_datos)[0] + ".recordatorios.json"
+        self.recordatorios_por_evento: Dict[str, List[float]] = self._cargar_recordatorios()
+        # Horas -> pares (horas, timedelta) ordenados; hay muy pocas combinaciones distintas
+        self._antelaciones: Dict[Tuple[float, ...], Tuple[Tuple[float, datetime.timedelta], ...]] = {}
+        eventos_manager.agregar_observador(self._eventos_cambiados)
     
     def set_callback_mostrar_notificacion(self, callback: Callable) -> None:
         """
@@ -273,6 +282,232 @@ class NotificacionesManager:
         """
         self.callback_mostrar_notificacion = callback
     
+    def set_callback_recordatorios_cambiados(self, callback: Optional[Callable[[str], None]]) -> None:
+        """
+        Establece el callback que recibe el ID de un evento cuyas antelaciones cambiaron.
+        
+        Args:
+            callback: Función para reprogramar los avisos del evento
+        """
+        self.callback_recordatorios_cambiados = callback
+    
+    def obtener_horas_recordatorio(self, evento_id: str) -> List[float]:
+        """
+        Obtiene las antelaciones (en horas) con que se recuerda un evento.
+        
+        Args:
+            evento_id: ID del evento
+            
+        Returns:
+            List[float]: Horas antes del inicio, de mayor a menor
+        """
+        return [horas for horas, _ in self._obtener_antelaciones(evento_id)]
+    
+    def _obtener_antelaciones(self, evento_id: str) -> Tuple[Tuple[float, datetime.timedelta], ...]:
+        """Antelaciones de un evento como pares (horas, timedelta), de mayor a menor."""
+        horas = tuple(self.recordatorios_por_evento.get(evento_id, self.horas_recordatorio))
+        antelaciones = self._antelaciones.get(horas)
+        if antelaciones is None:
+            antelaciones = tuple((h, datetime.timedelta(hours=h)) for h in sorted(set(horas), reverse=True))
+            self._antelaciones[horas] = antelaciones
+        return antelaciones
+    
+    def antelacion_maxima(self) -> datetime.timedelta:
+        """Mayor antelación configurada (general o de algún evento)."""
+        horas = max(self.horas_recordatorio, default=0)
+        for horas_evento in self.recordatorios_por_evento.values():
+            horas = max(horas, max(horas_evento, default=0))
+        return datetime.timedelta(hours=horas)
+    
+    def set_recordatorios_evento(self, evento_id: str, horas: Optional[List[float]]) -> Tuple[bool, str]:
+        """
+        Cambia las antelaciones de un evento.
+        
+        Args:
+            evento_id: ID del evento
+            horas: Horas antes del inicio ([] = sin recordatorios, None = las generales)
+            
+        Returns:
+            Tuple[bool, str]: (éxito, mensaje)
+        """
+        if horas is not None:
+            try:
+                horas = sorted({float(h) for h in horas}, reverse=True)
+            except (TypeError, ValueError):
+                return False, "Las antelaciones deben ser números de horas"
+            if any(h <= 0 for h in horas):
+                return False, "Las antelaciones deben ser mayores a 0 horas"
+        
+        anteriores = dict(self.recordatorios_por_evento)
+        if horas is None:
+            self.recordatorios_por_evento.pop(evento_id, None)
+        else:
+            self.recordatorios_por_evento[evento_id] = horas
+        if not self._guardar_recordatorios():
+            self.recordatorios_por_evento = anteriores
+            return False, "Error al guardar los recordatorios"
+        
+        if self.callback_recordatorios_cambiados:
+            self.callback_recordatorios_cambiados(evento_id)
+        return True, "✅ Recordatorios actualizados"
+    
+    def instantes_aviso(self, evento: Evento, desde: datetime.datetime,
+                        tolerancia: datetime.timedelta = datetime.timedelta(0)) -> List[Tuple[datetime.datetime, float]]:
+        """
+        Expande un evento con hora en sus avisos: un recordatorio por antelación y el inicio.
+        
+        Args:
+            evento: Evento a expandir
+            desde: Solo avisos a partir de este instante
+            tolerancia: El aviso de inicio (0 horas) se incluye si comenzó hace menos que esto
+            
+        Returns:
+            List[Tuple[datetime.datetime, float]]: Pares (instante, horas de antelación) en orden
+        """
+        if not evento.hora:
+            return []
+        inicio = evento.get_datetime_completo()
+        if inicio is None or inicio < desde - tolerancia:
+            return []
+        
+        avisos = []
+        for horas, antelacion in self._obtener_antelaciones(evento.id):
+            instante = inicio - antelacion
+            if instante >= desde:
+                avisos.append((instante, horas))
+        avisos.append((inicio, 0))
+        return avisos
+    
+    def generar_recordatorio(self, evento: Evento, horas_antes: float) -> Notificacion:
+        """
+        Genera el recordatorio de un evento que comienza en `horas_antes` horas.
+        
+        Args:
+            evento: Evento a recordar
+            horas_antes: Antelación del recordatorio
+            
+        Returns:
+            Notificacion: Recordatorio
+        """
+        return self._notificacion_evento_proximo(evento, datetime.timedelta(hours=horas_antes))
+    
+    def generar_aviso_inicio(self, evento: Evento) -> Notificacion:
+        """
+        Genera el aviso de un evento que está comenzando.
+        
+        Args:
+            evento: Evento que comienza
+            
+        Returns:
+            Notificacion: Aviso de máxima urgencia
+        """
+        return Notificacion(
+            tipo='recordatorio',
+            titulo='🚨 ¡EVENTO AHORA!',
+            mensaje=f"'{evento.titulo}' está comenzando ahora\n🕒 {evento.hora}",
+            evento=evento,
+            urgencia=2,  # Máxima urgencia
+            fecha_notificacion=self.reloj.ahora()
+        )
+    
+    def generar_notificacion_avisos(self, avisos: List[Tuple[Evento, float]]) -> Notificacion:
+        """
+        Genera una sola notificación para los avisos que vencieron juntos.
+        
+        Args:
+            avisos: Pares (evento, horas de antelación); 0 horas = el evento comienza
+            
+        Returns:
+            Notificacion: El aviso o recordatorio del evento si es uno solo, o un resumen de todos
+        """
+        if len(avisos) == 1:
+            evento, horas = avisos[0]
+            return self.generar_recordatorio(evento, horas) if horas else self.generar_aviso_inicio(evento)
+        
+        comenzando = sum(1 for _, horas in avisos if not horas)
+        if comenzando == len(avisos):
+            titulo = f"🚨 {len(avisos)} eventos comenzando ahora"
+        else:
+            titulo = f"🔔 {len(avisos)} avisos de eventos"
+        
+        lineas = []
+        for evento, horas in avisos:
+            if horas:
+                tiempo_texto = self._formatear_tiempo_restante(datetime.timedelta(hours=horas))
+                lineas.append(f"⏰ '{evento.titulo}' comienza en {tiempo_texto} ({evento.hora})")
+            else:
+                lineas.append(f"🚨 '{evento.titulo}' está comenzando ahora ({evento.hora})")
+        
+        return Notificacion(
+            tipo='recordatorio',
+            titulo=titulo,
+            mensaje="\n".join(lineas),
+            urgencia=max(self._urgencia_antelacion(horas * 3600) for _, horas in avisos),
+            fecha_notificacion=self.reloj.ahora()
+        )
+    
+    @staticmethod
+    def _urgencia_antelacion(segundos: float) -> int:
+        """Urgencia de un recordatorio según los segundos que faltan para el evento."""
+        if segundos <= 3600:  # 1 hora
+            return 2
+        elif segundos <= 86400:  # 24 horas
+            return 1
+        return 0
+    
+    def _notificacion_evento_proximo(self, evento: Evento, tiempo_restante: datetime.timedelta) -> Notificacion:
+        """Recordatorio de un evento con hora, con título y urgencia según el tiempo restante."""
+        urgencia = self._urgencia_antelacion(tiempo_restante.total_seconds())
+        titulo = {2: "🚨 Evento Muy Próximo", 1: "⏰ Recordatorio de Evento", 0: "📅 Evento Próximo"}[urgencia]
+        tiempo_texto = self._formatear_tiempo_restante(tiempo_restante)
+        
+        mensaje = f"'{evento.titulo}' comienza en {tiempo_texto}\n"
+        mensaje += f"📅 {formatear_fecha_completa(evento.get_fecha_objeto())}\n"
+        mensaje += f"🕒 {evento.hora}"
+        
+        if evento.descripcion:
+            mensaje += f"\n📝 {evento.descripcion[:100]}..."
+        
+        return Notificacion(
+            tipo='recordatorio',
+            titulo=titulo,
+            mensaje=mensaje,
+            evento=evento,
+            urgencia=urgencia,
+            fecha_notificacion=self.reloj.ahora()
+        )
+    
+    def _cargar_recordatorios(self) -> Dict[str, List[float]]:
+        """Lee las antelaciones propias de cada evento (vacío si no hay archivo)."""
+        if not os.path.exists(self.archivo_recordatorios):
+            return {}
+        try:
+            with open(self.archivo_recordatorios, 'r', encoding='utf-8') as f:
+                return {evento_id: [float(h) for h in horas] for evento_id, horas in json.load(f).items()}
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            print(f"⚠️ No se pudieron leer los recordatorios: {e}")
+            return {}
+    
+    def _guardar_recordatorios(self) -> bool:
+        """Escribe las antelaciones propias de cada evento."""
+        try:
+            with escritura_atomica(self.archivo_recordatorios, respaldo=False) as f:
+                json.dump(self.recordatorios_por_evento, f, ensure_ascii=False, indent=2)
+            return True
+        except OSError as e:
+            print(f"❌ Error al guardar los recordatorios: {e}")
+            return False
+    
+    def _eventos_cambiados(self, operacion: str, eventos: List[Evento]) -> None:
+        """Observador de EventosManager: olvida las antelaciones de los eventos eliminados."""
+        if operacion != 'baja':
+            return
+        eliminados = [evento.id for evento in eventos if evento.id in self.recordatorios_por_evento]
+        for evento_id in eliminados:
+            del self.recordatorios_por_evento[evento_id]
+        if eliminados:
+            self._guardar_recordatorios()
+    
     def verificar_eventos_proximos(self, horas_adelante: int = 24) -> List[Notificacion]:
         """
         Verifica eventos próximos y genera notificaciones.
@@ -284,50 +519,28 @@ class NotificacionesManager:
             List[Notificacion]: Lista de notificaciones generadas
         """
         notificaciones = []
-        ahora = datetime.datetime.now()
+        ahora = self.reloj.ahora()
         limite = ahora + datetime.timedelta(hours=horas_adelante)
         
-        for evento in self.eventos_manager.eventos:
+        # Solo los eventos entre hoy a las 00:00 (eventos de todo el día) y el
+        # límite inclusive; el minuto extra cubre eventos justo en el límite
+        inicio_hoy = datetime.datetime.combine(ahora.date(), datetime.time.min)
+        candidatos = self.eventos_manager.obtener_eventos_rango(
+            inicio_hoy, limite + datetime.timedelta(minutes=1)
+        )
+        
+        for evento in candidatos:
             try:
                 fecha_evento = evento.get_fecha_objeto()
                 
                 if evento.hora:
                     # Evento con hora específica
-                    hora_evento = evento.get_hora_objeto()
-                    if hora_evento:
-                        datetime_evento = datetime.datetime.combine(fecha_evento, hora_evento)
-                        
+                    datetime_evento = evento.get_datetime_completo()
+                    if datetime_evento:
                         if ahora <= datetime_evento <= limite:
-                            tiempo_restante = datetime_evento - ahora
-                            
-                            if tiempo_restante.total_seconds() <= 3600:  # 1 hora
-                                urgencia = 2
-                                titulo = "🚨 Evento Muy Próximo"
-                                tiempo_texto = self._formatear_tiempo_restante(tiempo_restante)
-                            elif tiempo_restante.total_seconds() <= 86400:  # 24 horas
-                                urgencia = 1
-                                titulo = "⏰ Recordatorio de Evento"
-                                tiempo_texto = self._formatear_tiempo_restante(tiempo_restante)
-                            else:
-                                urgencia = 0
-                                titulo = "📅 Evento Próximo"
-                                tiempo_texto = self._formatear_tiempo_restante(tiempo_restante)
-                            
-                            mensaje = f"'{evento.titulo}' comienza en {tiempo_texto}\n"
-                            mensaje += f"📅 {formatear_fecha_completa(fecha_evento)}\n"
-                            mensaje += f"🕒 {evento.hora}"
-                            
-                            if evento.descripcion:
-                                mensaje += f"\n📝 {evento.descripcion[:100]}..."
-                            
-                            notificacion = Notificacion(
-                                tipo='recordatorio',
-                                titulo=titulo,
-                                mensaje=mensaje,
-                                evento=evento,
-                                urgencia=urgencia
+                            notificaciones.append(
+                                self._notificacion_evento_proximo(evento, datetime_evento - ahora)
                             )
-                            notificaciones.append(notificacion)
                 else:
                     # Evento sin hora (todo el día)
                     if fecha_evento == ahora.date():
@@ -342,7 +555,8 @@ class NotificacionesManager:
                             titulo=titulo,
                             mensaje=mensaje,
                             evento=evento,
-                            urgencia=0
+                            urgencia=0,
+                            fecha_notificacion=self.reloj.ahora()
                         )
                         notificaciones.append(notificacion)
             except:
@@ -386,7 +600,8 @@ class NotificacionesManager:
             tipo='conflicto',
             titulo=titulo,
             mensaje=mensaje,
-            urgencia=2
+            urgencia=2,
+            fecha_notificacion=self.reloj.ahora()
         )
     
     def generar_notificacion_evento_pasado(self, evento: dict) -> Notificacion:
@@ -412,18 +627,21 @@ class NotificacionesManager:
             tipo='warning',
             titulo=titulo,
             mensaje=mensaje,
-            urgencia=1
+            urgencia=1,
+            fecha_notificacion=self.reloj.ahora()
         )
     
-    def mostrar_notificacion(self, notificacion: Notificacion) -> None:
+    def mostrar_notificacion(self, notificacion: Notificacion, sonido: bool = True) -> None:
         """
         Muestra una notificación al usuario.
         
         Args:
             notificacion: Notificación a mostrar
+            sonido: Reproducir el sonido de la urgencia
         """
-        # Reproducir sonido primero
-        notificacion.reproducir_sonido()
+        # Encolar el sonido primero (suena en el hilo de audio, sin bloquear)
+        if sonido:
+            self.audio.reproducir(notificacion.urgencia)
         
         print(f"\n{notificacion.get_icono()} {notificacion.titulo}")
         print(f"   {notificacion.mensaje}")
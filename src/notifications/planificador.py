@@ -0,0 +1,270 @@
+"""
+Planificador.py - Planificador de avisos por vencimiento
+
+Este módulo se encarga de:
+- Mantener los próximos instantes de aviso en un heap (el más cercano primero)
+- Dormir un hilo exactamente hasta el próximo vencimiento (threading.Condition)
+- Despertarlo antes si un cambio adelanta el primer aviso
+- Reprogramar o cancelar los avisos de una clave (ej: un evento) sin recorrer el heap
+
+Autor: Mariano Capella, Gabriel Osemberg
+"""
+
+import datetime
+import heapq
+import itertools
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from src.utils.reloj import Reloj
+
+
+@dataclass(frozen=True)
+class Aviso:
+    """Un aviso vencido: cuándo debía salir, de qué clave y el dato programado."""
+    instante: datetime.datetime
+    clave: str
+    dato: Any = None
+
+
+class PlanificadorAvisos:
+    """
+    Hilo que entrega cada aviso en el instante programado.
+    
+    Los avisos se guardan en un heap de tuplas (instante, secuencia, clave,
+    generación, dato). Reprogramar o cancelar una clave solo cambia su
+    generación: las entradas viejas quedan en el heap y se descartan al
+    llegar a la cabeza, o todas juntas cuando son mayoría.
+    
+    El hilo espera en una Condition hasta el primer vencimiento y sin avisos
+    programados no se despierta; por defecto tampoco se despierta antes de
+    tiempo. Condition.wait mide con el reloj monotónico, que no avanza
+    mientras el equipo está suspendido, y los vencimientos son de hora de
+    pared: al despertar se compara el desfase entre ambos relojes
+    (Reloj.desfase) con el de antes de dormir. Si cambió más de
+    TOLERANCIA_SALTO (suspensión o cambio de la hora del sistema) se anota
+    en `saltos_reloj` y la espera se recalcula con la hora nueva, así los
+    avisos que vencieron mientras tanto salen juntos. Lo que no se puede
+    evitar sin despertar es la demora de un aviso que vence durante la
+    suspensión; `espera_maxima` la acota cortando las esperas largas en
+    tramos de ese largo, a cambio de despertar al hilo aunque no haya nada
+    que avisar. Con un RelojSimulado no se mide tiempo real: el hilo duerme
+    hasta que alguien adelante el reloj (ir_a o avanzar) o programe un
+    aviso más cercano.
+    """
+    
+    # Entradas obsoletas a partir de las cuales se compacta el heap
+    MIN_OBSOLETAS_COMPACTAR = 1024
+    # Tope por defecto de cada espera (None = esperar hasta el vencimiento)
+    ESPERA_MAXIMA: Optional[float] = None
+    # Cambio del desfase entre hora de pared y reloj monotónico que se
+    # considera un salto del reloj (segundos)
+    TOLERANCIA_SALTO = 2.0
+    
+    def __init__(self, entregar: Callable[[List[Aviso]], None],
+                 reloj: Optional[Reloj] = None,
+                 espera_maxima: Optional[float] = ESPERA_MAXIMA):
+        """
+        Inicializa el planificador (el hilo arranca con iniciar).
+        
+        Args:
+            entregar: Recibe los avisos vencidos, en orden, desde el hilo del planificador
+            reloj: Reloj para los vencimientos y las esperas (por defecto, el del sistema)
+            espera_maxima: Tope de cada espera cuando el próximo aviso está más
+                lejos (None = esperar siempre hasta el vencimiento)
+        """
+        self._entregar = entregar
+        self.reloj = reloj or Reloj()
+        self.espera_maxima = espera_maxima
+        self._heap: List[Tuple[datetime.datetime, int, str, int, Any]] = []
+        # clave -> [generación vigente, entradas vigentes en el heap]
+        self._claves: Dict[str, List[int]] = {}
+        self._obsoletas = 0
+        self._secuencia = itertools.count()
+        self._generaciones = itertools.count(1)
+        self._condicion = threading.Condition()
+        self._hilo: Optional[threading.Thread] = None
+        self._activo = False
+        self.despertares = 0
+        self.entregados = 0
+        self.saltos_reloj = 0
+    
+    def __len__(self) -> int:
+        """Cantidad de avisos programados pendientes."""
+        with self._condicion:
+            return len(self._heap) - self._obsoletas
+    
+    @property
+    def activo(self) -> bool:
+        """True si el hilo del planificador está corriendo."""
+        return self._activo
+    
+    def iniciar(self) -> None:
+        """Arranca el hilo del planificador."""
+        with self._condicion:
+            if self._activo:
+                return
+            self._activo = True
+            self._hilo = threading.Thread(target=self._ejecutar, name="PlanificadorAvisos", daemon=True)
+            self._hilo.start()
+    
+    def detener(self, timeout: Optional[float] = None) -> None:
+        """
+        Detiene el hilo sin esperar al próximo vencimiento.
+        
+        Args:
+            timeout: Segundos máximos para esperar que termine una entrega en curso
+        """
+        with self._condicion:
+            self._activo = False
+            self._condicion.notify_all()
+            hilo, self._hilo = self._hilo, None
+        if hilo is not None and hilo is not threading.current_thread():
+            hilo.join(timeout)
+    
+    def programar(self, clave: str, avisos: Iterable[Tuple[datetime.datetime, Any]]) -> None:
+        """
+        Reemplaza los avisos de una clave.
+        
+        Args:
+            clave: Identificador de lo que se avisa (ej: el ID de un evento)
+            avisos: Pares (instante, dato); sin avisos equivale a cancelar
+        """
+        with self._condicion:
+            cabeza = self._heap[0][0] if self._heap else None
+            self._retirar_clave(clave)
+            avisos = list(avisos)
+            if not avisos:
+                return
+            generacion = next(self._generaciones)
+            self._claves[clave] = [generacion, len(avisos)]
+            for instante, dato in avisos:
+                heapq.heappush(self._heap, (instante, next(self._secuencia), clave, generacion, dato))
+            if cabeza is None or self._heap[0][0] < cabeza:
+                # El primer aviso se adelantó: el hilo debe recalcular su espera
+                self._condicion.notify()
+    
+    def cancelar(self, clave: str) -> None:
+        """Descarta los avisos pendientes de una clave."""
+        with self._condicion:
+            if self._retirar_clave(clave) and self._heap and self._heap[0][2] == clave:
+                self._condicion.notify()
+    
+    def reemplazar_todo(self, avisos: Iterable[Tuple[str, datetime.datetime, Any]]) -> None:
+        """
+        Descarta todo lo programado y arma el heap de nuevo en O(n).
+        
+        Args:
+            avisos: Ternas (clave, instante, dato)
+        """
+        with self._condicion:
+            self._heap = []
+            self._claves = {}
+            self._obsoletas = 0
+            for clave, instante, dato in avisos:
+                estado = self._claves.get(clave)
+                if estado is None:
+                    estado = self._claves[clave] = [next(self._generaciones), 0]
+                estado[1] += 1
+                self._heap.append((instante, next(self._secuencia), clave, estado[0], dato))
+            heapq.heapify(self._heap)
+            self._condicion.notify()
+    
+    def proximo(self) -> Optional[datetime.datetime]:
+        """Instante del próximo aviso pendiente o None."""
+        with self._condicion:
+            self._descartar_obsoletas_cabeza()
+            return self._heap[0][0] if self._heap else None
+    
+    def procesar_vencidos(self, ahora: Optional[datetime.datetime] = None) -> List[Aviso]:
+        """
+        Entrega en el hilo actual los avisos vencidos hasta `ahora`.
+        
+        Es el mismo paso que ejecuta el hilo en cada vencimiento; sirve para
+        verificaciones manuales y para simular el paso del tiempo.
+        
+        Args:
+            ahora: Instante de referencia (por defecto, el reloj del planificador)
+        
+        Returns:
+            List[Aviso]: Avisos entregados
+        """
+        with self._condicion:
+            vencidos = self._extraer_vencidos(self.reloj.ahora() if ahora is None else ahora)
+        if vencidos:
+            self._entregar_seguro(vencidos)
+        return vencidos
+    
+    def _ejecutar(self) -> None:
+        """Bucle del hilo: entrega lo vencido y duerme hasta el próximo aviso."""
+        while True:
+            with self._condicion:
+                if not self._activo:
+                    return
+                ahora = self.reloj.ahora()
+                vencidos = self._extraer_vencidos(ahora)
+                if not vencidos:
+                    espera = None  # Sin avisos: esperar hasta que se programe alguno
+                    if self._heap:
+                        espera = (self._heap[0][0] - ahora).total_seconds()
+                        if self.espera_maxima is not None and espera > self.espera_maxima:
+                            # Vencimiento lejano: revisar de nuevo tras una posible suspensión
+                            espera = self.espera_maxima
+                    desfase = self.reloj.desfase()
+                    self.reloj.esperar(self._condicion, espera)
+                    self.despertares += 1
+                    salto = self.reloj.desfase() - desfase
+                    if abs(salto) > self.TOLERANCIA_SALTO:
+                        # La espera se midió con un reloj que no vio el salto:
+                        # la próxima vuelta la recalcula con la hora nueva
+                        self.saltos_reloj += 1
+                        print(f"⏰ La hora del sistema saltó {salto:+.0f} s: se recalculan los avisos")
+                    continue
+            # Entregar fuera del lock: quien recibe puede reprogramar
+            self._entregar_seguro(vencidos)
+    
+    def _entregar_seguro(self, vencidos: List[Aviso]) -> None:
+        """Entrega avisos sin que un error detenga al planificador."""
+        self.entregados += len(vencidos)
+        try:
+            self._entregar(vencidos)
+        except Exception as e:
+            print(f"❌ Error al entregar avisos: {e}")
+    
+    def _vigente(self, entrada: Tuple) -> bool:
+        """True si la entrada pertenece a la programación actual de su clave."""
+        estado = self._claves.get(entrada[2])
+        return estado is not None and estado[0] == entrada[3]
+    
+    def _retirar_clave(self, clave: str) -> bool:
+        """Marca como obsoletas las entradas de una clave (requiere el lock)."""
+        estado = self._claves.pop(clave, None)
+        if estado is None:
+            return False
+        self._obsoletas += estado[1]
+        if (self._obsoletas >= self.MIN_OBSOLETAS_COMPACTAR
+                and self._obsoletas * 2 > len(self._heap)):
+            self._heap = [entrada for entrada in self._heap if self._vigente(entrada)]
+            heapq.heapify(self._heap)
+            self._obsoletas = 0
+        return True
+    
+    def _descartar_obsoletas_cabeza(self) -> None:
+        """Saca del heap las entradas obsoletas que quedaron primeras (requiere el lock)."""
+        while self._heap and not self._vigente(self._heap[0]):
+            heapq.heappop(self._heap)
+            self._obsoletas -= 1
+    
+    def _extraer_vencidos(self, ahora: datetime.datetime) -> List[Aviso]:
+        """Saca del heap los avisos con instante <= ahora (requiere el lock)."""
+        vencidos = []
+        self._descartar_obsoletas_cabeza()
+        while self._heap and self._heap[0][0] <= ahora:
+            instante, _, clave, _, dato = heapq.heappop(self._heap)
+            estado = self._claves[clave]
+            estado[1] -= 1
+            if estado[1] == 0:
+                del self._claves[clave]
+            vencidos.append(Aviso(instante, clave, dato))
+            self._descartar_obsoletas_cabeza()
+        return vencidos
@@ -16,10 +16,12 @@ import ttkbootstrap as tb
 from ttkbootstrap.constants import *
 from ttkbootstrap.dialogs import Messagebox
 import datetime
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from src.core.calendario_logic import CalendarioLogic
+from src.core.modelo_mes import ModeloMes
 from src.ui.theme_manager import ThemeManager
 from src.utils.helpers import obtener_dias_semana, formatear_fecha_completa
+from src.utils.configuracion import cargar_configuracion
 from src.core.eventos import EventosManager
 from src.notifications.notificaciones import NotificacionesManager
 from src.notifications.notificacion_timer import NotificacionTimer
@@ -31,6 +33,11 @@ class CalendarioUI:
     Clase que maneja toda la interfaz gráfica del calendario.
     """
     
+    # Semanas que puede ocupar un mes en la grilla
+    FILAS_GRILLA = 6
+    # Meses a cada lado del actual que se preparan en los ratos libres de Tk
+    MESES_PRECALENTADOS = 2
+    
     def __init__(self, root: tb.Window):
         """
         Inicializa la interfaz del calendario.
@@ -44,15 +51,26 @@ class CalendarioUI:
         # Inicializar componentes
         self.calendar_logic = CalendarioLogic()
         self.theme_manager = ThemeManager()
-        self.eventos_manager = EventosManager()
+        # Los cambios se escriben desde un hilo de fondo: la UI no espera al disco.
+        # El archivo histórico (mmap) se activa con "horizonte_archivo" en data/configuracion.json
+        configuracion = cargar_configuracion()
+        self.eventos_manager = EventosManager(escritura_diferida=True,
+                                              horizonte_archivo=configuracion["horizonte_archivo"])
+        # Recargar lo que otros programas escriban en data/eventos.json
+        self.eventos_manager.vigilar_cambios_externos(
+            lambda cambios: self.root.after(0, lambda: self._aplicar_cambios_externos(cambios))
+        )
         self.notificaciones_manager = NotificacionesManager(self.eventos_manager)
         
         # Configurar callbacks
         self.calendar_logic.set_callback_actualizar_vista(self.actualizar_vista)
+        self.calendar_logic.set_fuente_eventos(self.eventos_manager.contar_eventos_mes,
+                                               self.eventos_manager.version_mes)
         self.notificaciones_manager.set_callback_mostrar_notificacion(self._mostrar_notificacion_ui)
         
         # Inicializar timer de notificaciones en tiempo real (thread-safe)
-        self.notification_timer = NotificacionTimer(self.notificaciones_manager, self.root)
+        self.notification_timer = NotificacionTimer(self.notificaciones_manager, self.root,
+                                                    espera_maxima=configuracion["espera_maxima_avisos"])
         self.notification_timer.start()
         
         # Inicializar tema
@@ -64,6 +82,15 @@ class CalendarioUI:
         self.combo_tema = None
         self.frame_calendario = None
         self.botones_dias = {}  # Diccionario para almacenar botones de días
+        # Grilla fija de FILAS_GRILLA x 7 botones, reutilizada en cada navegación
+        self.celdas_dias: List[List[tb.Button]] = []
+        self._dias_celdas = [[0] * 7 for _ in range(self.FILAS_GRILLA)]
+        # (texto, estilo) mostrado en cada celda; None = celda oculta
+        self._estado_celdas: List[List[Optional[Tuple[str, str]]]] = [
+            [None] * 7 for _ in range(self.FILAS_GRILLA)
+        ]
+        self._semanas_visibles = 0
+        self._precalentado_pendiente = None  # ID del after_idle que prepara los meses vecinos
         
         # Crear la interfaz
         self.crear_widgets()
@@ -279,6 +306,11 @@ class CalendarioUI:
             self.crear_calendario()
             print(mensaje)
     
+    def _aplicar_cambios_externos(self, cambios) -> None:
+        """Aplica (en el hilo de la interfaz) los cambios hechos por otros programas."""
+        if self.eventos_manager.aplicar_cambios_externos(cambios):
+            self.actualizar_vista()
+    
     def actualizar_vista(self) -> None:
         """Actualiza la etiqueta del mes y regenera el calendario."""
         if self.label_fecha:
@@ -286,25 +318,37 @@ class CalendarioUI:
         self.crear_calendario()
     
     def crear_calendario(self) -> None:
-        """Crea la grilla visual del calendario."""
+        """
+        Muestra el mes actual en la grilla del calendario.
+        
+        Los encabezados y los botones de días se crean una sola vez; al navegar
+        solo se actualizan el texto y el estilo de las celdas que cambian, en
+        lugar de destruir y recrear unos 50 widgets en cada click.
+        """
         if not self.frame_calendario:
             return
-            
-        # Limpiar el frame del calendario
-        for widget in self.frame_calendario.winfo_children():
-            widget.destroy()
-        
-        # Limpiar referencias a botones
-        self.botones_dias.clear()
         
-        # Crear encabezados de días de la semana
-        self._crear_encabezados_dias()
+        if not self.celdas_dias:
+            # Crear encabezados de días de la semana
+            self._crear_encabezados_dias()
+            # Crear la grilla fija de botones
+            self._crear_celdas_dias()
         
-        # Crear la grilla de días
-        self._crear_grilla_dias()
+        # Mostrar los días del mes en la grilla
+        self._actualizar_grilla_dias()
         
         # Configurar expansión de columnas y filas
         self._configurar_expansion()
+        
+        # Preparar los meses vecinos cuando Tk no tenga nada que hacer
+        if self._precalentado_pendiente is not None:
+            self.root.after_cancel(self._precalentado_pendiente)
+        self._precalentado_pendiente = self.root.after_idle(self._precalentar_meses)
+    
+    def _precalentar_meses(self) -> None:
+        """Deja en la caché los meses vecinos al actual (se ejecuta con after_idle)."""
+        self._precalentado_pendiente = None
+        self.calendar_logic.precalentar_meses(self.MESES_PRECALENTADOS)
     
     def _crear_encabezados_dias(self) -> None:
         """Crea los encabezados de los días de la semana."""
@@ -319,51 +363,89 @@ class CalendarioUI:
             )
             label.grid(row=0, column=i, padx=1, pady=1, sticky="NSEW")
     
-    def _crear_grilla_dias(self) -> None:
-        """Crea la grilla de días del calendario."""
-        # Obtener la matriz del calendario
-        cal = self.calendar_logic.obtener_matriz_calendario()
+    def _crear_celdas_dias(self) -> None:
+        """Crea los botones de la grilla (ocultos hasta que se les asigna un día)."""
+        for fila in range(self.FILAS_GRILLA):
+            botones = []
+            for col in range(7):
+                # El comando resuelve el día que tenga la celda al momento del click
+                btn_dia = tb.Button(
+                    self.frame_calendario,
+                    text="",
+                    bootstyle=LIGHT,
+                    command=lambda f=fila, c=col: self._click_celda(f, c)
+                )
+                btn_dia.grid(row=fila + 1, column=col, padx=1, pady=1, sticky="NSEW")
+                btn_dia.grid_remove()
+                botones.append(btn_dia)
+            self.celdas_dias.append(botones)
         
-        # Crear botones para cada día
-        for fila_idx, semana in enumerate(cal, start=1):
-            for col_idx, dia in enumerate(semana):
+        # Configurar que las columnas se expandan
+        for i in range(7):
+            self.frame_calendario.columnconfigure(i, weight=1)
+    
+    def _actualizar_grilla_dias(self) -> None:
+        """Asigna los días del mes actual a las celdas de la grilla."""
+        # Matriz, día de hoy, fines de semana y eventos por día (desde la caché de meses)
+        modelo = self.calendar_logic.obtener_modelo_mes()
+        
+        self.botones_dias.clear()
+        for fila in range(self.FILAS_GRILLA):
+            semana = modelo.matriz[fila] if fila < modelo.semanas else (0,) * 7
+            for col, dia in enumerate(semana):
+                self._dias_celdas[fila][col] = dia
                 if dia == 0:
                     # Día vacío (pertenece al mes anterior/siguiente)
-                    label = tb.Label(self.frame_calendario, text="")
-                    label.grid(row=fila_idx, column=col_idx, padx=1, pady=1, sticky="NSEW")
+                    self._actualizar_celda(fila, col, None)
                 else:
-                    # Crear botón para el día
-                    self._crear_boton_dia(dia, fila_idx, col_idx)
+                    self._actualizar_celda(fila, col, self._estilo_dia(modelo, dia))
+                    # Guardar referencia al botón
+                    self.botones_dias[dia] = self.celdas_dias[fila][col]
+        self._semanas_visibles = modelo.semanas
     
-    def _crear_boton_dia(self, dia: int, row: int, col: int) -> None:
+    def _actualizar_celda(self, fila: int, col: int, estado: Optional[Tuple[str, str]]) -> None:
         """
-        Crea un botón para un día específico.
+        Muestra (texto, estilo) en una celda, u oculta la celda si estado es None.
+        
+        Solo se reconfigura el botón si el estado cambió respecto de lo que ya muestra.
+        """
+        anterior = self._estado_celdas[fila][col]
+        if estado == anterior:
+            return
+        
+        btn_dia = self.celdas_dias[fila][col]
+        if estado is None:
+            btn_dia.grid_remove()
+        else:
+            texto, bootstyle = estado
+            btn_dia.configure(text=texto, bootstyle=bootstyle)
+            if anterior is None:
+                btn_dia.grid()
+        self._estado_celdas[fila][col] = estado
+    
+    @staticmethod
+    def _estilo_dia(modelo: ModeloMes, dia: int) -> Tuple[str, str]:
+        """
+        Determina el texto y el estilo del botón de un día.
         
         Args:
+            modelo: Modelo del mes que se muestra
             dia: Número del día
-            row: Fila en la grilla
-            col: Columna en la grilla
+            
+        Returns:
+            Tuple[str, str]: (texto del botón, bootstyle)
         """
-        # Crear fecha para verificar eventos
-        fecha_actual = self.calendar_logic.get_fecha_actual()
-        fecha_dia = datetime.date(
-            fecha_actual.year,
-            fecha_actual.month,
-            dia
-        )
-        
-        # Verificar si hay eventos en este día
-        eventos_dia = self.eventos_manager.obtener_eventos_fecha(fecha_dia)
-        tiene_eventos = len(eventos_dia) > 0
+        cantidad_eventos = modelo.eventos_por_dia.get(dia, 0)
+        tiene_eventos = cantidad_eventos > 0
         
         # Determinar el estilo del botón
-        if self.calendar_logic.es_dia_hoy(dia):
+        if dia == modelo.dia_hoy:
             # Día actual - estilo especial
             bootstyle = SUCCESS
         elif tiene_eventos:
             # Días con eventos - estilo especial
             bootstyle = DANGER
-        elif self.calendar_logic.es_fin_de_semana(dia):
+        elif dia in modelo.fines_de_semana:
             # Fin de semana - estilo diferente
             bootstyle = WARNING
         else:
@@ -373,19 +455,21 @@ class CalendarioUI:
         # Crear texto del botón con indicador de eventos
         texto_boton = str(dia)
         if tiene_eventos:
-            texto_boton += f" ({len(eventos_dia)})"
-        
-        # Crear botón para el día
-        btn_dia = tb.Button(
-            self.frame_calendario,
-            text=texto_boton,
-            bootstyle=bootstyle,
-            command=lambda d=dia: self._click_dia(d)
-        )
-        btn_dia.grid(row=row, column=col, padx=1, pady=1, sticky="NSEW")
+            texto_boton += f" ({cantidad_eventos})"
+        
+        return texto_boton, bootstyle
+    
+    def _click_celda(self, fila: int, col: int) -> None:
+        """
+        Maneja el click en una celda de la grilla.
         
-        # Guardar referencia al botón
-        self.botones_dias[dia] = btn_dia
+        Args:
+            fila: Fila de la celda (semana)
+            col: Columna de la celda (día de la semana)
+        """
+        dia = self._dias_celdas[fila][col]
+        if dia:
+            self._click_dia(dia)
     
     def _click_dia(self, dia: int) -> None:
         """
@@ -408,15 +492,12 @@ class CalendarioUI:
         self._mostrar_eventos_dia(fecha_dia)
     
     def _configurar_expansion(self) -> None:
-        """Configura la expansión de columnas y filas."""
-        # Configurar que las columnas se expandan
-        for i in range(7):
-            self.frame_calendario.columnconfigure(i, weight=1)
-        
-        # Configurar que las filas se expandan
-        matriz = self.calendar_logic.obtener_matriz_calendario()
-        for i in range(len(matriz) + 1):  # +1 por los encabezados
-            self.frame_calendario.rowconfigure(i, weight=1)
+        """Configura la expansión de las filas según las semanas del mes."""
+        # Las filas sin semana (meses de 4 o 5 semanas) no reciben espacio
+        semanas = self._semanas_visibles
+        for i in range(1, self.FILAS_GRILLA + 1):
+            self.frame_calendario.rowconfigure(i, weight=1 if i <= semanas else 0)
+        self.frame_calendario.rowconfigure(0, weight=1)  # Encabezados
     
     def obtener_info_estado(self) -> dict:
         """
@@ -726,7 +807,7 @@ class CalendarioUI:
             print(f"❌ Error probando notificaciones: {e}")
     
     def _reanudar_timer(self) -> None:
-        """Reanuda el timer de notificaciones si estaba pausado."""
+        """Entrega los avisos que el límite de frecuencia tenía retenidos."""
         try:
             if hasattr(self, 'notification_timer') and self.notification_timer:
                 self.notification_timer.reanudar_timer()
@@ -755,6 +836,10 @@ class CalendarioUI:
                 self.notification_timer.stop()
                 print("🛑 Timer de notificaciones detenido")
             
+            # Escribir los cambios pendientes antes de salir
+            if not self.eventos_manager.cerrar():
+                print("⚠️ No se pudieron guardar todos los cambios pendientes")
+            
             # Cerrar ventana
             self.root.destroy()
             print("👋 Aplicación cerrada limpiamente")
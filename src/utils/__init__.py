@@ -3,6 +3,7 @@ Paquete Utils - Utilidades y Helpers
 
 Contiene funciones de utilidad:
 - helpers: Funciones auxiliares para fechas y formato
+- reloj: Reloj del sistema y reloj simulado para pruebas
 
 Autor: Mariano Capella, Gabriel Osemberg
 """ 
\ No newline at end of file
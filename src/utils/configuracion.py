@@ -0,0 +1,67 @@
+"""
+Configuracion.py - Opciones de la aplicación en data/configuracion.json
+
+Este módulo se encarga de:
+- Leer las opciones que el usuario ajusta a mano (las que cambian datos, apagadas por defecto)
+- Completar con los valores por defecto las opciones que falten
+- Ignorar un archivo ilegible o valores inválidos sin impedir el arranque
+
+Ejemplo de data/configuracion.json:
+    {"horizonte_archivo": 2, "espera_maxima_avisos": 900}
+
+Autor: Mariano Capella, Gabriel Osemberg
+"""
+
+import json
+import os
+
+
+ARCHIVO_CONFIGURACION = "data/configuracion.json"
+
+VALORES_POR_DEFECTO = {
+    # Años anteriores al actual que quedan en memoria; los eventos más viejos
+    # pasan al archivo histórico (None = sin archivo histórico)
+    "horizonte_archivo": None,
+    # Segundos que el planificador de avisos duerme como máximo de una vez:
+    # acota la demora de un aviso que vence con el equipo suspendido a cambio
+    # de despertar aunque no haya avisos (None = dormir hasta el próximo aviso)
+    "espera_maxima_avisos": None,
+}
+
+
+def cargar_configuracion(ruta: str = ARCHIVO_CONFIGURACION) -> dict:
+    """
+    Lee la configuración de la aplicación.
+    
+    Args:
+        ruta: Archivo JSON con las opciones
+    
+    Returns:
+        dict: Todas las opciones de VALORES_POR_DEFECTO, con las del archivo
+        que sean válidas
+    """
+    configuracion = dict(VALORES_POR_DEFECTO)
+    if not os.path.exists(ruta):
+        return configuracion
+    try:
+        with open(ruta, 'r', encoding='utf-8') as f:
+            leida = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ No se pudo leer la configuración: {e}")
+        return configuracion
+    if not isinstance(leida, dict):
+        print(f"⚠️ Configuración ignorada: {ruta} no contiene un objeto JSON")
+        return configuracion
+    
+    horizonte = leida.get("horizonte_archivo")
+    if horizonte is None or (isinstance(horizonte, int) and not isinstance(horizonte, bool) and horizonte >= 0):
+        configuracion["horizonte_archivo"] = horizonte
+    else:
+        print(f"⚠️ horizonte_archivo inválido ({horizonte!r}): se usa el archivo histórico desactivado")
+    
+    espera = leida.get("espera_maxima_avisos", configuracion["espera_maxima_avisos"])
+    if espera is None or (isinstance(espera, (int, float)) and not isinstance(espera, bool) and espera > 0):
+        configuracion["espera_maxima_avisos"] = espera
+    else:
+        print(f"⚠️ espera_maxima_avisos inválida ({espera!r}): se espera hasta el próximo aviso")
+    return configuracion
@@ -0,0 +1,41 @@
+"""
+Convertir_Datos.py - Conversión del archivo de eventos entre formatos
+
+Convierte el calendario entre el snapshot JSON, el binario compacto (.evb) y
+SQLite; el formato de cada archivo se elige por su extensión.
+
+Uso:
+    python -m src.utils.convertir_datos data/eventos.json data/eventos.evb
+    python -m src.utils.convertir_datos data/eventos.evb data/eventos.json
+
+Autor: Mariano Capella, Gabriel Osemberg
+"""
+
+import sys
+from src.core.almacenamiento import convertir_datos
+
+
+def main(argumentos: list) -> int:
+    """
+    Ejecuta la conversión desde la línea de comandos.
+    
+    Args:
+        argumentos: [origen, destino]
+    
+    Returns:
+        int: Código de salida (0 si la conversión fue exitosa)
+    """
+    if len(argumentos) != 2:
+        print("Uso: python -m src.utils.convertir_datos <origen> <destino>")
+        return 2
+    
+    try:
+        convertir_datos(argumentos[0], argumentos[1])
+    except (OSError, ValueError) as e:
+        print(f"❌ Error en la conversión: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -6,13 +6,30 @@ Este módulo contiene funciones de ayuda para:
 - Validaciones de fecha
 - Conversiones de formato
 - Utilidades generales del calendario
+- Memoización acotada de las matrices y los datos de cada mes
 
 Autor: Mariano Capella, Gabriel Osemberg
 """
 
 import datetime
 import calendar
-from typing import Optional, List, Tuple
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import FrozenSet, Optional, List, Tuple
+
+
+# Meses distintos que se recuerdan (unos 20 años de navegación)
+MESES_EN_CACHE = 256
+
+
+@dataclass(frozen=True)
+class DatosMes:
+    """Estructura de un mes que no depende de los eventos (se calcula una vez por mes)."""
+    matriz: Tuple[Tuple[int, ...], ...]  # Semanas de Lunes a Domingo, 0 = día de otro mes
+    dias_totales: int
+    fines_de_semana: FrozenSet[int]  # Días que caen Sábado o Domingo
+    dias_laborables: int
+    semanas_completas: int
 
 
 def obtener_nombre_mes(fecha: datetime.date) -> str:
@@ -41,6 +58,35 @@ def es_dia_actual(fecha: datetime.date) -> bool:
     return fecha == datetime.date.today()
 
 
+@lru_cache(maxsize=MESES_EN_CACHE)
+def obtener_datos_mes(year: int, month: int) -> DatosMes:
+    """
+    Obtiene la matriz, los fines de semana y los días laborables de un mes.
+    
+    El resultado es inmutable y queda memoizado (hasta MESES_EN_CACHE meses),
+    así helpers y CalendarioLogic no vuelven a llamar a calendar.monthcalendar
+    ni a crear un date por celda para el mismo mes.
+    
+    Args:
+        year: Año
+        month: Mes (1-12)
+        
+    Returns:
+        DatosMes: Datos del mes
+    """
+    matriz = tuple(tuple(semana) for semana in calendar.monthcalendar(year, month))
+    # Columnas 5 y 6 de la matriz: Sábado y Domingo
+    fines_de_semana = frozenset(dia for semana in matriz for dia in semana[5:] if dia)
+    dias_totales = calendar.monthrange(year, month)[1]
+    return DatosMes(
+        matriz=matriz,
+        dias_totales=dias_totales,
+        fines_de_semana=fines_de_semana,
+        dias_laborables=dias_totales - len(fines_de_semana),
+        semanas_completas=sum(1 for semana in matriz if 0 not in semana)
+    )
+
+
 def obtener_calendario_mes(year: int, month: int) -> List[List[int]]:
     """
     Obtiene la matriz del calendario para un mes específico.
@@ -50,9 +96,10 @@ def obtener_calendario_mes(year: int, month: int) -> List[List[int]]:
         month: Mes (1-12)
         
     Returns:
-        List[List[int]]: Matriz con los días del mes (0 para días vacíos)
+        List[List[int]]: Matriz con los días del mes (0 para días vacíos); es
+        una copia, se puede modificar sin afectar la memoización
     """
-    return calendar.monthcalendar(year, month)
+    return [list(semana) for semana in obtener_datos_mes(year, month).matriz]
 
 
 def obtener_dias_semana() -> List[str]:
@@ -143,6 +190,46 @@ def validar_fecha(year: int, month: int, day: int) -> bool:
         return False
 
 
+def parsear_fecha(fecha_str: str) -> datetime.date:
+    """
+    Convierte una fecha YYYY-MM-DD a objeto date.
+    
+    Usa date.fromisoformat (mucho más rápido que strptime) cuando la cadena
+    tiene exactamente ese formato; el resto pasa por strptime para aceptar
+    lo mismo que antes (ej: "2025-1-5").
+    
+    Args:
+        fecha_str: Fecha en formato YYYY-MM-DD
+    
+    Returns:
+        datetime.date: Fecha parseada
+    
+    Raises:
+        ValueError: Si la fecha es inválida
+    """
+    if len(fecha_str) == 10 and fecha_str[4] == '-' and fecha_str[7] == '-':
+        return datetime.date.fromisoformat(fecha_str)
+    return datetime.datetime.strptime(fecha_str, "%Y-%m-%d").date()
+
+
+def parsear_hora(hora_str: str) -> datetime.time:
+    """
+    Convierte una hora HH:MM a objeto time.
+    
+    Args:
+        hora_str: Hora en formato HH:MM
+    
+    Returns:
+        datetime.time: Hora parseada
+    
+    Raises:
+        ValueError: Si la hora es inválida
+    """
+    if len(hora_str) == 5 and hora_str[2] == ':':
+        return datetime.time.fromisoformat(hora_str)
+    return datetime.datetime.strptime(hora_str, "%H:%M").time()
+
+
 def formatear_fecha_completa(fecha: datetime.date) -> str:
     """
     Formatea una fecha completa en español.
@@ -0,0 +1,126 @@
+"""
+Reloj.py - Fuente de tiempo reemplazable
+
+Este módulo se encarga de:
+- Dar la hora de pared, la fecha y el tiempo monotónico desde un solo objeto
+- Esperar en una Condition midiendo con ese mismo reloj
+- Simular el paso del tiempo (RelojSimulado) para probar días o años de
+  avisos sin esperar
+
+Autor: Mariano Capella, Gabriel Osemberg
+"""
+
+import datetime
+import threading
+import time
+from typing import Optional, Set
+
+
+class Reloj:
+    """
+    Reloj del sistema.
+    
+    Las clases que dependen de la hora lo reciben en el constructor en lugar
+    de llamar a datetime.now() o time.monotonic() directamente.
+    """
+    
+    def ahora(self) -> datetime.datetime:
+        """Fecha y hora de pared."""
+        return datetime.datetime.now()
+    
+    def hoy(self) -> datetime.date:
+        """Fecha de hoy."""
+        return self.ahora().date()
+    
+    def monotonico(self) -> float:
+        """Segundos de un reloj que nunca retrocede (para medir intervalos)."""
+        return time.monotonic()
+    
+    def desfase(self) -> float:
+        """
+        Diferencia en segundos entre la hora de pared y el reloj monotónico.
+        
+        Es constante mientras ninguno salte: cambia si el equipo estuvo
+        suspendido o si se cambió la hora del sistema.
+        """
+        return self.ahora().timestamp() - self.monotonico()
+    
+    def esperar(self, condicion: threading.Condition, segundos: Optional[float]) -> bool:
+        """
+        Espera una notificación de la Condition (requiere tener su lock).
+        
+        Args:
+            condicion: Condition en la que esperar
+            segundos: Espera máxima (None = hasta que la notifiquen)
+        
+        Returns:
+            bool: False si se cumplió el tiempo sin notificación
+        """
+        return condicion.wait(segundos)
+
+
+class RelojSimulado(Reloj):
+    """
+    Reloj que solo avanza cuando se lo pide (avanzar o ir_a).
+    
+    Un hilo que espera con este reloj no mide tiempo real: se despierta
+    cuando alguien notifica la Condition o adelanta el reloj, y vuelve a
+    calcular su espera con la hora nueva.
+    """
+    
+    def __init__(self, inicio: datetime.datetime):
+        """
+        Inicializa el reloj detenido en `inicio`.
+        
+        Args:
+            inicio: Fecha y hora inicial
+        """
+        self._inicio = inicio
+        self._ahora = inicio
+        self._lock = threading.Lock()
+        self._esperando: Set[threading.Condition] = set()
+        # Última hora que leyó cada hilo (para no perder un avance ocurrido antes de esperar)
+        self._vista = threading.local()
+    
+    def ahora(self) -> datetime.datetime:
+        """Fecha y hora simulada."""
+        with self._lock:
+            self._vista.ahora = self._ahora
+            return self._ahora
+    
+    def monotonico(self) -> float:
+        """Segundos simulados desde el inicio."""
+        with self._lock:
+            return (self._ahora - self._inicio).total_seconds()
+    
+    def desfase(self) -> float:
+        """Constante: la hora simulada y el tiempo simulado avanzan juntos."""
+        return self._inicio.timestamp()
+    
+    def esperar(self, condicion: threading.Condition, segundos: Optional[float]) -> bool:
+        """Espera una notificación o que el reloj avance (`segundos` no se usa: no hay tiempo real)."""
+        with self._lock:
+            if getattr(self._vista, 'ahora', self._ahora) != self._ahora:
+                return True  # El reloj avanzó después de que este hilo calculara su espera
+            self._esperando.add(condicion)
+        try:
+            return condicion.wait()
+        finally:
+            with self._lock:
+                self._esperando.discard(condicion)
+    
+    def avanzar(self, segundos: float) -> None:
+        """Adelanta el reloj (los valores negativos se ignoran)."""
+        if segundos > 0:
+            self.ir_a(self.ahora() + datetime.timedelta(seconds=segundos))
+    
+    def ir_a(self, instante: datetime.datetime) -> None:
+        """Lleva el reloj a `instante` si es posterior a la hora simulada y despierta a quien espera."""
+        with self._lock:
+            if instante <= self._ahora:
+                return
+            self._ahora = instante
+            esperando = list(self._esperando)
+        for condicion in esperando:
+            with condicion:
+                condicion.notify_all()